@@ -0,0 +1,309 @@
+r"""
+Benchmark harness for the :math:`z`-propagation algorithms.
+
+Times single calls to `single_step` and full `propagate` runs for all
+combinations of the selected solvers, models, and sizes of the time mesh, and
+reports the throughput in steps per second and evaluations of the nonlinear
+operator per second, as well as the peak memory allocated during a
+propagation run. Results are written in JSON format, annotated with the
+current git revision, so that runs for different commits can be compared.
+
+Usage::
+
+    $ python benchmarks/bench_solvers.py -o bench.json
+    $ python benchmarks/bench_solvers.py -o bench_new.json --compare bench.json
+
+As test case, a higher-order soliton in an endlessly single-mode photonic
+crystal fiber is considered. The temporal mesh spacing is kept fixed, so that
+the size of the time mesh only affects the extent of the time window.
+
+.. codeauthor:: Oliver Melchert <melchert@iqo.uni-hannover.de>
+"""
+import os
+import io
+import sys
+import json
+import time
+import argparse
+import platform
+import subprocess
+import contextlib
+import tracemalloc
+import numpy as np
+from fmas.grid import Grid
+from fmas.models import FMAS_S, FMAS_S_Raman, FMAS_THG, BMCF
+from fmas.solver import SiSSM, SySSM, IFM_RK4IP, LEM_SySSM, CQE_RK4IP, ERK4IP, ETDRK4
+from fmas.solver.local_error_method import LEM_IFM
+from fmas.solver.profiler import SolverProfiler
+from fmas.analytic_signal import AS
+from fmas.propagation_constant import define_beta_fun_ESM
+from fmas.config import set_fft_backend, C0
+from fmas.kernels import set_kernel_backend, get_kernel_backend
+from fmas.tools import sech
+
+
+SOLVERS = {
+    "SiSSM": SiSSM,
+    "SySSM": SySSM,
+    "IFM_RK4IP": IFM_RK4IP,
+    "LEM_SySSM": LEM_SySSM,
+    "LEM_IFM": LEM_IFM,
+    "CQE_RK4IP": CQE_RK4IP,
+    "ERK4IP": ERK4IP,
+    "ETDRK4": ETDRK4,
+}
+
+MODELS = ["FMAS_S", "FMAS_S_Raman", "FMAS_THG", "BMCF"]
+
+# -- PARAMETERS OF THE TEST CASE
+DT = 0.25  # (fs)
+T0 = 7.0  # (fs)
+W0 = 1.7  # (rad/fs)
+N2 = 3.0e-8  # (micron^2/W)
+NS = 2.0  # (-)
+DZ = 10.0  # (micron)
+
+
+def setup(model_name, t_num):
+    r"""Set up model and initial condition.
+
+    Args:
+        model_name (:obj:`str`): Name of propagation model.
+        t_num (:obj:`int`): Number of time mesh-points.
+
+    Returns:
+        :obj:`tuple`: Model instance, angular frequency mesh, and
+        frequency-domain representation of the initial field.
+    """
+    beta_fun = define_beta_fun_ESM()
+    grid = Grid(t_max=0.5 * t_num * DT, t_num=t_num)
+    beta_w = beta_fun(grid.w)
+    # ... GROUP-VELOCITY DISPERSION AT W0 FROM CENTRAL DIFFERENCES
+    h = 1e-3
+    beta2 = (beta_fun(W0 + h) - 2 * beta_fun(W0) + beta_fun(W0 - h)) / h / h
+    chi = 8.0 * N2 * beta_fun(W0) * C0 / W0 / 3.0
+    gam0 = 3 * W0 * W0 * chi / (8 * C0 * C0 * beta_fun(W0))
+    A0 = NS * np.sqrt(abs(beta2) / gam0) / T0
+    E_0t = np.real(A0 * sech(grid.t / T0) * np.exp(1j * W0 * grid.t))
+    model_switch = {
+        "FMAS_S": lambda: FMAS_S(w=grid.w, beta_w=beta_w, n2=N2),
+        "FMAS_S_Raman": lambda: FMAS_S_Raman(w=grid.w, beta_w=beta_w, n2=N2),
+        "FMAS_THG": lambda: FMAS_THG(w=grid.w, beta_w=beta_w, chi=chi),
+        "BMCF": lambda: BMCF(w=grid.w, beta_w=beta_w, chi=chi),
+    }
+    return model_switch[model_name](), grid.w, AS(E_0t).w_rep
+
+
+def _counted(fun, counter):
+    def _fun(uw):
+        counter[0] += 1
+        return fun(uw)
+
+    return _fun
+
+
+def bench_single_step(Solver, model, w, uw0, n_calls):
+    r"""Time single calls to `single_step`.
+
+    Args:
+        Solver (:obj:`class`): Solver class.
+        model (:obj:`object`): Propagation model.
+        w (:obj:`numpy.ndarray`): Angular frequency mesh.
+        uw0 (:obj:`numpy.ndarray`): Initial field.
+        n_calls (:obj:`int`): Number of calls.
+
+    Returns:
+        :obj:`dict`: Timing results.
+    """
+    counter = [0]
+    solver = Solver(model.Lw, _counted(model.Nw, counter), user_action=model.claw)
+    solver.set_initial_condition(w, uw0)
+    # -- A SINGLE-STEP RUN INITIALIZES THE STEP SIZE AND PROPAGATOR CACHE
+    solver.propagate(z_range=DZ, n_steps=1, n_skip=1)
+    uw, counter[0] = solver.uwz[-1], 0
+    t_ini = time.perf_counter()
+    for i in range(n_calls):
+        uw = solver.single_step(DZ * (i + 1), uw)
+    t_tot = time.perf_counter() - t_ini
+    return {
+        "n_calls": n_calls,
+        "time": t_tot,
+        "steps_per_s": n_calls / t_tot,
+        "N_evals": counter[0],
+        "N_evals_per_s": counter[0] / t_tot,
+    }
+
+
+def bench_propagate(Solver, model, w, uw0, n_steps, measure_memory=True):
+    r"""Time full propagation run.
+
+    Args:
+        Solver (:obj:`class`): Solver class.
+        model (:obj:`object`): Propagation model.
+        w (:obj:`numpy.ndarray`): Angular frequency mesh.
+        uw0 (:obj:`numpy.ndarray`): Initial field.
+        n_steps (:obj:`int`): Number of integration steps.
+        measure_memory (:obj:`bool`): Measure peak memory in a separate run
+            (default is measure_memory = True).
+
+    Returns:
+        :obj:`dict`: Timing results.
+    """
+
+    def _run(profiler=None):
+        solver = Solver(model.Lw, model.Nw, user_action=model.claw)
+        solver.set_initial_condition(w, uw0)
+        solver.propagate(
+            z_range=n_steps * DZ, n_steps=n_steps, n_skip=n_steps, profiler=profiler
+        )
+        return solver
+
+    prof = SolverProfiler()
+    t_ini = time.perf_counter()
+    solver = _run(prof)
+    t_tot = time.perf_counter() - t_ini
+    rec = prof.records
+    res = {
+        "n_steps": n_steps,
+        "time": t_tot,
+        "steps_per_s": n_steps / t_tot,
+        "N_evals": int(rec["n_N"].sum()),
+        "N_evals_per_s": rec["n_N"].sum() / t_tot,
+        "n_fft": int(rec["n_fft"].sum()),
+        "n_accepted": solver.n_accepted,
+        "n_rejected": solver.n_rejected,
+    }
+    if measure_memory:
+        tracemalloc.start()
+        _run()
+        res["peak_memory_bytes"] = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+    return res
+
+
+def git_revision():
+    r"""Git revision of the working tree, or None if not available."""
+    try:
+        out = subprocess.run(
+            ["git", "rev-parse", "HEAD"],
+            cwd=os.path.dirname(os.path.abspath(__file__)),
+            capture_output=True,
+            text=True,
+            check=True,
+        )
+        dirty = subprocess.run(
+            ["git", "status", "--porcelain", "--untracked-files=no"],
+            cwd=os.path.dirname(os.path.abspath(__file__)),
+            capture_output=True,
+            text=True,
+        )
+    except (OSError, subprocess.CalledProcessError):
+        return None
+    return out.stdout.strip() + ("-dirty" if dirty.stdout.strip() else "")
+
+
+def compare(res_new, res_base):
+    r"""Print relative change of throughput with respect to baseline.
+
+    Args:
+        res_new (:obj:`dict`): Benchmark results.
+        res_base (:obj:`dict`): Baseline benchmark results.
+    """
+    key = lambda r: (r["solver"], r["model"], r["t_num"])
+    base = {key(r): r for r in res_base["results"]}
+    print("%-10s %-13s %6s %12s %12s" % ("solver", "model", "t_num", "step", "propagate"))
+    for r in res_new["results"]:
+        b = base.get(key(r))
+        if b is None:
+            continue
+        rel = lambda kind: r[kind]["steps_per_s"] / b[kind]["steps_per_s"] - 1.0
+        print(
+            "%-10s %-13s %6d %+11.1f%% %+11.1f%%"
+            % (key(r) + (100 * rel("single_step"), 100 * rel("propagate")))
+        )
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[1])
+    parser.add_argument("-o", "--out", default="bench.json", help="output file")
+    parser.add_argument(
+        "--solvers", nargs="+", default=list(SOLVERS.keys()), choices=SOLVERS
+    )
+    parser.add_argument("--models", nargs="+", default=MODELS, choices=MODELS)
+    parser.add_argument(
+        "--log2-t-num",
+        nargs="+",
+        type=int,
+        default=list(range(10, 17)),
+        help="exponents of the time mesh sizes",
+    )
+    parser.add_argument("--n-calls", type=int, default=20)
+    parser.add_argument("--n-steps", type=int, default=100)
+    parser.add_argument("--fft-backend", default="numpy")
+    parser.add_argument(
+        "--kernel-backend", help="default: numba if installed, else numpy"
+    )
+    parser.add_argument("--no-memory", action="store_true")
+    parser.add_argument("--compare", help="baseline JSON file")
+    args = parser.parse_args(argv)
+
+    set_fft_backend(args.fft_backend)
+    if args.kernel_backend is not None:
+        set_kernel_backend(args.kernel_backend)
+    results = []
+    for model_name in args.models:
+        for log2_t_num in args.log2_t_num:
+            t_num = 2 ** log2_t_num
+            model, w, uw0 = setup(model_name, t_num)
+            for solver_name in args.solvers:
+                Solver = SOLVERS[solver_name]
+                # -- SILENCE PROGRESS BAR
+                with contextlib.redirect_stderr(io.StringIO()):
+                    res_ss = bench_single_step(Solver, model, w, uw0, args.n_calls)
+                    res_pr = bench_propagate(
+                        Solver, model, w, uw0, args.n_steps, not args.no_memory
+                    )
+                results.append(
+                    {
+                        "solver": solver_name,
+                        "model": model_name,
+                        "t_num": t_num,
+                        "single_step": res_ss,
+                        "propagate": res_pr,
+                    }
+                )
+                print(
+                    "%-10s %-13s %6d %10.1f steps/s %12.1f N/s"
+                    % (
+                        solver_name,
+                        model_name,
+                        t_num,
+                        res_pr["steps_per_s"],
+                        res_pr["N_evals_per_s"],
+                    ),
+                    flush=True,
+                )
+
+    out = {
+        "meta": {
+            "git_revision": git_revision(),
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+            "python": sys.version.split()[0],
+            "numpy": np.__version__,
+            "platform": platform.platform(),
+            "fft_backend": args.fft_backend,
+            "kernel_backend": get_kernel_backend().name,
+            "args": vars(args),
+        },
+        "results": results,
+    }
+    with open(args.out, "w") as f:
+        json.dump(out, f, indent=1)
+
+    if args.compare:
+        with open(args.compare) as f:
+            compare(out, json.load(f))
+
+
+if __name__ == "__main__":
+    main()
@@ -12,7 +12,7 @@ real-valued discrete-time field.
 .. codeauthor:: Oliver Melchert <melchert@iqo.uni-hannover.de>
 """
 import numpy as np
-from .config import FTFREQ, FT, IFT
+from .config import FTFREQ, FT, IFT, RFT
 
 
 class AnalyticSignal:
@@ -44,33 +44,48 @@ class AnalyticSignal:
         3. Compute the complex-valued :math:`N`-point discrete-time analytic
         signal :math:`\mathcal{E}` using an inverse DFT.
 
+        If `compact` is True, only the :math:`N/2+1` leading entries of
+        :math:`\mathcal{E}_\omega`, i.e. those for :math:`0\leq m\leq N/2`,
+        are provided. They are computed directly by a real-to-complex DFT of
+        :math:`E`.
+
     Args:
-        x (:obj:`numpy.ndarray`): Real-valued field :math:`E`.
+        x (:obj:`numpy.ndarray`): Real-valued field :math:`E`. For 2-dim
+            input, each row is considered as a separate field.
+        compact (:obj:`bool`): Provide compact frequency-domain representation
+            (default: False).
 
     Attributes:
         x (:obj:`numpy.ndarray`): Real-valued field :math:`E`.
         num (:obj:`int`): Number :math:`N` of field points.
+        compact (:obj:`bool`): Flag indicating compact frequency-domain
+            representation.
 
     """
 
-    def __init__(self, x):
+    def __init__(self, x, compact=False):
         self.x = np.asarray(x)
-        self.num = self.x.size
+        self.num = self.x.shape[-1]
+        self.compact = compact
 
     @property
     def w_rep(self):
         r""":obj:`numpy.ndarray`: Frequency-domain representation :math:`\mathcal{E}_\omega` of the analytic signal."""
         num, x = self.num, self.x
+        if self.compact:
+            tmp = RFT(x)
+            tmp[..., 1 : int(num / 2)] = 2 * tmp[..., 1 : int(num / 2)]
+            return tmp
         tmp = FT(x)
-        tmp[1 : int(num / 2)] = 2 * tmp[1 : int(num / 2)]
-        tmp[int(num / 2) + 1] = tmp[int(num / 2) + 1]
-        tmp[int(num / 2) + 1 :] = 0j
+        tmp[..., 1 : int(num / 2)] = 2 * tmp[..., 1 : int(num / 2)]
+        tmp[..., int(num / 2) + 1] = tmp[..., int(num / 2) + 1]
+        tmp[..., int(num / 2) + 1 :] = 0j
         return tmp
 
     @property
     def t_rep(self):
         r""":obj:`numpy.ndarray`: Time-domain representation :math:`\mathcal{E}` of the analytic signal."""
-        return IFT(self.w_rep)
+        return IFT(self.w_rep, n=self.num)
 
     def test_recover_original_field(self):
         r"""Check if real part of analytic signal equals original field.
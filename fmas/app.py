@@ -3,7 +3,7 @@ import time
 import numpy as np
 import logging as log
 from .config import FTFREQ, FT, IFT
-from .solver import IFM_RK4IP, SiSSM, SySSM, LEM, CQE
+from .solver import IFM_RK4IP, SiSSM, SySSM, LEM, CQE, ERK4IP, ETDRK4
 from .models import FMAS_S, FMAS_S_Raman
 from .data_io import read_h5, save_h5
 from .grid import Grid
@@ -13,6 +13,24 @@ from .analytic_signal import AnalyticSignal
 def run(file_name, model_type = 'FMAS_S_R', solver_type = 'IFM_RK4IP'):
 
     glob = read_h5(file_name)
+    glob.model_type = model_type
+    glob.solver_type = solver_type
+
+    return run_sim_pars(glob)
+
+
+def run_sim_pars(glob):
+    r"""Run simulation specified by simulation parameter dataclass.
+
+    Args:
+        glob (:obj:`dataclass`): Simulation parameter dataclass
+            :class:`data_io.SimPars`.
+
+    Returns:
+        :obj:`dict`: Simulation results.
+    """
+    model_type = glob.model_type
+    solver_type = glob.solver_type
 
     grid = Grid(t_max=glob.t_max, t_num=glob.t_num, z_max=glob.z_max, z_num=glob.z_num)
 
@@ -43,7 +61,9 @@ def run(file_name, model_type = 'FMAS_S_R', solver_type = 'IFM_RK4IP'):
         "SySSM": SySSM,
         "IFM_RK4IP": IFM_RK4IP,
         "LEM": LEM,
-        "CQE": CQE
+        "CQE": CQE,
+        "ERK4IP": ERK4IP,
+        "ETDRK4": ETDRK4
     }
     try:
         Solver = solver_switch[solver_type]
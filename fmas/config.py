@@ -7,25 +7,106 @@ Module containing helper routines, convenient abbreviations, and constants.
 """
 import numpy as np
 import numpy.fft as nfft
+from .fft_backends import FFT_BACKENDS, NumpyFFT
+
+# -- FFT BACKEND USED BY THE FAST FOURIER-TRANSFORMS FT AND IFT
+_fft_backend = NumpyFFT()
+
+
+def set_fft_backend(backend="numpy", **kwargs):
+    r"""Select backend for the fast Fourier-transforms `FT` and `IFT`.
+
+    Since the models and solvers call `FT` and `IFT`, which delegate to the
+    currently selected backend, the backend can be changed at runtime without
+    re-importing any of the modules that use the transforms.
+
+    Args:
+        backend (:obj:`str` or :obj:`object`):
+            Name of a backend listed in `fft_backends.FFT_BACKENDS`, i.e.
+            one of "numpy", "scipy", or "pyfftw", or an instance of a custom
+            backend providing the methods `fft`, `ifft`, `rfft`, `irfft`,
+            `hfft`, and `ihfft` (default is backend = "numpy").
+        **kwargs:
+            Keyword arguments passed to the backend constructor, e.g.
+            `workers` for "scipy", or `threads` and `planner_effort` for
+            "pyfftw".
+
+    Returns:
+        :obj:`object`: Previously selected backend.
+    """
+    global _fft_backend
+    if isinstance(backend, str):
+        try:
+            Backend = FFT_BACKENDS[backend]
+        except KeyError:
+            print("FFT BACKEND MUST BE ONE OF", list(FFT_BACKENDS.keys()))
+            raise
+        backend = Backend(**kwargs)
+    prev_backend, _fft_backend = _fft_backend, backend
+    return prev_backend
+
+
+def get_fft_backend():
+    r"""Currently selected backend for the fast Fourier-transforms.
+
+    Returns:
+        :obj:`object`: Selected FFT backend.
+    """
+    return _fft_backend
+
 
 # -- FAST FOURIER-TRANSFORM
-FT = nfft.ifft
-r"""Compute one-dimensional discrete Fourier Transform (DFT).
+def FT(a, n=None, axis=-1, norm=None):
+    r"""Compute one-dimensional discrete Fourier Transform (DFT).
 
-Note:
-    * Alias for `numpy.fft.ifft`.
-    * See numpy.ifft for definition of DFT, its arguments and conventions.
-    * See ifft for inverse of `fft`.
-"""
+    Note:
+        * Delegates to `ifft` of the selected FFT backend, which is
+          `numpy.fft.ifft` by default.
+        * See numpy.ifft for definition of DFT, its arguments and conventions.
+        * See ifft for inverse of `fft`.
+    """
+    return _fft_backend.ifft(a, n=n, axis=axis, norm=norm)
 
-IFT = nfft.fft
-r"""Compute one-dimensional inverse discrete Fourier Transform (DFT).
 
-Note:
-    * Alias for `numpy.fft.fft`.
-    * See numpy.fft for definition of DFT, its arguments and conventions.
-    * See FT for inverse of IFT.
-"""
+def IFT(a, n=None, axis=-1, norm=None):
+    r"""Compute one-dimensional inverse discrete Fourier Transform (DFT).
+
+    Note:
+        * Delegates to `fft` of the selected FFT backend, which is
+          `numpy.fft.fft` by default.
+        * See numpy.fft for definition of DFT, its arguments and conventions.
+        * See FT for inverse of IFT.
+    """
+    return _fft_backend.fft(a, n=n, axis=axis, norm=norm)
+
+
+def RFT(a, n=None, axis=-1, norm=None):
+    r"""Compute one-dimensional DFT of real-valued input.
+
+    Yields the non-negative frequency components of `FT`, i.e. for real-valued
+    input `x` of length `N`, `RFT(x)` equals `FT(x)[:N//2+1]`.
+
+    Note:
+        * Delegates to `ihfft` of the selected FFT backend, which is
+          `numpy.fft.ihfft` by default.
+        * See IRFT for inverse of `RFT`.
+    """
+    return _fft_backend.ihfft(a, n=n, axis=axis, norm=norm)
+
+
+def IRFT(a, n=None, axis=-1, norm=None):
+    r"""Compute one-dimensional inverse DFT yielding real-valued output.
+
+    Inverse of `RFT`, i.e. `IRFT(RFT(x), n=N)` recovers the real-valued input
+    `x` of length `N`.
+
+    Note:
+        * Delegates to `hfft` of the selected FFT backend, which is
+          `numpy.fft.hfft` by default.
+        * See RFT for inverse of `IRFT`.
+    """
+    return _fft_backend.hfft(a, n=n, axis=axis, norm=norm)
+
 
 FTFREQ = nfft.fftfreq
 r"""Discrete Fourier Transform sample frequencies.
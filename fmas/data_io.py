@@ -10,15 +10,24 @@ parameters and data from and to HDF5 files.
    fetch_par_dict_h5
    read_h5
    save_h5
+   H5SliceWriter
+   AsyncSliceWriter
+   MemmapSliceWriter
+   save_checkpoint_h5
+   load_checkpoint_h5
 
 .. module:: data_io
 
 .. codeauthor:: Oliver Melchert <melchert@iqo.uni-hannover.de>
 """
 import os
+import queue
+import struct
+import threading
 import h5py
 import numpy as np
 from dataclasses import dataclass
+from .config import IFT
 
 
 @dataclass
@@ -145,3 +154,652 @@ def save_data_to_file_h5(out_path, **results):
 
 # ALIAS FOR save_data_to_file_h5
 save_h5 = save_data_to_file_h5
+
+
+class H5SliceWriter:
+    r"""Streaming writer for :math:`z`-slices in HDF5 format.
+
+    Writes the field at each stored :math:`z`-slice to a chunked, resizable
+    HDF5 dataset as soon as it becomes available, so that the memory needed
+    during propagation does not depend on the number of stored slices. Can
+    be passed to the `propagate` method of a solver via its keyword argument
+    `sink`.
+
+    The output file holds the datasets
+
+    - `z`: :math:`z`-values of the stored slices,
+    - `uwz`: frequency-domain representation of the field at the stored
+      slices, one slice per HDF5 chunk,
+    - `ua_vals`: return-values of the user-supplied function (if any).
+
+    Further datasets can be added using the method :meth:`write`.
+
+    Args:
+        out_path (:obj:`str`):
+            Name for output file.
+        mode (:obj:`str`):
+            File mode; "w" creates a new file, "a" appends slices to the
+            datasets of an existing file (default is mode = "w").
+        compression (:obj:`str`):
+            HDF5 compression filter for the field data, e.g. "gzip" or
+            "lzf" (default is compression = None).
+        compression_opts (:obj:`object`):
+            Options for the compression filter, e.g. the compression level
+            for "gzip" (default is compression_opts = None).
+
+    Attributes:
+        out_path (:obj:`str`):
+            Name for output file.
+        file (:obj:`h5py.File`):
+            Output file.
+    """
+
+    def __init__(self, out_path, mode="w", compression=None, compression_opts=None):
+        dir_name = os.path.dirname(out_path)
+        if dir_name:
+            os.makedirs(dir_name, exist_ok=True)
+        self.out_path = out_path
+        self.file = h5py.File(out_path, mode)
+        self._compression = compression
+        self._compression_opts = compression_opts
+
+    def _dataset(self, name, item_shape, dtype, compress=False):
+        r"""Fetch extendable dataset from file or create it.
+
+        Args:
+            name (:obj:`str`): Dataset name.
+            item_shape (:obj:`tuple`): Shape of a single item.
+            dtype (:obj:`numpy.dtype`): Data type.
+            compress (:obj:`bool`): Apply compression filter.
+
+        Returns:
+            :obj:`h5py.Dataset`: Dataset extendable along its first axis.
+        """
+        if name in self.file:
+            return self.file[name]
+        opts = dict()
+        if compress and self._compression is not None:
+            opts = dict(
+                compression=self._compression,
+                compression_opts=self._compression_opts,
+            )
+        return self.file.create_dataset(
+            name,
+            shape=(0,) + item_shape,
+            maxshape=(None,) + item_shape,
+            chunks=(1,) + item_shape if item_shape else True,
+            dtype=dtype,
+            **opts
+        )
+
+    @staticmethod
+    def _append(dset, val):
+        r"""Append item to extendable dataset.
+
+        Args:
+            dset (:obj:`h5py.Dataset`): Dataset extendable along first axis.
+            val (:obj:`numpy.ndarray`): Item.
+        """
+        n = dset.shape[0]
+        dset.resize(n + 1, axis=0)
+        dset[n] = val
+
+    def append(self, z, uw, ua_val=None):
+        r"""Append field at single :math:`z`-slice.
+
+        Args:
+            z (:obj:`float`):
+                :math:`z`-value of slice.
+            uw (:obj:`numpy.ndarray`):
+                Frequency-domain representation of field.
+            ua_val (:obj:`object`):
+                Return-value of user-supplied function. Not stored if
+                None (default is ua_val = None).
+        """
+        uw = np.asarray(uw)
+        self._append(self._dataset("z", (), np.float64), z)
+        self._append(self._dataset("uwz", uw.shape, uw.dtype, compress=True), uw)
+        if ua_val is not None:
+            ua_val = np.asarray(ua_val)
+            self._append(self._dataset("ua_vals", ua_val.shape, ua_val.dtype), ua_val)
+
+    def write(self, **results):
+        r"""Write additional datasets.
+
+        Existing datasets of the same name are replaced.
+
+        Args:
+            **results: Arbitrary keyword arguments.
+        """
+        for key, val in results.items():
+            if key in self.file:
+                del self.file[key]
+            self.file.create_dataset(key, data=val)
+
+    @property
+    def num_slices(self):
+        r""":obj:`int`: Number of stored slices."""
+        return self.file["z"].shape[0] if "z" in self.file else 0
+
+    @property
+    def z(self):
+        r""":obj:`h5py.Dataset`: :math:`z`-values of stored slices."""
+        return self.file["z"]
+
+    @property
+    def uwz(self):
+        r""":obj:`h5py.Dataset`: Frequency-domain representation of field at
+        stored slices."""
+        return self.file["uwz"]
+
+    def truncate(self, num_slices):
+        r"""Discard all but the leading slices.
+
+        Used when resuming a propagation run from a checkpoint, to discard
+        slices written after the checkpoint was taken.
+
+        Args:
+            num_slices (:obj:`int`): Number of slices to keep.
+        """
+        for name in ("z", "uwz", "ua_vals"):
+            if name in self.file and self.file[name].shape[0] > num_slices:
+                self.file[name].resize(num_slices, axis=0)
+
+    def flush(self):
+        r"""Flush buffered data to disk"""
+        self.file.flush()
+
+    def close(self):
+        r"""Close output file"""
+        if self.file:
+            self.file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+class AsyncSliceWriter:
+    r"""Output sink passing :math:`z`-slices to a background writer thread.
+
+    Wraps an output sink, e.g. an instance of :class:`H5SliceWriter`, and
+    performs all calls to its method `append` in a separate thread, so that
+    disk I/O and compression of the field data overlap with the propagation
+    of the field. Slices are handed to the writer thread via a bounded queue.
+    If the queue is full, i.e. if writing falls behind the propagation,
+    :meth:`append` blocks until a queued slice has been written, so that the
+    number of slices held in memory never exceeds `maxsize`.
+
+    Can be passed to the `propagate` method of a solver via its keyword
+    argument `sink`, or is set up by the solver if `propagate` is called with
+    keyword argument `n_queue`.
+
+    Note:
+        *   The arrays passed to :meth:`append` are queued by reference and
+            must not be modified afterwards.
+
+        *   An exception raised by the wrapped sink is re-raised in the
+            calling thread by the subsequent call to :meth:`append`,
+            :meth:`flush`, or :meth:`stop`. Slices queued after the failing
+            write are discarded.
+
+    Args:
+        sink (:obj:`object`):
+            Output sink providing the methods `append(z, uw, ua_val)`,
+            `flush()`, and `truncate(num_slices)`, and the properties
+            `num_slices` and `uwz`.
+        maxsize (:obj:`int`):
+            Maximal number of queued slices (default is maxsize = 8).
+
+    Attributes:
+        sink (:obj:`object`):
+            Wrapped output sink.
+    """
+
+    def __init__(self, sink, maxsize=8):
+        self.sink = sink
+        self._queue = queue.Queue(maxsize=maxsize)
+        self._error = None
+        self._thread = threading.Thread(
+            target=self._work, name="AsyncSliceWriter", daemon=True
+        )
+        self._thread.start()
+
+    def _work(self):
+        r"""Perform queued calls until the stop signal None is received"""
+        while True:
+            item = self._queue.get()
+            try:
+                if item is None:
+                    return
+                if self._error is None:
+                    fun, args, kwargs = item
+                    fun(*args, **kwargs)
+            except BaseException as exc:
+                self._error = exc
+            finally:
+                self._queue.task_done()
+
+    def _check(self):
+        r"""Re-raise exception raised in the writer thread"""
+        if self._error is not None:
+            raise self._error
+
+    def _submit(self, fun, *args, **kwargs):
+        self._check()
+        if not self._thread.is_alive():
+            raise RuntimeError("writer thread is stopped")
+        # -- BLOCKS IF THE QUEUE IS FULL
+        self._queue.put((fun, args, kwargs))
+
+    def _drain(self):
+        r"""Wait until all queued calls are performed"""
+        self._queue.join()
+        self._check()
+
+    def append(self, z, uw, ua_val=None):
+        r"""Queue field at single :math:`z`-slice for writing.
+
+        Args:
+            z (:obj:`float`):
+                :math:`z`-value of slice.
+            uw (:obj:`numpy.ndarray`):
+                Frequency-domain representation of field.
+            ua_val (:obj:`object`):
+                Return-value of user-supplied function (default is ua_val =
+                None).
+        """
+        self._submit(self.sink.append, z, uw, ua_val)
+
+    def write(self, **results):
+        r"""Queue additional datasets for writing.
+
+        Args:
+            **results: Arbitrary keyword arguments.
+        """
+        self._submit(self.sink.write, **results)
+
+    @property
+    def num_slices(self):
+        r""":obj:`int`: Number of stored slices, including queued slices."""
+        self._drain()
+        return self.sink.num_slices
+
+    @property
+    def z(self):
+        r""":math:`z`-values of stored slices, after all queued slices have
+        been written."""
+        self._drain()
+        return self.sink.z
+
+    @property
+    def uwz(self):
+        r"""Frequency-domain representation of field at stored slices, after
+        all queued slices have been written."""
+        self._drain()
+        return self.sink.uwz
+
+    def truncate(self, num_slices):
+        r"""Discard all but the leading slices.
+
+        Args:
+            num_slices (:obj:`int`): Number of slices to keep.
+        """
+        self._drain()
+        self.sink.truncate(num_slices)
+
+    def flush(self):
+        r"""Write all queued slices and flush wrapped sink"""
+        self._drain()
+        self.sink.flush()
+
+    def stop(self):
+        r"""Write all queued slices and stop writer thread.
+
+        Returns:
+            :obj:`object`: Wrapped output sink.
+        """
+        if self._thread.is_alive():
+            self._queue.put(None)
+            self._thread.join()
+        self._check()
+        return self.sink
+
+    def close(self):
+        r"""Stop writer thread and close wrapped sink"""
+        try:
+            self.stop()
+        finally:
+            self.sink.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+class _NpyAppender:
+    r"""Array in NumPy's .npy format, extendable along its first axis.
+
+    Items are appended to the end of the file. The header, holding the
+    number of items, has fixed length and is rewritten in place by
+    :meth:`flush`, so that the file can be opened by `numpy.load` after each
+    flush.
+
+    Args:
+        path (:obj:`str`):
+            Location of .npy file.
+        mode (:obj:`str`):
+            File mode; "w" discards an existing file, "a" appends items to an
+            existing file (default is mode = "w").
+    """
+
+    # -- NUMBER OF DIGITS RESERVED FOR THE LENGTH OF THE FIRST AXIS
+    _n_digits = 20
+
+    def __init__(self, path, mode="w"):
+        self.path = path
+        self.item_shape = None
+        self.dtype = None
+        self.num = 0
+        self._offset = None
+        self._file = None
+        if mode == "w":
+            if os.path.exists(path):
+                os.remove(path)
+        elif os.path.exists(path):
+            with open(path, "rb") as f:
+                np.lib.format.read_magic(f)
+                shape, _, self.dtype = np.lib.format.read_array_header_1_0(f)
+                self._offset = f.tell()
+            self.num, self.item_shape = shape[0], shape[1:]
+            self._file = open(path, "r+b")
+            self._file.seek(self._offset + self.num * self._item_bytes)
+
+    @property
+    def _item_bytes(self):
+        return int(np.prod(self.item_shape, dtype=int)) * self.dtype.itemsize
+
+    def _header(self):
+        r"""Header of fixed length, padded to a multiple of 64 bytes"""
+        magic = np.lib.format.magic(1, 0)
+        d = {
+            "descr": np.lib.format.dtype_to_descr(self.dtype),
+            "fortran_order": False,
+            "shape": (self.num,) + tuple(self.item_shape),
+        }
+        header = repr(d).encode("latin1")
+        # ... LENGTH DOES NOT DEPEND ON THE NUMBER OF ITEMS
+        d["shape"] = (0,) + tuple(self.item_shape)
+        n_tot = len(magic) + 2 + len(repr(d)) + self._n_digits + 1
+        n_tot = 64 * ((n_tot + 63) // 64)
+        n_pad = n_tot - len(magic) - 2 - len(header) - 1
+        n_header = struct.pack("<H", n_tot - len(magic) - 2)
+        return magic + n_header + header + b" " * n_pad + b"\n"
+
+    def append(self, val):
+        r"""Append item.
+
+        Args:
+            val (:obj:`numpy.ndarray`): Item.
+        """
+        val = np.asarray(val)
+        if self._file is None:
+            self.item_shape, self.dtype = val.shape, val.dtype
+            self._file = open(self.path, "w+b")
+            header = self._header()
+            self._file.write(header)
+            self._offset = len(header)
+        val = np.asarray(val, dtype=self.dtype, order="C")
+        if val.shape != self.item_shape:
+            raise ValueError(
+                "item shape %s differs from %s" % (val.shape, self.item_shape)
+            )
+        self._file.write(val.data)
+        self.num += 1
+
+    def truncate(self, num):
+        r"""Discard all but the leading items.
+
+        Args:
+            num (:obj:`int`): Number of items to keep.
+        """
+        if self._file is None or num >= self.num:
+            return
+        self.num = num
+        self._file.truncate(self._offset + num * self._item_bytes)
+        self._file.seek(0, os.SEEK_END)
+
+    def flush(self):
+        r"""Update header and flush data to disk"""
+        if self._file is None:
+            return
+        self._file.seek(0)
+        self._file.write(self._header())
+        self._file.seek(0, os.SEEK_END)
+        self._file.flush()
+
+    def array(self):
+        r"""Memory-mapped, read-only view of the stored items.
+
+        Returns:
+            :obj:`numpy.ndarray`: Stored items, or None if no item was stored.
+        """
+        if self._file is None:
+            return None
+        self.flush()
+        if self.num == 0:
+            return np.zeros((0,) + tuple(self.item_shape), dtype=self.dtype)
+        return np.load(self.path, mmap_mode="r")
+
+    def close(self):
+        r"""Close file"""
+        if self._file is not None:
+            self.flush()
+            self._file.close()
+            self._file = None
+
+
+class MemmapSliceWriter:
+    r"""Streaming writer for :math:`z`-slices to memory-mapped arrays.
+
+    Writes the field at each stored :math:`z`-slice to a file in NumPy's
+    .npy format as soon as it becomes available. After propagation, the
+    stored fields are accessed as memory-mapped arrays, i.e. data is read
+    from disk only when needed, so that outputs exceeding the available
+    memory can be processed. Can be passed to the `propagate` method of a
+    solver via its keyword argument `sink`.
+
+    The output directory holds the files
+
+    - `z.npy`: :math:`z`-values of the stored slices,
+    - `uwz.npy`: frequency-domain representation of the field at the stored
+      slices,
+    - `ua_vals.npy`: return-values of the user-supplied function (if any),
+    - `utz.npy`: time-domain representation of the field at the stored
+      slices, written by :meth:`utz`.
+
+    Further arrays can be added using the method :meth:`write`.
+
+    Args:
+        out_dir (:obj:`str`):
+            Output directory.
+        mode (:obj:`str`):
+            File mode; "w" discards existing output, "a" appends slices to
+            existing output (default is mode = "w").
+        chunk_bytes (:obj:`int`):
+            Memory budget, in bytes, for the transformation of the stored
+            slices to the time domain (default is chunk_bytes = 2**26).
+
+    Attributes:
+        out_dir (:obj:`str`):
+            Output directory.
+    """
+
+    def __init__(self, out_dir, mode="w", chunk_bytes=2 ** 26):
+        os.makedirs(out_dir, exist_ok=True)
+        self.out_dir = out_dir
+        self.chunk_bytes = chunk_bytes
+        _path = lambda name: os.path.join(out_dir, name + ".npy")
+        self._z = _NpyAppender(_path("z"), mode)
+        self._uwz = _NpyAppender(_path("uwz"), mode)
+        self._ua_vals = _NpyAppender(_path("ua_vals"), mode)
+        self._utz_path = _path("utz")
+        self._utz = None
+
+    def append(self, z, uw, ua_val=None):
+        r"""Append field at single :math:`z`-slice.
+
+        Args:
+            z (:obj:`float`):
+                :math:`z`-value of slice.
+            uw (:obj:`numpy.ndarray`):
+                Frequency-domain representation of field.
+            ua_val (:obj:`object`):
+                Return-value of user-supplied function. Not stored if
+                None (default is ua_val = None).
+        """
+        self._z.append(np.float64(z))
+        self._uwz.append(uw)
+        if ua_val is not None:
+            self._ua_vals.append(ua_val)
+        self._utz = None
+
+    def write(self, **results):
+        r"""Write additional arrays.
+
+        Existing arrays of the same name are replaced.
+
+        Args:
+            **results: Arbitrary keyword arguments.
+        """
+        for key, val in results.items():
+            np.save(os.path.join(self.out_dir, key + ".npy"), val)
+
+    @property
+    def num_slices(self):
+        r""":obj:`int`: Number of stored slices."""
+        return self._z.num
+
+    @property
+    def z(self):
+        r""":obj:`numpy.ndarray`: :math:`z`-values of stored slices."""
+        return self._z.array()
+
+    @property
+    def uwz(self):
+        r""":obj:`numpy.memmap`: Frequency-domain representation of field at
+        stored slices."""
+        return self._uwz.array()
+
+    @property
+    def ua_vals(self):
+        r""":obj:`numpy.memmap`: Return-values of user-supplied function at
+        stored slices, or None if not available."""
+        return self._ua_vals.array()
+
+    def utz(self, t_num=None):
+        r"""Time-domain representation of field at stored slices.
+
+        The stored slices are transformed in chunks, holding at most
+        `chunk_bytes` bytes of field data, and written to a memory-mapped
+        array. The result is reused by subsequent calls until further slices
+        are stored.
+
+        Args:
+            t_num (:obj:`int`):
+                Number of time mesh-points (default is t_num = None, i.e. the
+                number of frequency mesh-points).
+
+        Returns:
+            :obj:`numpy.memmap`: Time-domain representation of field.
+        """
+        uwz = self.uwz
+        t_num = uwz.shape[-1] if t_num is None else t_num
+        if self._utz is not None and self._utz.shape[-1] == t_num:
+            return self._utz
+        shape = uwz.shape[:-1] + (t_num,)
+        utz = np.lib.format.open_memmap(
+            self._utz_path, mode="w+", dtype=np.result_type(uwz, 1j), shape=shape
+        )
+        # -- NUMBER OF SLICES PER CHUNK
+        n_chunk = max(1, self.chunk_bytes // max(1, utz[:1].nbytes))
+        for i in range(0, shape[0], n_chunk):
+            utz[i : i + n_chunk] = IFT(uwz[i : i + n_chunk], n=t_num, axis=-1)
+        utz.flush()
+        del utz
+        self._utz = np.load(self._utz_path, mmap_mode="r")
+        return self._utz
+
+    def truncate(self, num_slices):
+        r"""Discard all but the leading slices.
+
+        Used when resuming a propagation run from a checkpoint, to discard
+        slices written after the checkpoint was taken.
+
+        Args:
+            num_slices (:obj:`int`): Number of slices to keep.
+        """
+        for arr in (self._z, self._uwz, self._ua_vals):
+            arr.truncate(num_slices)
+        self._utz = None
+
+    def flush(self):
+        r"""Flush buffered data to disk"""
+        for arr in (self._z, self._uwz, self._ua_vals):
+            arr.flush()
+
+    def close(self):
+        r"""Close output files"""
+        for arr in (self._z, self._uwz, self._ua_vals):
+            arr.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def save_checkpoint_h5(file_path, attrs, **data):
+    r"""Save checkpoint in HDF5 format.
+
+    The checkpoint is first written to a temporary file, which then replaces
+    `file_path`. Thus, an interrupted write does not destroy a previously
+    saved checkpoint.
+
+    Args:
+        file_path (:obj:`str`): Location of checkpoint file.
+        attrs (:obj:`dict`): Scalar parameters, stored as HDF5 attributes.
+        **data: Arrays, stored as HDF5 datasets.
+    """
+    dir_name = os.path.dirname(file_path)
+    if dir_name:
+        os.makedirs(dir_name, exist_ok=True)
+    tmp_path = file_path + ".tmp"
+    with h5py.File(tmp_path, "w") as f:
+        for key, val in attrs.items():
+            f.attrs[key] = val
+        for key, val in data.items():
+            f.create_dataset(key, data=val)
+    os.replace(tmp_path, file_path)
+
+
+def load_checkpoint_h5(file_path):
+    r"""Load checkpoint from HDF5 file.
+
+    Args:
+        file_path (:obj:`str`): Location of checkpoint file.
+
+    Returns:
+        :obj:`tuple`: (attrs, data), where `attrs` (:obj:`dict`) holds the
+        scalar parameters, and `data` (:obj:`dict`) holds the arrays of the
+        checkpoint.
+    """
+    with h5py.File(file_path, "r") as f:
+        attrs = dict(f.attrs)
+        data = {key: f[key][()] for key in f.keys()}
+    return attrs, data
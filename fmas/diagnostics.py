@@ -0,0 +1,362 @@
+r"""
+Implements reducers computing observables of the field on the fly during
+propagation.
+
+.. autosummary::
+   :nosignatures:
+
+   Diagnostics
+   SliceData
+   Reducer
+   Energy
+   PeakPower
+   CenterOfMassT
+   CenterOfMassW
+   SpectralBandwidth
+   BandEnergy
+   UserFunction
+
+A reducer maps the field at a single :math:`z`-slice to a scalar or a 1-dim
+array. Reducers are collected by an instance of :class:`Diagnostics`, which
+is passed to the `propagate` method of a solver via its keyword argument
+`sink`, and evaluates all reducers at each stored :math:`z`-slice. Unless
+another output sink is wrapped, the fields are not stored, so that only the
+observables are kept in memory. With `n_skip = 1`, the observables are thus
+obtained at each integration step, at negligible memory cost.
+
+Quantities needed by several reducers, such as the time-domain
+representation of the field and the intensities in the time and frequency
+domain, are computed only once per :math:`z`-slice, see :class:`SliceData`.
+All reducers act along the last axis, so that a batch of fields, see
+:class:`fmas.solver.solver_base.SolverBaseClass`, yields one value per
+member.
+
+Example:
+
+    >>> diag = Diagnostics(grid.t, grid.w, [Energy(), PeakPower(),
+    ...                    UserFunction(model.claw, name="Cp")])
+    >>> solver.propagate(z_range=z_max, n_steps=z_num, n_skip=1, sink=diag)
+    >>> E, P = diag["Energy"], diag["PeakPower"]
+
+.. module:: diagnostics
+
+.. codeauthor:: Oliver Melchert <melchert@iqo.uni-hannover.de>
+"""
+import numpy as np
+from .config import IFT
+from .data_io import save_h5
+
+
+class SliceData:
+    r"""Field at a single :math:`z`-slice, as seen by the reducers.
+
+    Derived quantities are computed upon first access and shared by all
+    reducers.
+
+    Args:
+        i (:obj:`int`): Index of the stored slice.
+        z (:obj:`float`): :math:`z`-value of the slice.
+        t (:obj:`numpy.ndarray`): Temporal grid.
+        w (:obj:`numpy.ndarray`): Angular frequency grid.
+        uw (:obj:`numpy.ndarray`): Frequency-domain representation of field.
+
+    Attributes:
+        i (:obj:`int`): Index of the stored slice.
+        z (:obj:`float`): :math:`z`-value of the slice.
+        t (:obj:`numpy.ndarray`): Temporal grid.
+        w (:obj:`numpy.ndarray`): Angular frequency grid.
+        uw (:obj:`numpy.ndarray`): Frequency-domain representation of field.
+    """
+
+    def __init__(self, i, z, t, w, uw):
+        self.i = i
+        self.z = z
+        self.t = t
+        self.w = w
+        self.uw = uw
+        self._ut = None
+        self._It = None
+        self._Iw = None
+
+    @property
+    def dt(self):
+        r""":obj:`float`: Temporal mesh-width."""
+        return float(self.t[1] - self.t[0])
+
+    @property
+    def ut(self):
+        r""":obj:`numpy.ndarray`: Time-domain representation of field."""
+        if self._ut is None:
+            self._ut = IFT(self.uw, n=self.t.size, axis=-1)
+        return self._ut
+
+    @property
+    def It(self):
+        r""":obj:`numpy.ndarray`: Intensity :math:`|u|^2` in the time domain."""
+        if self._It is None:
+            self._It = np.abs(self.ut) ** 2
+        return self._It
+
+    @property
+    def Iw(self):
+        r""":obj:`numpy.ndarray`: Intensity :math:`|u_\omega|^2` in the
+        frequency domain."""
+        if self._Iw is None:
+            self._Iw = np.abs(self.uw) ** 2
+        return self._Iw
+
+    @property
+    def energy(self):
+        r""":obj:`numpy.ndarray`: Energy :math:`\sum_t |u|^2\,\Delta t`,
+        obtained from the frequency-domain intensity via Parseval's
+        theorem."""
+        return self.t.size * self.dt * np.sum(self.Iw, axis=-1, dtype=float)
+
+
+class Reducer:
+    r"""Base class for reducers.
+
+    Subclasses implement the method `__call__(s)`, mapping an instance `s`
+    of :class:`SliceData` to a scalar, or an array of fixed shape.
+
+    Attributes:
+        name (:obj:`str`): Name under which the values are stored.
+    """
+
+    name = None
+
+    def __call__(self, s):
+        raise NotImplementedError
+
+
+class Energy(Reducer):
+    r"""Energy :math:`E = \sum_t |u(t)|^2\,\Delta t`."""
+
+    name = "Energy"
+
+    def __call__(self, s):
+        return s.energy
+
+
+class PeakPower(Reducer):
+    r"""Peak power :math:`\max_t |u(t)|^2`."""
+
+    name = "PeakPower"
+
+    def __call__(self, s):
+        return np.max(s.It, axis=-1)
+
+
+class CenterOfMassT(Reducer):
+    r"""Center of mass in time, :math:`\sum_t t|u(t)|^2/\sum_t |u(t)|^2`."""
+
+    name = "CenterOfMassT"
+
+    def __call__(self, s):
+        It = s.It
+        norm = np.sum(It, axis=-1, dtype=float)
+        return np.sum(s.t * It, axis=-1, dtype=float) / norm
+
+
+class CenterOfMassW(Reducer):
+    r"""Center of mass in angular frequency,
+    :math:`\sum_\omega \omega|u_\omega|^2/\sum_\omega |u_\omega|^2`."""
+
+    name = "CenterOfMassW"
+
+    def __call__(self, s):
+        Iw = s.Iw
+        norm = np.sum(Iw, axis=-1, dtype=float)
+        return np.sum(s.w * Iw, axis=-1, dtype=float) / norm
+
+
+class SpectralBandwidth(Reducer):
+    r"""Root-mean-square spectral bandwidth
+
+    .. math::
+        \Delta\omega = \sqrt{\langle \omega^2 \rangle - \langle \omega
+        \rangle^2},
+
+    with averages weighted by :math:`|u_\omega|^2`.
+    """
+
+    name = "SpectralBandwidth"
+
+    def __call__(self, s):
+        Iw, w = s.Iw, s.w
+        norm = np.sum(Iw, axis=-1, dtype=float)
+        w1 = np.sum(w * Iw, axis=-1, dtype=float) / norm
+        w2 = np.sum(w * w * Iw, axis=-1, dtype=float) / norm
+        return np.sqrt(np.maximum(w2 - w1 * w1, 0.0))
+
+
+class BandEnergy(Reducer):
+    r"""Energy within angular frequency bands.
+
+    The energy within each band is obtained from the frequency-domain
+    intensity as a single matrix product, and stored along the last axis.
+
+    Args:
+        bands (:obj:`list` of :obj:`tuple`):
+            Angular frequency bands in the form (w_min, w_max).
+        name (:obj:`str`):
+            Name under which the values are stored (default is name =
+            "BandEnergy").
+    """
+
+    def __init__(self, bands, name="BandEnergy"):
+        self.bands = np.asarray(bands, dtype=float).reshape(-1, 2)
+        self.name = name
+        self._mask = None
+
+    def __call__(self, s):
+        if self._mask is None or self._mask.shape[1] != s.w.size:
+            # -- MATRIX OF SHAPE (N_BANDS, W_NUM) SELECTING THE BANDS
+            w = np.asarray(s.w, dtype=float)
+            w_min, w_max = self.bands[:, :1], self.bands[:, 1:]
+            self._mask = ((w >= w_min) & (w < w_max)).astype(float)
+        return s.t.size * s.dt * np.matmul(s.Iw, self._mask.T)
+
+
+class UserFunction(Reducer):
+    r"""Reducer wrapping a user-supplied function.
+
+    Args:
+        fun (:obj:`function`):
+            Function with call signature `fun(i, zi, w, uw)`, as for the
+            keyword argument `user_action` of the solvers, e.g. the method
+            `claw` of a propagation model.
+        name (:obj:`str`):
+            Name under which the values are stored (default is name = None,
+            i.e. the name of `fun`).
+    """
+
+    def __init__(self, fun, name=None):
+        self.fun = fun
+        if name is None:
+            name = getattr(fun, "__name__", "UserFunction")
+        self.name = name
+
+    def __call__(self, s):
+        return self.fun(s.i, s.z, s.w, s.uw)
+
+
+class Diagnostics:
+    r"""Output sink evaluating reducers at the stored :math:`z`-slices.
+
+    Can be passed to the `propagate` method of a solver via its keyword
+    argument `sink`. At each stored :math:`z`-slice, all reducers are
+    evaluated and their values are accumulated in memory. The field itself is
+    passed on to the wrapped output sink, if any, and is discarded otherwise.
+
+    Note:
+        Without wrapped output sink, only the field at the first
+        :math:`z`-slice is kept, so that the `uwz` property of the solver
+        holds a single slice. To resume a propagation run from a
+        checkpoint, pass the same instance of :class:`Diagnostics` to the
+        `resume` method of the solver.
+
+    Args:
+        t (:obj:`numpy.ndarray`):
+            Temporal grid.
+        w (:obj:`numpy.ndarray`):
+            Angular frequency grid.
+        reducers (:obj:`list` of :obj:`Reducer`):
+            Reducers, with unique names.
+        sink (:obj:`object`):
+            Output sink receiving the field at the stored :math:`z`-slices,
+            e.g. an instance of :class:`fmas.data_io.H5SliceWriter` (default
+            is sink = None, i.e. fields are not stored).
+
+    Attributes:
+        reducers (:obj:`list` of :obj:`Reducer`):
+            Reducers.
+        sink (:obj:`object`):
+            Wrapped output sink.
+    """
+
+    def __init__(self, t, w, reducers, sink=None):
+        names = [r.name for r in reducers]
+        if len(set(names)) != len(names):
+            raise ValueError("reducer names must be unique, got %s" % names)
+        self.t = np.asarray(t)
+        self.w = np.asarray(w)
+        self.reducers = list(reducers)
+        self.sink = sink
+        self._z = []
+        self._vals = {name: [] for name in names}
+        self._uw0 = None
+
+    def append(self, z, uw, ua_val=None):
+        r"""Evaluate reducers for field at single :math:`z`-slice.
+
+        Args:
+            z (:obj:`float`):
+                :math:`z`-value of slice.
+            uw (:obj:`numpy.ndarray`):
+                Frequency-domain representation of field.
+            ua_val (:obj:`object`):
+                Return-value of user-supplied function, passed on to the
+                wrapped output sink (default is ua_val = None).
+        """
+        s = SliceData(len(self._z), z, self.t, self.w, uw)
+        for r in self.reducers:
+            self._vals[r.name].append(r(s))
+        self._z.append(z)
+        if self.sink is not None:
+            self.sink.append(z, uw, ua_val)
+        elif self._uw0 is None:
+            self._uw0 = uw
+
+    @property
+    def num_slices(self):
+        r""":obj:`int`: Number of stored slices."""
+        return len(self._z)
+
+    @property
+    def z(self):
+        r""":obj:`numpy.ndarray`: :math:`z`-values of stored slices."""
+        return np.asarray(self._z)
+
+    @property
+    def uwz(self):
+        r"""Frequency-domain representation of field at stored slices, taken
+        from the wrapped output sink. Without wrapped sink, only the field at
+        the first slice is available."""
+        if self.sink is not None:
+            return self.sink.uwz
+        return np.asarray(self._uw0)[np.newaxis]
+
+    @property
+    def results(self):
+        r""":obj:`dict`: Values of all reducers, as arrays with the
+        :math:`z`-slices along the first axis."""
+        return {name: np.asarray(vals) for name, vals in self._vals.items()}
+
+    def __getitem__(self, name):
+        return np.asarray(self._vals[name])
+
+    def truncate(self, num_slices):
+        r"""Discard all but the leading slices.
+
+        Args:
+            num_slices (:obj:`int`): Number of slices to keep.
+        """
+        del self._z[num_slices:]
+        for vals in self._vals.values():
+            del vals[num_slices:]
+        if self.sink is not None:
+            self.sink.truncate(num_slices)
+
+    def flush(self):
+        r"""Flush wrapped output sink"""
+        if self.sink is not None:
+            self.sink.flush()
+
+    def save(self, out_path):
+        r"""Save :math:`z`-values and values of all reducers in HDF5 format.
+
+        Args:
+            out_path (:obj:`str`): Name for output file.
+        """
+        save_h5(out_path, z=self.z, **self.results)
@@ -0,0 +1,222 @@
+"""
+Implements interchangeable backends for the fast Fourier-transforms used
+throughout the package.
+
+.. autosummary::
+   :nosignatures:
+
+   NumpyFFT
+   ScipyFFT
+   PyfftwFFT
+
+Each backend provides the methods `fft`, `ifft`, `rfft`, `irfft`, `hfft`,
+and `ihfft` with call signatures and conventions as the respective functions
+in `numpy.fft`.  The backend used by the transforms `FT`, `IFT`, `RFT`, and
+`IRFT` of module :mod:`config` can be selected at runtime via
+:func:`config.set_fft_backend`.
+
+.. module:: fft_backends
+
+.. codeauthor:: Oliver Melchert <melchert@iqo.uni-hannover.de>
+"""
+import threading
+import numpy as np
+import numpy.fft as nfft
+
+
+class NumpyFFT:
+    r"""FFT backend using `numpy.fft`.
+
+    Default backend of the package.
+    """
+
+    name = "numpy"
+
+    def fft(self, a, n=None, axis=-1, norm=None):
+        return nfft.fft(a, n=n, axis=axis, norm=norm)
+
+    def ifft(self, a, n=None, axis=-1, norm=None):
+        return nfft.ifft(a, n=n, axis=axis, norm=norm)
+
+    def rfft(self, a, n=None, axis=-1, norm=None):
+        return nfft.rfft(a, n=n, axis=axis, norm=norm)
+
+    def irfft(self, a, n=None, axis=-1, norm=None):
+        return nfft.irfft(a, n=n, axis=axis, norm=norm)
+
+    def hfft(self, a, n=None, axis=-1, norm=None):
+        return nfft.hfft(a, n=n, axis=axis, norm=norm)
+
+    def ihfft(self, a, n=None, axis=-1, norm=None):
+        return nfft.ihfft(a, n=n, axis=axis, norm=norm)
+
+
+class ScipyFFT:
+    r"""FFT backend using `scipy.fft`.
+
+    Allows to distribute the transforms of multi-dimensional input along
+    several worker threads.
+
+    Args:
+        workers (:obj:`int`):
+            Maximum number of workers to use for parallel computation. If
+            negative, the value wraps around from `os.cpu_count()` (default is
+            workers = -1, i.e. use all available cores).
+    """
+
+    name = "scipy"
+
+    def __init__(self, workers=-1):
+        import scipy.fft as sfft
+
+        self._sfft = sfft
+        self.workers = workers
+
+    def fft(self, a, n=None, axis=-1, norm=None):
+        return self._sfft.fft(a, n=n, axis=axis, norm=norm, workers=self.workers)
+
+    def ifft(self, a, n=None, axis=-1, norm=None):
+        return self._sfft.ifft(a, n=n, axis=axis, norm=norm, workers=self.workers)
+
+    def rfft(self, a, n=None, axis=-1, norm=None):
+        return self._sfft.rfft(a, n=n, axis=axis, norm=norm, workers=self.workers)
+
+    def irfft(self, a, n=None, axis=-1, norm=None):
+        return self._sfft.irfft(a, n=n, axis=axis, norm=norm, workers=self.workers)
+
+    def hfft(self, a, n=None, axis=-1, norm=None):
+        return self._sfft.hfft(a, n=n, axis=axis, norm=norm, workers=self.workers)
+
+    def ihfft(self, a, n=None, axis=-1, norm=None):
+        return self._sfft.ihfft(a, n=n, axis=axis, norm=norm, workers=self.workers)
+
+
+class PyfftwFFT:
+    r"""FFT backend using planned transforms provided by pyFFTW.
+
+    For each distinct combination of transform type, array shape, data type,
+    transform length, and axis, an FFTW plan operating on SIMD-aligned
+    buffers is created once and reused for all subsequent transforms.
+
+    Note:
+        *   Requires the optional dependency `pyFFTW`.
+
+        *   Plans, and the buffers they operate on, are not thread-safe.
+            Hence, each thread uses its own cache of plans, so that a single
+            instance of this backend can be used concurrently by several
+            threads.
+
+    Args:
+        threads (:obj:`int`):
+            Number of threads used by each transform (default is threads = 1).
+        planner_effort (:obj:`str`):
+            FFTW planner effort (default is planner_effort = "FFTW_MEASURE").
+
+    Attributes:
+        threads (:obj:`int`):
+            Number of threads used by each transform.
+        planner_effort (:obj:`str`):
+            FFTW planner effort.
+    """
+
+    name = "pyfftw"
+
+    def __init__(self, threads=1, planner_effort="FFTW_MEASURE"):
+        try:
+            import pyfftw
+        except ImportError:
+            raise ImportError(
+                "FFT backend 'pyfftw' requires the optional package pyFFTW"
+            )
+        self._pyfftw = pyfftw
+        self.threads = threads
+        self.planner_effort = planner_effort
+        self._local = threading.local()
+
+    def _plan(self, kind, a, n, axis, norm):
+        r"""Fetch plan from cache or create new plan.
+
+        Args:
+            kind (:obj:`str`): Transform type.
+            a (:obj:`numpy.ndarray`): Input array.
+            n (:obj:`int`): Transform length.
+            axis (:obj:`int`): Transform axis.
+            norm (:obj:`str`): Normalization mode.
+
+        Returns:
+            :obj:`callable`: Planned transform.
+        """
+        key = (kind, a.shape, a.dtype.str, n, axis, norm)
+        # -- PLAN CACHE OF THE CALLING THREAD
+        try:
+            plans = self._local.plans
+        except AttributeError:
+            plans = self._local.plans = dict()
+        try:
+            return plans[key]
+        except KeyError:
+            buf = self._pyfftw.empty_aligned(a.shape, dtype=a.dtype)
+            plan = getattr(self._pyfftw.builders, kind)(
+                buf,
+                n=n,
+                axis=axis,
+                norm=norm,
+                threads=self.threads,
+                planner_effort=self.planner_effort,
+            )
+            plans[key] = plan
+            return plan
+
+    def _execute(self, kind, a, n, axis, norm):
+        a = np.asarray(a)
+        if kind in ("fft", "ifft") and a.dtype.kind != "c":
+            a = a.astype(np.result_type(a.dtype, np.complex64))
+        # -- PLANS RETURN THEIR INTERNAL OUTPUT BUFFER, WHICH IS OVERWRITTEN
+        # ... ON THE NEXT CALL. HENCE, HAND OUT A COPY
+        return self._plan(kind, a, n, axis, norm)(a).copy()
+
+    def fft(self, a, n=None, axis=-1, norm=None):
+        return self._execute("fft", a, n, axis, norm)
+
+    def ifft(self, a, n=None, axis=-1, norm=None):
+        return self._execute("ifft", a, n, axis, norm)
+
+    def rfft(self, a, n=None, axis=-1, norm=None):
+        return self._execute("rfft", a, n, axis, norm)
+
+    def irfft(self, a, n=None, axis=-1, norm=None):
+        return self._execute("irfft", a, n, axis, norm)
+
+    def hfft(self, a, n=None, axis=-1, norm=None):
+        # -- HERMITIAN TRANSFORMS VIA C2R AND R2C TRANSFORMS OF CONJUGATE DATA
+        # ... WITH SWAPPED NORMALIZATION
+        a = np.asarray(a)
+        n = 2 * (a.shape[axis] - 1) if n is None else n
+        return self.irfft(np.conj(a), n=n, axis=axis, norm=_swap_norm(norm))
+
+    def ihfft(self, a, n=None, axis=-1, norm=None):
+        a = np.asarray(a)
+        return np.conj(self.rfft(a, n=n, axis=axis, norm=_swap_norm(norm)))
+
+
+def _swap_norm(norm):
+    r"""Normalization mode of the transform in opposite direction.
+
+    Args:
+        norm (:obj:`str`): Normalization mode.
+
+    Returns:
+        :obj:`str`: Normalization mode yielding the same scaling factor for
+        the transform in opposite direction.
+    """
+    return {None: "forward", "backward": "forward", "forward": "backward"}.get(
+        norm, norm
+    )
+
+
+FFT_BACKENDS = {
+    "numpy": NumpyFFT,
+    "scipy": ScipyFFT,
+    "pyfftw": PyfftwFFT,
+}
+r"""dict: Registry of available FFT backends, indexed by name."""
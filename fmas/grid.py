@@ -8,6 +8,9 @@ Module containing grid data structure specifying the computational domain.
 import numpy as np
 from .config import FTFREQ, FT, IFT, W_MAX_FAC
 
+# -- REAL DATA TYPES FOR THE SUPPORTED FLOATING POINT PRECISIONS
+PRECISION_DTYPES = {"double": np.dtype(np.float64), "single": np.dtype(np.float32)}
+
 
 class Grid:
     r"""Data structure specifying the discretized computational domain.
@@ -15,11 +18,33 @@ class Grid:
     The computational domain is discretized by using a time mesh and
     z-coordinate mesh with uniform mesh-widths.
 
+    The floating point precision of the time and angular frequency meshes
+    sets the precision of a simulation run: models set up on the angular
+    frequency mesh of a grid with precision "single" operate on fields of
+    type complex64, and the solvers propagate and store fields of this type.
+    Reductions sensitive to roundoff, such as the conservation laws of the
+    models and the local error estimates of the solvers, are accumulated in
+    double precision. The linear operator is kept in double precision and the
+    linear propagators are converted to single precision only after
+    exponentiation, which requires the propagation constant to be evaluated
+    on the double precision angular frequency mesh `w_double`. Propagation
+    constants evaluated on the rounded single precision mesh `w` cause
+    phase errors that grow with the propagation distance.
+
+    Note:
+        Single precision requires an FFT backend that preserves the data
+        type complex64. With numpy < 2.0, the transforms of `numpy.fft`
+        return complex128, so that a run would silently proceed in double
+        precision. In this case, select the backend "scipy" or "pyfftw" via
+        :func:`fmas.config.set_fft_backend` before setting up the grid.
+
     Args:
         t_max (float): temporal mesh extends from -t_max to t_max.
         t_num (int): number of meshpoints for temporal mesh.
         z_max (float): propagation range.
         z_int (int): number of z-steps.
+        precision (str): floating point precision, one of "double" or
+            "single" (default: "double").
 
     Attributes:
         t_max (float): time mesh extending from -t_max to t_max.
@@ -28,35 +53,66 @@ class Grid:
         z_int (int): number of z-steps.
         t (np.ndarray): array representing time mesh.
         dt (float): time mesh-width.
+        w (np.ndarray): array representing angular frequency mesh.
+        w_double (np.ndarray): angular frequency mesh in double precision,
+            for setting up the propagation constant.
+        dw (float): angular frequency mesh-width.
         z (np.ndarray): z-coordinate mesh.
         dz (float): z-coordinate mesh width.
+        precision (str): floating point precision.
+        dtype (np.dtype): real data type of time and angular frequency mesh.
     """
 
-    def __init__(self, t_max, t_num, z_max=None, z_num=None):
+    def __init__(self, t_max, t_num, z_max=None, z_num=None, precision="double"):
         self.t_max = t_max
         self.t_num = t_num
         self.z_max = z_max
         self.z_num = z_num
+        try:
+            self.dtype = PRECISION_DTYPES[precision]
+        except KeyError:
+            print("PRECISION MUST BE ONE OF", list(PRECISION_DTYPES.keys()))
+            raise
+        self.precision = precision
+        self._check_precision()
         self.t, self.dt = self._set_t_axis()
-        self.w, self.dw = self._set_w_axis()
+        self.w_double, self.dw = self._set_w_axis()
+        self.w = self.w_double.astype(self.dtype, copy=False)
         if z_max is not None:
             self.z, self.dz = self._set_z_axis()
 
+    def _check_precision(self):
+        r"""Check that the FFT backend preserves the floating point precision.
+
+        Raises:
+            ValueError: if the transforms upcast fields to a data type of
+                higher precision.
+        """
+        c_dtype = np.result_type(self.dtype, np.complex64)
+        ft_dtype = FT(np.zeros(2, dtype=c_dtype)).dtype
+        if ft_dtype != c_dtype:
+            print("FFT BACKEND UPCASTS", c_dtype, "TO", ft_dtype)
+            raise ValueError(
+                "precision %r not supported by FFT backend; use the backend "
+                "'scipy' or 'pyfftw', or numpy>=2.0" % self.precision
+            )
+
     def _set_t_axis(self):
         r"""Set temporal mesh.
 
         Returns:
             t (np.ndarray): temporal mesh.
         """
-        return np.linspace(
+        t, dt = np.linspace(
             -self.t_max, self.t_max, self.t_num, endpoint=False, retstep=True
         )
+        return t.astype(self.dtype, copy=False), dt
 
     def _set_w_axis(self):
         r"""Set angular frequency mesh.
 
         Returns:
-            w (np.ndarray): angular frequency mesh.
+            w (np.ndarray): angular frequency mesh in double precision.
         """
         w = FTFREQ(self.t.size, d=self.dt) * 2 * np.pi
         dw = w[1] - w[0]
@@ -0,0 +1,292 @@
+"""
+Implements interchangeable backends for the elementwise operations of the
+nonlinear operators of the propagation models.
+
+.. autosummary::
+   :nosignatures:
+
+   NumpyKernels
+   NumbaKernels
+
+Each backend provides the methods `kerr`, `intensity`, `raman`, `real_cube`,
+`scale`, and `scale_pfp`. The models call the functions of the same name
+defined in this module, which delegate to the currently selected backend.
+
+The backend using `numba` fuses the chain of elementwise operations of each
+method into a single parallel loop, avoiding the temporary arrays, and the
+associated passes over memory, created by the equivalent NumPy expressions.
+It is selected by default if `numba` is installed. Otherwise, the NumPy
+backend is used, which implements the operations exactly as done by the
+models originally.
+
+Note:
+    Since the fused loops evaluate the elementwise operations in a different
+    order than the NumPy expressions, results obtained using both backends
+    agree only up to roundoff.
+
+.. module:: kernels
+
+.. codeauthor:: Oliver Melchert <melchert@iqo.uni-hannover.de>
+"""
+import numpy as np
+
+try:
+    import numba
+
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
+
+class NumpyKernels:
+    r"""Kernel backend using NumPy expressions."""
+
+    name = "numpy"
+
+    def kerr(self, ut):
+        r"""Kerr nonlinearity :math:`|u|^2 u`.
+
+        Args:
+            ut (:obj:`numpy.ndarray`): Time-domain representation of field.
+
+        Returns:
+            :obj:`numpy.ndarray`: Kerr nonlinearity.
+        """
+        return np.abs(ut) ** 2 * ut
+
+    def intensity(self, ut):
+        r"""Intensity :math:`|u|^2`.
+
+        Args:
+            ut (:obj:`numpy.ndarray`): Time-domain representation of field.
+
+        Returns:
+            :obj:`numpy.ndarray`: Intensity.
+        """
+        return np.abs(ut) ** 2
+
+    def raman(self, ut, I, I_conv, fR):
+        r"""Kerr and Raman nonlinearity :math:`(1-f_R)u I + f_R u I_{\rm{conv}}`.
+
+        Args:
+            ut (:obj:`numpy.ndarray`): Time-domain representation of field.
+            I (:obj:`numpy.ndarray`): Intensity :math:`|u|^2`.
+            I_conv (:obj:`numpy.ndarray`): Convolution of the intensity with
+                the Raman response function.
+            fR (:obj:`float`): Fractional Raman response.
+
+        Returns:
+            :obj:`numpy.ndarray`: Kerr and Raman nonlinearity.
+        """
+        return (1 - fR) * ut * I + fR * ut * I_conv
+
+    def real_cube(self, ut):
+        r"""Cubic nonlinearity of the real-valued field :math:`(u+u^*)^3`.
+
+        Args:
+            ut (:obj:`numpy.ndarray`): Time-domain representation of the
+                analytic signal.
+
+        Returns:
+            :obj:`numpy.ndarray`: Cubic nonlinearity.
+        """
+        return (ut + np.conj(ut)) ** 3
+
+    def scale(self, gamma, uw):
+        r"""Scaled field :math:`i\gamma u_\omega`.
+
+        Args:
+            gamma (:obj:`numpy.ndarray`): Frequency-dependent coefficient.
+            uw (:obj:`numpy.ndarray`): Frequency-domain representation of
+                field.
+
+        Returns:
+            :obj:`numpy.ndarray`: Scaled field.
+        """
+        return 1j * gamma * uw
+
+    def scale_pfp(self, gamma, uw, w):
+        r"""Scaled positive frequency part :math:`i\gamma u_\omega\,\Theta(\omega)`.
+
+        Args:
+            gamma (:obj:`numpy.ndarray`): Frequency-dependent coefficient.
+            uw (:obj:`numpy.ndarray`): Frequency-domain representation of
+                field.
+            w (:obj:`numpy.ndarray`): Angular frequency grid.
+
+        Returns:
+            :obj:`numpy.ndarray`: Scaled field with all components at
+            non-positive frequencies set to zero.
+        """
+        return 1j * gamma * np.where(w > 0, uw, 0j)
+
+
+if NUMBA_AVAILABLE:
+    # -- KERNELS OPERATE ON FLATTENED C-CONTIGUOUS ARRAYS; FREQUENCY-DEPENDENT
+    # ... COEFFICIENTS ARE BROADCAST ALONG THE LAST AXIS VIA INDEX MODULO N
+    _jit = numba.njit(parallel=True, cache=True)
+
+    @_jit
+    def _kerr(u, out):
+        for i in numba.prange(u.size):
+            ui = u[i]
+            out[i] = (ui.real * ui.real + ui.imag * ui.imag) * ui
+
+    @_jit
+    def _intensity(u, out):
+        for i in numba.prange(u.size):
+            ui = u[i]
+            out[i] = ui.real * ui.real + ui.imag * ui.imag
+
+    @_jit
+    def _raman(u, I, I_conv, fR, out):
+        for i in numba.prange(u.size):
+            out[i] = u[i] * ((1 - fR) * I[i] + fR * I_conv[i])
+
+    @_jit
+    def _real_cube(u, out):
+        for i in numba.prange(u.size):
+            x = 2.0 * u[i].real
+            out[i] = x * x * x
+
+    @_jit
+    def _scale(gamma, uw, out):
+        n = gamma.size
+        for i in numba.prange(uw.size):
+            out[i] = 1j * gamma[i % n] * uw[i]
+
+    @_jit
+    def _scale_pfp(gamma, uw, w, out):
+        n = gamma.size
+        for i in numba.prange(uw.size):
+            j = i % n
+            out[i] = 1j * gamma[j] * uw[i] if w[j] > 0 else 0j
+
+
+def _flat(x):
+    return np.ascontiguousarray(x).reshape(-1)
+
+
+def _complex_dtype(*args):
+    # -- PRESERVES SINGLE PRECISION OF THE ARGUMENTS, SEE :class:`Grid`
+    return np.result_type(*args, 1j)
+
+
+class NumbaKernels:
+    r"""Kernel backend using fused parallel loops compiled by `numba`.
+
+    Note:
+        The loops are compiled upon their first call, separately for single
+        and double precision arguments, and the compiled code is cached on
+        disk for subsequent sessions.
+    """
+
+    name = "numba"
+
+    def __init__(self):
+        if not NUMBA_AVAILABLE:
+            raise ImportError("kernel backend 'numba' requires numba")
+
+    def kerr(self, ut):
+        ut = np.asarray(ut, dtype=_complex_dtype(ut))
+        out = np.empty(ut.shape, dtype=ut.dtype)
+        _kerr(_flat(ut), out.reshape(-1))
+        return out
+
+    def intensity(self, ut):
+        ut = np.asarray(ut, dtype=_complex_dtype(ut))
+        out = np.empty(ut.shape, dtype=ut.real.dtype)
+        _intensity(_flat(ut), out.reshape(-1))
+        return out
+
+    def raman(self, ut, I, I_conv, fR):
+        ut = np.asarray(ut, dtype=_complex_dtype(ut, I, I_conv))
+        out = np.empty(ut.shape, dtype=ut.dtype)
+        _raman(_flat(ut), _flat(I), _flat(I_conv), fR, out.reshape(-1))
+        return out
+
+    def real_cube(self, ut):
+        ut = np.asarray(ut, dtype=_complex_dtype(ut))
+        out = np.empty(ut.shape, dtype=ut.real.dtype)
+        _real_cube(_flat(ut), out.reshape(-1))
+        return out
+
+    def scale(self, gamma, uw):
+        out = np.empty(np.shape(uw), dtype=_complex_dtype(gamma, uw))
+        _scale(_flat(gamma), _flat(uw), out.reshape(-1))
+        return out
+
+    def scale_pfp(self, gamma, uw, w):
+        out = np.empty(np.shape(uw), dtype=_complex_dtype(gamma, uw))
+        _scale_pfp(_flat(gamma), _flat(uw), _flat(w), out.reshape(-1))
+        return out
+
+
+KERNEL_BACKENDS = {"numpy": NumpyKernels, "numba": NumbaKernels}
+r""":obj:`dict`: Available kernel backends."""
+
+# -- KERNEL BACKEND USED BY THE MODELS
+_kernels = NumbaKernels() if NUMBA_AVAILABLE else NumpyKernels()
+
+
+def set_kernel_backend(backend="numba"):
+    r"""Select backend for the elementwise operations of the models.
+
+    Args:
+        backend (:obj:`str` or :obj:`object`):
+            Name of a backend listed in `KERNEL_BACKENDS`, i.e. one of
+            "numpy" or "numba", or an instance of a custom backend (default
+            is backend = "numba").
+
+    Returns:
+        :obj:`object`: Previously selected backend.
+    """
+    global _kernels
+    if isinstance(backend, str):
+        try:
+            Backend = KERNEL_BACKENDS[backend]
+        except KeyError:
+            print("KERNEL BACKEND MUST BE ONE OF", list(KERNEL_BACKENDS.keys()))
+            raise
+        backend = Backend()
+    prev_backend, _kernels = _kernels, backend
+    return prev_backend
+
+
+def get_kernel_backend():
+    r"""Currently selected backend for the elementwise operations.
+
+    Returns:
+        :obj:`object`: Selected kernel backend.
+    """
+    return _kernels
+
+
+def kerr(ut):
+    r"""Kerr nonlinearity, see :meth:`NumpyKernels.kerr`."""
+    return _kernels.kerr(ut)
+
+
+def intensity(ut):
+    r"""Intensity, see :meth:`NumpyKernels.intensity`."""
+    return _kernels.intensity(ut)
+
+
+def raman(ut, I, I_conv, fR):
+    r"""Kerr and Raman nonlinearity, see :meth:`NumpyKernels.raman`."""
+    return _kernels.raman(ut, I, I_conv, fR)
+
+
+def real_cube(ut):
+    r"""Cubic nonlinearity, see :meth:`NumpyKernels.real_cube`."""
+    return _kernels.real_cube(ut)
+
+
+def scale(gamma, uw):
+    r"""Scaled field, see :meth:`NumpyKernels.scale`."""
+    return _kernels.scale(gamma, uw)
+
+
+def scale_pfp(gamma, uw, w):
+    r"""Scaled positive frequency part, see :meth:`NumpyKernels.scale_pfp`."""
+    return _kernels.scale_pfp(gamma, uw, w)
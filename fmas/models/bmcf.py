@@ -6,6 +6,7 @@ Implements bidirectional model for the complex field.
 import numpy as np
 from .model_base import ModelBaseClass
 from ..config import FTFREQ, FT, IFT, C0
+from ..kernels import real_cube, scale
 
 
 class BMCF(ModelBaseClass):
@@ -61,11 +62,11 @@ class BMCF(ModelBaseClass):
         _gam_w = np.divide(
             chi * w * w,
             c0 * c0 * 8.0 * np.abs(beta_w),
-            out=np.zeros(w.size, dtype="float"),
+            out=np.zeros(w.size, dtype=w.dtype),
             where=np.abs(beta_w) > 1e-20,
         )
 
-        return 1j * _gam_w * FT((ut + np.conj(ut)) ** 3)
+        return scale(_gam_w, FT(real_cube(ut)))
 
     def claw(self, i, zi, w, uw):
         r"""Conservation law of the propagation model.
@@ -91,7 +92,7 @@ class BMCF(ModelBaseClass):
         _fac_w = np.divide(
             np.abs(self.beta_w) * np.abs(uw) ** 2,
             w * w,
-            out=np.zeros(w.size, dtype="float"),
+            out=np.zeros(np.shape(uw), dtype="float"),
             where=w > 1e-6,
         )
-        return np.sum(_fac_w)
+        return np.sum(_fac_w, axis=-1)
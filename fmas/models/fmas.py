@@ -6,6 +6,7 @@ Implements forward model for the analytic signal.
 import numpy as np
 from .model_base import ModelBaseClass
 from ..config import FTFREQ, FT, IFT, C0
+from ..kernels import kerr
 
 
 class FMAS(ModelBaseClass):
@@ -32,10 +33,13 @@ class FMAS(ModelBaseClass):
             Frequency-domain representation of root-power loss.
         chi (:obj:`float`):
             Nonlinear susceptibility (default=1.0).
+        compact (:obj:`bool`):
+            Use compact representation of the analytic signal, see
+            :class:`ModelBaseClass` (default=False).
     """
 
-    def __init__(self, w, beta_w, alpha_w=0.0, chi=1.0):
-        super().__init__(w, beta_w, alpha_w)
+    def __init__(self, w, beta_w, alpha_w=0.0, chi=1.0, compact=False):
+        super().__init__(w, beta_w, alpha_w, compact)
         self.chi = chi
 
     @property
@@ -61,17 +65,16 @@ class FMAS(ModelBaseClass):
             current :math:`z`-position.
         """
         w, c0, chi, beta_w = self.w, self.c0, self.chi, self.beta_w
-        ut = IFT(uw)
+        ut = self._IFT(uw)
 
         _gamma_w = np.divide(
             3.0 * chi * w * w,
             c0 * c0 * 8.0 * beta_w,
-            out=np.zeros(w.size, dtype="float"),
+            out=np.zeros(w.size, dtype=w.dtype),
             where=np.abs(beta_w) > 1e-20,
         )
 
-        FT_pfp = lambda x: np.where(w > 0, FT(x), 0j)
-        return 1j * _gamma_w * FT_pfp(np.abs(ut) ** 2 * ut)
+        return self._scaled_FT_pfp(_gamma_w, kerr(ut))
 
     def claw(self, i, zi, w, uw):
         r"""Conservation law of the propagation model.
@@ -97,7 +100,7 @@ class FMAS(ModelBaseClass):
         _fac_w = np.divide(
             self.beta_w * np.abs(uw) ** 2,
             w * w,
-            out=np.zeros(w.size, dtype="float"),
+            out=np.zeros(np.shape(uw), dtype="float"),
             where=w > 1e-6,
         )
-        return np.sum(_fac_w[w > 0])
+        return np.sum(_fac_w[..., w > 0], axis=-1)
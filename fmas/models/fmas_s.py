@@ -6,6 +6,7 @@ Implements simplified forward model for the analytic signal.
 import numpy as np
 from .model_base import ModelBaseClass
 from ..config import FTFREQ, FT, IFT, C0
+from ..kernels import kerr
 
 
 class FMAS_S(ModelBaseClass):
@@ -33,10 +34,13 @@ class FMAS_S(ModelBaseClass):
             Frequency-domain representation of root-power loss.
         n2 (:obj:`float`):
             Nonlinear refractive index (default=1.0).
+        compact (:obj:`bool`):
+            Use compact representation of the analytic signal, see
+            :class:`ModelBaseClass` (default=False).
     """
 
-    def __init__(self, w, beta_w, n2=1.0, alpha_w=0.0):
-        super().__init__(w, beta_w, alpha_w)
+    def __init__(self, w, beta_w, n2=1.0, alpha_w=0.0, compact=False):
+        super().__init__(w, beta_w, alpha_w, compact)
         self.n2 = n2
 
     @property
@@ -62,10 +66,9 @@ class FMAS_S(ModelBaseClass):
             current :math:`z`-position.
         """
         w, c0, n2, beta_w = self.w, self.c0, self.n2, self.beta_w
-        ut = IFT(uw)
+        ut = self._IFT(uw)
         _gamma = n2 * w / c0
-        FT_pfp = lambda x: np.where(w > 0, FT(x), 0j)
-        return 1j * _gamma * FT_pfp(np.abs(ut) ** 2 * ut)
+        return self._scaled_FT_pfp(_gamma, kerr(ut))
 
     def claw(self, i, zi, w, uw):
         r"""Conservation law of the propagation model.
@@ -88,4 +91,4 @@ class FMAS_S(ModelBaseClass):
         Returns:
             :obj:`numpy.ndarray`: value of the conserved quantitiy.
         """
-        return np.sum(np.abs(uw[w > 0]) ** 2 / w[w > 0])
+        return np.sum(np.abs(uw[..., w > 0]) ** 2 / w[w > 0], axis=-1, dtype=float)
@@ -6,7 +6,8 @@ effect.
 """
 import numpy as np
 from .model_base import ModelBaseClass
-from ..config import FTFREQ, FT, IFT, C0
+from ..config import FTFREQ, FT, IFT, RFT, IRFT, C0
+from ..kernels import intensity, raman
 
 
 class FMAS_S_Raman(ModelBaseClass):
@@ -42,10 +43,15 @@ class FMAS_S_Raman(ModelBaseClass):
         tau2 (:obj:`float`):
             Time scale associated with oscillator angular
             frequency in Lorentz model of Raman response (default=32.0 fs).
+        compact (:obj:`bool`):
+            Use compact representation of the analytic signal, see
+            :class:`ModelBaseClass` (default=False).
     """
 
-    def __init__(self, w, beta_w, alpha_w=0.0, n2=1.0, fR=0.18, tau1=12.2, tau2=32.0):
-        super().__init__(w, beta_w, alpha_w)
+    def __init__(
+        self, w, beta_w, alpha_w=0.0, n2=1.0, fR=0.18, tau1=12.2, tau2=32.0, compact=False
+    ):
+        super().__init__(w, beta_w, alpha_w, compact)
         self.n2 = n2
         self.fR = fR
         self.hRw = self._initialize_Raman_response(tau1, tau2)
@@ -92,11 +98,14 @@ class FMAS_S_Raman(ModelBaseClass):
         """
         w, c0, n2, fR, hRw = self.w, self.c0, self.n2, self.fR, self.hRw
         _gamma = n2 * w / c0
-        FT_pfp = lambda x: np.where(w > 0, FT(x), 0j)
-        N_Raman = lambda u: (1 - fR) * u * np.abs(u) ** 2 + fR * u * IFT(
-            FT(np.abs(u) ** 2) * hRw
-        )
-        return 1j * _gamma * FT_pfp(N_Raman(IFT(uw)))
+        if self.compact:
+            # -- RAMAN CONVOLUTION OF REAL-VALUED INTENSITY VIA R2C TRANSFORMS
+            _conv = lambda I: IRFT(RFT(I) * hRw, n=self.t_num)
+        else:
+            _conv = lambda I: IFT(FT(I) * hRw)
+        ut = self._IFT(uw)
+        I = intensity(ut)
+        return self._scaled_FT_pfp(_gamma, raman(ut, I, _conv(I), fR))
 
     def claw(self, i, zi, w, uw):
         r"""Conservation law of the propagation model.
@@ -119,4 +128,4 @@ class FMAS_S_Raman(ModelBaseClass):
         Returns:
             :obj:`numpy.ndarray`: value of the conserved quantitiy.
         """
-        return np.sum(np.abs(uw[w > 0]) ** 2 / w[w > 0])
+        return np.sum(np.abs(uw[..., w > 0]) ** 2 / w[w > 0], axis=-1, dtype=float)
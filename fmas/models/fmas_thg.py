@@ -7,6 +7,7 @@ generation.
 import numpy as np
 from .model_base import ModelBaseClass
 from ..config import FTFREQ, FT, IFT, C0
+from ..kernels import real_cube, scale_pfp
 
 
 class FMAS_THG(ModelBaseClass):
@@ -62,12 +63,11 @@ class FMAS_THG(ModelBaseClass):
         _gam_w = np.divide(
             chi * w * w,
             c0 * c0 * 8.0 * beta_w,
-            out=np.zeros(w.size, dtype="float"),
+            out=np.zeros(w.size, dtype=w.dtype),
             where=np.abs(beta_w) > 1e-20,
         )
 
-        FT_pfp = lambda x: np.where(w > 0, FT(x), 0j)
-        return 1j * _gam_w * FT_pfp((ut + np.conj(ut)) ** 3)
+        return scale_pfp(_gam_w, FT(real_cube(ut)), w)
 
     def claw(self, i, zi, w, uw):
         r"""Conservation law of the propagation model.
@@ -93,7 +93,7 @@ class FMAS_THG(ModelBaseClass):
         _fac_w = np.divide(
             self.beta_w * np.abs(uw) ** 2,
             w * w,
-            out=np.zeros(w.size, dtype="float"),
+            out=np.zeros(np.shape(uw), dtype="float"),
             where=w > 1e-6,
         )
-        return np.sum(_fac_w[w > 0])
+        return np.sum(_fac_w[..., w > 0], axis=-1)
@@ -5,6 +5,7 @@ Implements model bas class.
 """
 import numpy as np
 from ..config import FTFREQ, FT, IFT, C0
+from ..kernels import scale_pfp
 
 
 class ModelBaseClass:
@@ -18,6 +19,10 @@ class ModelBaseClass:
         alpha_w (:obj:`numpy.ndarray`):
             Frequency-domain representation of root-power loss.
         c0 (:obj:`float`): speed of light
+        t_num (:obj:`int`): Number of time mesh-points.
+        compact (:obj:`bool`):
+            Flag indicating whether the model operates on the compact
+            representation of the analytic signal.
 
     Args:
         w (:obj:`numpy.ndarray`):
@@ -26,14 +31,106 @@ class ModelBaseClass:
             Frequency-domain representation of propagation constant.
         alpha_w (:obj:`numpy.ndarray`):
             Frequency-domain representation of root-power loss (default: None).
+        compact (:obj:`bool`):
+            Use compact representation of the analytic signal (default: False).
+
+    Note:
+        Since the analytic signal has no negative frequency components, its
+        frequency-domain representation is fully specified by the
+        :math:`N/2+1` leading entries, where :math:`N` is the number of
+        time mesh-points. If `compact` is True, angular frequency grid,
+        propagation constant, and loss are restricted to these entries, and
+        models supporting the compact representation expect and return
+        fields of size :math:`N/2+1`.  This halves the memory needed to
+        store fields, linear propagators, and intermediate fields of the
+        :math:`z`-stepping formulas. Use the compact representation with an
+        initial condition obtained from
+        `AnalyticSignal(x, compact=True).w_rep`.
+
+        The floating point precision of the angular frequency grid sets the
+        precision of the nonlinear operator. Propagation constant and loss
+        are kept at the precision in which they are given, so that the
+        linear operator can be set up, and exponentiated by the solvers, in
+        double precision also for a simulation run in single precision, see
+        :class:`fmas.grid.Grid`.
     """
 
-    def __init__(self, w, beta_w, alpha_w=None):
-        self.beta_w = beta_w
-        self.alpha_w = alpha_w
-        self.w = w
+    def __init__(self, w, beta_w, alpha_w=None, compact=False):
+        self.t_num = np.size(w)
+        self.compact = compact
+        self.w = self._restrict(w)
+        self.beta_w = self._restrict(beta_w)
+        self.alpha_w = self._restrict(alpha_w)
         self.c0 = C0
 
+    def _restrict(self, x):
+        r"""Restrict frequency-domain array to compact representation.
+
+        Args:
+            x (:obj:`numpy.ndarray`):
+                Frequency-domain array defined on the full angular frequency
+                grid, or scalar.
+
+        Returns:
+            :obj:`numpy.ndarray`: Leading :math:`N/2+1` entries of `x` if the
+            compact representation is used, otherwise `x`.
+        """
+        if self.compact and np.ndim(x) > 0 and np.shape(x)[-1] == self.t_num:
+            return x[..., : self.t_num // 2 + 1]
+        return x
+
+    def _IFT(self, uw):
+        r"""Time-domain representation of field.
+
+        Args:
+            uw (:obj:`numpy.ndarray`):
+                Frequency-domain representation of field.
+
+        Returns:
+            :obj:`numpy.ndarray`: Time-domain representation of field on the
+            full time mesh.
+        """
+        if self.compact:
+            return IFT(uw, n=self.t_num)
+        return IFT(uw)
+
+    def _FT_pfp(self, x):
+        r"""Positive frequency part of frequency-domain representation.
+
+        Args:
+            x (:obj:`numpy.ndarray`):
+                Time-domain representation of field on the full time mesh.
+
+        Returns:
+            :obj:`numpy.ndarray`: Frequency-domain representation of field
+            with all components at non-positive frequencies set to zero.
+        """
+        w = self.w
+        if self.compact:
+            return np.where(w > 0, FT(x)[..., : w.size], 0j)
+        return np.where(w > 0, FT(x), 0j)
+
+    def _scaled_FT_pfp(self, gamma, x):
+        r"""Scaled positive frequency part of frequency-domain representation.
+
+        Equivalent to `1j * gamma * self._FT_pfp(x)`, with scaling and
+        masking performed by the fused kernel :func:`kernels.scale_pfp`.
+
+        Args:
+            gamma (:obj:`numpy.ndarray`):
+                Frequency-dependent coefficient.
+            x (:obj:`numpy.ndarray`):
+                Time-domain representation of field on the full time mesh.
+
+        Returns:
+            :obj:`numpy.ndarray`: Scaled frequency-domain representation of
+            field with all components at non-positive frequencies set to zero.
+        """
+        w = self.w
+        if self.compact:
+            return scale_pfp(gamma, FT(x)[..., : w.size], w)
+        return scale_pfp(gamma, FT(x), w)
+
     @property
     def Lw(self):
         r"""Frequency-domain representation of nonlinear operator.
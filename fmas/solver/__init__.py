@@ -12,6 +12,8 @@ algorithms are supported:
    IFM
    LEM_SySSM
    CQE_RK4IP
+   ERK4IP
+   ETDRK4
 
 A full :math:`z`-propagation scheme, i.e. a solver, is obtained by choosing one
 of the implemented :math:`z`-propagation algorithms and specifying a
@@ -29,6 +31,8 @@ from .split_step_solver import SiSSM, SySSM
 from .integrating_factor_method import IFM
 from .local_error_method import LEM_SySSM
 from .conservation_quantity_error_method import CQE_RK4IP
+from .embedded_runge_kutta_method import ERK4IP
+from .exponential_time_differencing import ETDRK4
 
 # ALIAS FOR RUNGE-KUTTA IN THE INTERACTION PICTURE METHOD
 IFM_RK4IP = IFM
@@ -5,6 +5,7 @@ Implements conservation quantity error method (CQE).
 """
 import numpy as np
 from .solver_base import SolverBaseClass
+from .step_size_controller import BangBang
 from ..stepper import RungeKutta4
 
 
@@ -43,6 +44,13 @@ class CQE_RK4IP(SolverBaseClass):
         stepper (:obj:`function`):
             z-stepping algorithm. Default is a 2nd-order Runge-Kutta formula.
         del_G (:obj:`float`): Goal local error (default is `del_G = 1e-5`).
+        dense_output (:obj:`bool`):
+            Obtain the field at the :math:`z`-slices by interpolation, so that
+            the step size is not constrained by the positions of the
+            :math:`z`-slices (default is dense_output = False).
+        controller (:obj:`StepSizeController`):
+            Step size controller (default is controller = None, i.e. use a
+            :class:`BangBang` controller with fac_lower = 0.1).
 
     Attributes:
         del_G (:obj:`float`):
@@ -51,6 +59,11 @@ class CQE_RK4IP(SolverBaseClass):
             Step size scaling factor (initialized as `scale_fac = numpy.inf`).
         dz_a (:obj:`float`):
             Local step size.
+        controller (:obj:`StepSizeController`):
+            Step size controller.
+        err_exp (:obj:`int`):
+            Order of the local error estimate, i.e. the exponent in
+            :math:`\delta \propto h^{\rm{err\_exp}}`.
         _dz_a (:obj:`list` of :obj:`float`):
             Array accumulating local step size at the end of each
             :math:`z`-slice.
@@ -59,6 +72,11 @@ class CQE_RK4IP(SolverBaseClass):
             :math:`z`-slice.
     """
 
+    _checkpoint_attrs = ("_dz_a", "_del_rle", "dz_a", "_dense_z", "_dense_u")
+
+    # -- ORDER OF THE LOCAL ERROR ESTIMATE
+    err_exp = 5
+
     def _default_CQE_fun(i, zi, w, uw):
         r"""Conservation law of the propagation model.
 
@@ -80,10 +98,20 @@ class CQE_RK4IP(SolverBaseClass):
         Returns:
             :obj:`numpy.ndarray`: value of the conserved quantitiy.
         """
-        return np.sum(np.abs(uw[w > 0]) ** 2 / w[w > 0])
-
-    def __init__(self, L, N, del_G=1e-5, user_action=_default_CQE_fun):
+        return np.sum(np.abs(uw[..., w > 0]) ** 2 / w[w > 0], axis=-1, dtype=float)
+
+    def __init__(
+        self,
+        L,
+        N,
+        del_G=1e-5,
+        user_action=_default_CQE_fun,
+        dense_output=False,
+        controller=None,
+    ):
         super().__init__(L, N, stepper=RungeKutta4, user_action=user_action)
+        self.dense_output = dense_output
+        self.controller = BangBang(fac_lower=0.1) if controller is None else controller
         self.del_G = del_G
         self.scale_fac = 1.148698354997035
         self.dz_a = np.inf
@@ -113,8 +141,8 @@ class CQE_RK4IP(SolverBaseClass):
 
         """
         # -- STRIP OFF INSTANCE KEYWORD
-        dz, w, L, N, P = self.dz_, self.w, self.L, self.N, self.stepper
-        dz_a, del_G, scale_fac = self.dz_a, self.del_G, self.scale_fac
+        dz, w, L, N, P = self.dz_, self.w, self.L, self.N, self._stepper
+        controller = self.controller
 
         # -- FUNCTION DEFINITIONS AND INITIALIZATION
         # ... INITIALIZE ADAPTIVE STEPSIZE
@@ -124,20 +152,21 @@ class CQE_RK4IP(SolverBaseClass):
         # ... CONSERVATION QUANTITY ERROR FUNCTION
         CQE_fun = lambda Ew: self.ua_fun(0, 0, w, Ew)
 
+        # ... FOR A BATCH OF FIELDS, THE LARGEST CQE OF ALL MEMBERS IS USED
         def _CQE(Ew, Ew_trial):
             Cp_ini = CQE_fun(Ew)
             Cp_fin = CQE_fun(Ew_trial)
-            return np.abs(Cp_fin - Cp_ini) / Cp_ini
+            return np.max(np.abs(Cp_fin - Cp_ini) / Cp_ini)
 
         # ... DEFINE INTEGRATING FACTOR METHOD WITH REF. DIST. Z0=Z_CURR
-        _P_lin = lambda z: np.exp(L * z)
+        _P_lin = self._P_lin
 
         def _dEIwdz(h, EIw):
             _ = _P_lin(h)
             return N(_ * EIw) / _
 
         def _RK4(fun, Ew, h):
-            return _P_lin(h) * self.stepper(fun, 0.0, Ew, h)
+            return _P_lin(h) * P(fun, 0.0, Ew, h)
 
         # ... TRIAL STEP RETURNING UPDATED FIELD AND CQE-VALUE
         def _trial_step(Ew, h):
@@ -159,28 +188,22 @@ class CQE_RK4IP(SolverBaseClass):
                 _len -= dz_a
             return _len, Ew
 
+        if self.dense_output:
+            return self._dense_step(
+                z_curr, Ew, lambda Ew, h, NEw: _trial_step(Ew, h) + (None,)
+            )
+
         # -- BEGIN: PERFORM FULL STEP COVERING A SINGLE Z-SLICE
         dz_a = self._dz_a[-1]  # CURRENT STEP SIZE
         _len = dz  # FULL Z-SLICE LENGTH
         while _len > 0.0:
             # -- BEGIN: SUBSTEP
             Ew_trial, del_curr = _trial_step(Ew, dz_a)
-            if del_curr > 2 * del_G:
-                # ... CASE 1: CQE-VAlUE WAY TOO LARGE
-                # ... DISCARD SOLUTION AND RETRY WITH HALVED STEP SIZE
-                dz_a *= 0.5
-            elif (del_curr > del_G) and (del_curr < 2 * del_G):
-                # ... CASE 2: CQE-VALUE  TOO LARGE
-                # ... KEEP SOLUTION AND DECREASE STEP SIZE FOR NEXT SUBSTEP
-                _len, Ew = _field_update(_len, dz_a, Ew, Ew_trial)
-                dz_a /= scale_fac
-            elif del_curr < 0.1 * del_G:
-                # ... CASE 3: CQE-VALUE TOO SMALL
-                # ... KEEP SOLUTION AND INCREASE STEP SIZE FOR NEXT SUBSTEP
-                _len, Ew = _field_update(_len, dz_a, Ew, Ew_trial)
-                dz_a *= scale_fac
-            else:
+            # ... ACCEPT OR REJECT SOLUTION AND ADAPT STEP SIZE
+            accepted, dz_a_next = controller(dz_a, del_curr)
+            if accepted:
                 _len, Ew = _field_update(_len, dz_a, Ew, Ew_trial)
+            dz_a = dz_a_next
             # -- END: SUBSTEP
         # -- END: PERFORM FULL STEP COVERING A SINGLE Z-SLICE
         self._del_rle.append(del_curr)
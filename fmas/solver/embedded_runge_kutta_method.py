@@ -0,0 +1,206 @@
+"""
+Implements embedded Runge-Kutta method in the interaction picture (ERK4(3)-IP).
+
+.. codeauthor:: Oliver Melchert <melchert@iqo.uni-hannover.de>
+"""
+import numpy as np
+from .solver_base import SolverBaseClass
+from .step_size_controller import BangBang
+
+
+class ERK4IP(SolverBaseClass):
+    r"""Adaptive stepsize embedded Runge-Kutta method in the interaction
+    picture (ERK4(3)-IP).
+
+    Implements a :math:`z`-propagation scheme with adaptive step size
+    controll, based on an embedded Runge-Kutta pair in the interaction picture
+    [1]. The fourth-order Runge-Kutta in the interaction picture method (RK4IP)
+    [2] provides the field update. Using one additional evaluation of the
+    nonlinear function :math:`\mathsf{N}` at the updated field, an embedded
+    third-order solution is obtained, and the relative local error (RLE) of the
+    third-order solution guides step size selection, see Ref. [1].
+
+    Note:
+       *    The additional evaluation of :math:`\mathsf{N}` at the updated
+            field coincides with the first evaluation of :math:`\mathsf{N}`
+            needed by the subsequent substep (first same as last, FSAL).
+            Hence, each accepted substep requires only 4 evaluations of
+            :math:`\mathsf{N}`, i.e. exactly as many as a plain RK4IP step.
+            In comparison, the step-doubling procedure of the local error
+            methods needs 11 evaluations of :math:`\mathsf{N}` for each
+            substep of LEM_IFM. LEM_SySSM performs three steps of its
+            stepper for each substep, i.e. 6 evaluations with the default
+            `RungeKutta2`, and 12 evaluations with `RungeKutta4`.
+
+       *    Since the field update is not locally extrapolated, the accepted
+            field has the local error of the RK4IP method. The RLE refers to
+            the embedded third-order solution and is thus a conservative
+            estimate.
+
+       *    The step size is adapted according to the same rule as for the
+            local error method, with scaling factor :math:`2^{1/4}`
+            accounting for the local error :math:`\mathcal{O}(h^4)` of the
+            embedded solution.
+
+    References:
+        [1] S. Balac, F. Mahé,
+        Embedded Runge–Kutta scheme for step-size control in the interaction
+        picture method,
+        Comput. Phys. Commun. 184 (2013) 1211,
+        https://doi.org/10.1016/j.cpc.2012.12.020.
+
+        [2] J. Hult,
+        A Fourth-Order Runge–Kutta in the Interaction Picture Method for
+        Simulating Supercontinuum Generation in Optical Fibers,
+        IEEE J. Lightwave Tech. 25 (2007) 3770,
+        https://doi.org/10.1109/JLT.2007.909373.
+
+    Args:
+        L (:obj:`numpy.ndarray`):
+            Linear operator of the partial differential equation.
+        N (:obj:`numpy.ndarray`):
+            Nonlinear operator of the partial differential equation.
+        del_G (:obj:`float`): Goal local error (default is `del_G = 1e-5`).
+        dense_output (:obj:`bool`):
+            Obtain the field at the :math:`z`-slices by interpolation, so that
+            the step size is not constrained by the positions of the
+            :math:`z`-slices (default is dense_output = False).
+        controller (:obj:`StepSizeController`):
+            Step size controller (default is controller = None, i.e. use a
+            :class:`BangBang` controller with fac_lower = 0.5).
+
+    Attributes:
+        del_G (:obj:`float`):
+            Goal local error.
+        scale_fac (:obj:`float`):
+            Step size scaling factor.
+        dz_a (:obj:`float`):
+            Local step size.
+        controller (:obj:`StepSizeController`):
+            Step size controller.
+        err_exp (:obj:`int`):
+            Order of the local error estimate, i.e. the exponent in
+            :math:`\delta \propto h^{\rm{err\_exp}}`.
+        _dz_a (:obj:`list` of :obj:`float`):
+            Array accumulating local step size at the end of each
+            :math:`z`-slice.
+        _del_rle (:obj:`list` of :obj:`float`):
+            Array accumulating the local relative error at the end of each
+            :math:`z`-slice.
+    """
+
+    _checkpoint_attrs = ("_dz_a", "_del_rle", "dz_a", "_dense_z", "_dense_u")
+
+    # -- ORDER OF THE LOCAL ERROR ESTIMATE
+    err_exp = 4
+
+    def __init__(
+        self, L, N, del_G=1e-5, user_action=None, dense_output=False, controller=None
+    ):
+        super().__init__(L, N, stepper=None, user_action=user_action)
+        self.dense_output = dense_output
+        self.controller = BangBang(fac_lower=0.5) if controller is None else controller
+        self.del_G = del_G
+        self.scale_fac = 1.189207115002721
+        self.dz_a = np.inf
+        self._dz_a = []
+        self._del_rle = []
+        self._fsal = (None, None)
+
+    def single_step(self, z_curr, Ew):
+        r"""Advance field by a single :math:`z`-slice
+
+        Note:
+            This method updates the instance attributes `_dz_a` and `_del_rle`,
+            i.e.  lists accumulating the local step size at the end of each
+            :math:`z`-slize, and the associated relative local error,
+            respectively.
+
+        Args:
+            z_curr (:obj:`float`): Current propagation distance.
+            Ew (:obj:`numpy.ndarray`): Frequency domain representation of the
+                field at `z_curr`.
+
+        Returns:
+            :obj:`numpy.ndarray`: Frequency domain representation of the field
+            at `z_curr` + `dz`.
+
+        """
+        # -- STRIP OFF INSTANCE KEYWORD
+        dz, w, L, N = self.dz_, self.w, self.L, self.N
+        controller = self.controller
+
+        # -- FUNCTION DEFINITIONS AND INITIALIZATION
+        # ... INITIALIZE ADAPTIVE STEPSIZE
+        if self._dz_a == []:
+            self._dz_a = [dz]
+            self._del_rle = [0.0]
+        # ... DEFINE RELATIVE LOCAL ERROR (RLE)
+        # ... FOR A BATCH OF FIELDS, THE LARGEST RLE OF ALL MEMBERS IS USED
+        _norm = lambda u: np.sqrt(np.sum(np.abs(u) ** 2, axis=-1, dtype=float))
+        _rle = lambda u4, u3: np.max(_norm(u4 - u3) / _norm(u4))
+        # ... DEFINE EMBEDDED RUNGE-KUTTA PAIR IN THE INTERACTION PICTURE
+        _P_lin = self._P_lin
+
+        def _ERK4IP(Ew, NEw, h):
+            P_half = _P_lin(h / 2)
+            EIw = P_half * Ew
+            k1 = P_half * NEw
+            k2 = N(EIw + 0.5 * h * k1)
+            k3 = N(EIw + 0.5 * h * k2)
+            k4 = N(P_half * (EIw + h * k3))
+            beta = P_half * (EIw + h * (k1 + 2.0 * k2 + 2.0 * k3) / 6.0)
+            u4 = beta + h * k4 / 6.0
+            k5 = N(u4)
+            u3 = beta + h * (2.0 * k4 + 3.0 * k5) / 30.0
+            return u4, k5, _rle(u4, u3)
+
+        # ... TRIAL STEP FOR DENSE OUTPUT, REUSING N(Ew) IF AVAILABLE
+        def _trial_step(Ew, h, NEw):
+            NEw = N(Ew) if NEw is None else NEw
+            u4, k5, del_curr = _ERK4IP(Ew, NEw, h)
+            return u4, del_curr, k5
+
+        if self.dense_output:
+            return self._dense_step(z_curr, Ew, _trial_step)
+
+        # -- BEGIN: PERFORM FULL STEP COVERING A SINGLE Z-SLICE
+        # ... REUSE N(Ew) FROM PRECEDING SUBSTEP (FSAL) IF AVAILABLE
+        Ew_fsal, NEw = self._fsal
+        if Ew_fsal is not Ew:
+            NEw = N(Ew)
+        dz_a = self._dz_a[-1]  # CURRENT STEP SIZE
+        _len = dz  # FULL Z-SLICE LENGTH
+        while _len > 0.0:
+            # -- BEGIN: SUBSTEP
+            # ... LIMIT SUBSTEP TO LAND AT UPPER BOUNDARY OF Z-SLICE
+            h = min(dz_a, _len)
+            Ew_trial, NEw_trial, del_curr = _ERK4IP(Ew, NEw, h)
+            # ... ACCEPT OR REJECT SOLUTION AND ADAPT STEP SIZE
+            accepted, dz_a = controller(h, del_curr, dz_a)
+            if not accepted:
+                continue
+            Ew, NEw = Ew_trial, NEw_trial
+            _len -= h
+            # -- END: SUBSTEP
+        # -- END: PERFORM FULL STEP COVERING A SINGLE Z-SLICE
+        self._fsal = (Ew, NEw)
+        self._del_rle.append(del_curr)
+        self._dz_a.append(dz_a)
+        return Ew
+
+    def clear(self):
+        r"""Clear instance attributes and reset parameters to initial values
+
+        Note:
+            This method is implemented for the case when an instance of the
+            solver is used for various simulation runs with possibly different
+            initial conditions and :math:`z`-interval discretizations.
+        """
+        # -- PREPARE NEXT RUN OF THE SOLVER BY ...
+        # ... CLEARING INTERNAL DATA ACCUMULATING STRUCTURES OF SUPERCLASS
+        super().clear()
+        # ... RESETTING VARIABLE STEPSIZE TO ITS INITIAL VALUE
+        self.dz_a = np.inf
+        # ... DISCARDING THE STORED EVALUATION OF THE NONLINEAR FUNCTION
+        self._fsal = (None, None)
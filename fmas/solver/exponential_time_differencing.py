@@ -0,0 +1,150 @@
+"""
+Implements fourth-order exponential time differencing Runge-Kutta method
+(ETDRK4).
+
+.. codeauthor:: Oliver Melchert <melchert@iqo.uni-hannover.de>
+"""
+import numpy as np
+from .solver_base import SolverBaseClass
+
+
+class ETDRK4(SolverBaseClass):
+    r"""Fixed stepsize algorithm implementing the fourth-order exponential
+    time differencing Runge-Kutta method (ETDRK4).
+
+    Implements the ETDRK4 method of Cox and Matthews [1], with the
+    coefficients of the method evaluated by the contour integral method of
+    Kassam and Trefethen [2]. The linear part of the propagation equation is
+    integrated exactly, and the nonlinear part is approximated by a
+    fourth-order Runge-Kutta scheme for the variation-of-constants formula.
+    The method achieves global error :math:`\mathcal{O}(\Delta z^4)`.
+
+    The coefficients of the method are combinations of the functions
+
+    .. math::
+        \varphi_1(x) = \frac{e^x-1}{x},\quad
+        \varphi_2(x) = \frac{e^x-1-x}{x^2},\quad
+        \varphi_3(x) = \frac{e^x-1-x-x^2/2}{x^3},
+
+    evaluated at :math:`x=\mathsf{L}\,h`. Their direct evaluation suffers
+    from cancellation errors for small :math:`|x|`. Instead, following Ref.
+    [2], each coefficient is obtained as the mean of its values on a circle of
+    unit radius in the complex plane, centered at :math:`x`. The coefficients
+    depend only on the linear operator and the step size, and are computed
+    once per step size and cached.
+
+    Note:
+        *   Each step requires 4 evaluations of the nonlinear operator
+            :math:`\mathsf{N}`, i.e. exactly as many as the integrating
+            factor method (IFM).
+
+        *   The linear part is integrated exactly, so that the method is
+            stable for stiff linear operators. However, in contrast to the
+            IFM, the nonlinear operator is not evaluated in the interaction
+            picture, and the local error grows with the rate at which the
+            field changes under the linear part. Hence, the propagation
+            constant should be specified in a frame of reference moving with
+            the pulse, i.e. with the group-velocity term removed.
+
+    References:
+        [1] S. M. Cox, P. C. Matthews,
+        Exponential time differencing for stiff systems,
+        J. Comput. Phys. 176 (2002) 430,
+        https://doi.org/10.1006/jcph.2002.6995.
+
+        [2] A.-K. Kassam, L. N. Trefethen,
+        Fourth-order time-stepping for stiff PDEs,
+        SIAM J. Sci. Comp. 26 (2005) 1214,
+        https://doi.org/10.1137/S1064827502410633.
+
+    Args:
+        L (:obj:`numpy.ndarray`):
+            Linear operator of the partial differential equation.
+        N (:obj:`numpy.ndarray`):
+            Nonlinear operator of the partial differential equation.
+        user_action (:obj:`function`): callback function implementing a
+            measurement using a user-supplied function with function call
+            signature `user_action(i, zi, w, uw)`, see :class:`IFM`.
+        n_contour (:obj:`int`):
+            Number of points on the contour used to evaluate the coefficients
+            (default is n_contour = 32).
+
+    Attributes:
+        n_contour (:obj:`int`):
+            Number of points on the contour used to evaluate the coefficients.
+    """
+
+    def __init__(self, L, N, user_action=None, n_contour=32):
+        super().__init__(L, N, stepper=None, user_action=user_action)
+        self.n_contour = n_contour
+        self._coeffs = dict()
+
+    def coefficients(self, h):
+        r"""Coefficients of the ETDRK4 method for step size `h`.
+
+        Args:
+            h (:obj:`float`): Step size.
+
+        Returns:
+            :obj:`tuple`: Coefficients `Q`, `f1`, `f2`, and `f3`, in the
+            notation of Ref. [2].
+        """
+        try:
+            return self._coeffs[h]
+        except KeyError:
+            pass
+        # -- COEFFICIENTS ARE OBTAINED IN DOUBLE PRECISION AND CONVERTED TO
+        # ... THE PRECISION OF THE FIELD
+        hL = h * np.asarray(self.L, dtype=complex)
+        Q, f1, f2, f3 = (np.zeros(hL.shape, dtype=complex) for _ in range(4))
+        # -- CONTOUR POINTS ON FULL UNIT CIRCLE, SINCE L IS COMPLEX-VALUED
+        # ... ACCUMULATE ONE POINT AT A TIME TO AVOID AN ARRAY OF SHAPE
+        # ... (N_CONTOUR, T_NUM)
+        M = self.n_contour
+        for r in np.exp(2j * np.pi * (np.arange(1, M + 1) - 0.5) / M):
+            x = hL + r
+            ex = np.exp(x)
+            x3 = x * x * x
+            Q += (np.exp(x / 2) - 1.0) / x
+            f1 += (-4.0 - x + ex * (4.0 - 3.0 * x + x * x)) / x3
+            f2 += (2.0 + x + ex * (-2.0 + x)) / x3
+            f3 += (-4.0 - 3.0 * x - x * x + ex * (4.0 - x)) / x3
+        dtype = self.dtype
+        coeffs = tuple((h * c / M).astype(dtype, copy=False) for c in (Q, f1, f2, f3))
+        self._coeffs[h] = coeffs
+        return coeffs
+
+    def single_step(self, z_curr, Ew):
+        r"""Advance field by a single :math:`z`-slice
+
+        Args:
+            z_curr (:obj:`float`): Current propagation distance.
+            Ew (:obj:`numpy.ndarray`): Frequency domain representation of the
+            field at `z_curr`.
+
+        Returns:
+            :obj:`numpy.ndarray`: Frequency domain representation of the field
+            at `z_curr` + `dz`.
+        """
+        dz, N, _P_lin = self.dz_, self.N, self._P_lin
+        E, E2 = _P_lin(dz), _P_lin(dz / 2)
+        Q, f1, f2, f3 = self.coefficients(dz)
+        NE = N(Ew)
+        a = E2 * Ew + Q * NE
+        Na = N(a)
+        b = E2 * Ew + Q * Na
+        Nb = N(b)
+        c = E2 * a + Q * (2.0 * Nb - NE)
+        Nc = N(c)
+        return E * Ew + f1 * NE + 2.0 * f2 * (Na + Nb) + f3 * Nc
+
+    def clear(self):
+        r"""Clear instance attributes and reset parameters to initial values
+
+        Note:
+            This method is implemented for the case when an instance of the
+            solver is used for various simulation runs with possibly different
+            initial conditions and :math:`z`-interval discretizations.
+        """
+        super().clear()
+        self._coeffs = dict()
@@ -78,9 +78,12 @@ class IFM(SolverBaseClass):
             :obj:`numpy.ndarray`: Frequency domain representation of the field
             at `z_curr` + `dz`.
         """
-        dz, w, L, N, P = self.dz_, self.w, self.L, self.N, self.stepper
-        z0 = z_curr + dz / 2
+        dz, w, L, N, P = self.dz_, self.w, self.L, self.N, self._stepper
+        # -- STEP MIDPOINT AS REFERENCE POSITION; Z MEASURED FROM STEP BEGIN
+        # ... ENSURES THAT ONLY THE PROPAGATORS FOR +DZ/2, 0, AND -DZ/2 ARE
+        # ... REQUIRED, WHICH ARE OBTAINED FROM THE PROPAGATOR CACHE
+        z0 = dz / 2
         _cleanup = lambda Ew: np.where(np.abs(w) < W_MAX_FAC * w.max(), Ew, 0j)
-        _P_lin = lambda z: np.exp(L * z)
+        _P_lin = self._P_lin
         _dEIwdz = lambda z, EIw: _P_lin(z0 - z) * N(_P_lin(z - z0) * EIw)
-        return _P_lin(dz / 2) * P(_dEIwdz, z_curr, _P_lin(dz / 2) * Ew, dz)
+        return _P_lin(dz / 2) * P(_dEIwdz, 0.0, _P_lin(dz / 2) * Ew, dz)
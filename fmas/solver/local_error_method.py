@@ -5,6 +5,7 @@ Implements local error method (LEM).
 """
 import numpy as np
 from .solver_base import SolverBaseClass
+from .step_size_controller import BangBang
 from ..stepper import RungeKutta2, RungeKutta4
 
 
@@ -63,6 +64,13 @@ class LEM_SySSM(SolverBaseClass):
         stepper (:obj:`function`):
             z-stepping algorithm. Default is a 2nd-order Runge-Kutta formula.
         del_G (:obj:`float`): Goal local error (default is `del_G = 1e-5`).
+        dense_output (:obj:`bool`):
+            Obtain the field at the :math:`z`-slices by interpolation, so that
+            the step size is not constrained by the positions of the
+            :math:`z`-slices (default is dense_output = False).
+        controller (:obj:`StepSizeController`):
+            Step size controller (default is controller = None, i.e. use a
+            :class:`BangBang` controller with fac_lower = 0.5).
 
     Attributes:
         del_G (:obj:`float`):
@@ -71,6 +79,11 @@ class LEM_SySSM(SolverBaseClass):
             Step size scaling factor (initialized as `scale_fac = numpy.inf`).
         dz_a (:obj:`float`):
             Local step size.
+        controller (:obj:`StepSizeController`):
+            Step size controller.
+        err_exp (:obj:`int`):
+            Order of the local error estimate, i.e. the exponent in
+            :math:`\delta \propto h^{\rm{err\_exp}}`.
         _dz_a (:obj:`list` of :obj:`float`):
             Array accumulating local step size at the end of each
             :math:`z`-slice.
@@ -80,8 +93,24 @@ class LEM_SySSM(SolverBaseClass):
 
     """
 
-    def __init__(self, L, N, stepper=RungeKutta2, del_G=1e-5, user_action=None):
+    _checkpoint_attrs = ("_dz_a", "_del_rle", "dz_a", "_dense_z", "_dense_u")
+
+    # -- ORDER OF THE LOCAL ERROR ESTIMATE
+    err_exp = 3
+
+    def __init__(
+        self,
+        L,
+        N,
+        stepper=RungeKutta2,
+        del_G=1e-5,
+        user_action=None,
+        dense_output=False,
+        controller=None,
+    ):
         super().__init__(L, N, stepper, user_action=user_action)
+        self.dense_output = dense_output
+        self.controller = BangBang(fac_lower=0.5) if controller is None else controller
         self.del_G = del_G
         self.scale_fac = 1.2599210498948732
         self.dz_a = np.inf
@@ -108,8 +137,8 @@ class LEM_SySSM(SolverBaseClass):
 
         """
         # -- STRIP OFF INSTANCE KEYWORD
-        dz, w, L, N, P = self.dz_, self.w, self.L, self.N, self.stepper
-        dz_a, del_G, scale_fac = self.dz_a, self.del_G, self.scale_fac
+        dz, w, L, N, P = self.dz_, self.w, self.L, self.N, self._stepper
+        controller = self.controller
 
         # -- FUNCTION DEFINITIONS AND INITIALIZATION
         # ... INITIALIZE ADAPTIVE STEPSIZE
@@ -117,10 +146,11 @@ class LEM_SySSM(SolverBaseClass):
             self._dz_a = [dz]
             self._del_rle = [0.0]
         # ... DEFINE RELATIVE LOCAL ERROR (RLE)
-        _norm = lambda u: np.sqrt(np.sum(np.abs(u) ** 2))
-        _rle = lambda uf, uc: _norm(uf - uc) / _norm(uf)
+        # ... FOR A BATCH OF FIELDS, THE LARGEST RLE OF ALL MEMBERS IS USED
+        _norm = lambda u: np.sqrt(np.sum(np.abs(u) ** 2, axis=-1, dtype=float))
+        _rle = lambda uf, uc: np.max(_norm(uf - uc) / _norm(uf))
         # ... DEFINE SYMMETRIC SPLIT-STEP FOURIER METHOD
-        _P_lin = lambda z: np.exp(L * z)  # exact linear propagator
+        _P_lin = self._P_lin  # exact linear propagator
         _dEwdz = lambda z, Ew: self.N(Ew)  # nonlinear function
 
         def _step(Ew, dz):
@@ -142,6 +172,15 @@ class LEM_SySSM(SolverBaseClass):
                 _len -= dz_a
             return _len, Ew
 
+        # ... TRIAL STEP FOR DENSE OUTPUT
+        def _trial_step(Ew, h, NEw=None):
+            uc = _step(Ew, h)
+            uf = _step(_step(Ew, h / 2), h / 2)
+            return (4 * uf - uc) / 3, _rle(uf, uc), None
+
+        if self.dense_output:
+            return self._dense_step(z_curr, Ew, _trial_step)
+
         # -- BEGIN: PERFORM FULL STEP COVERING A SINGLE Z-SLICE
         dz_a = self._dz_a[-1]  # CURRENT STEP SIZE
         _len = dz  # FULL Z-SLICE LENGTH
@@ -151,22 +190,11 @@ class LEM_SySSM(SolverBaseClass):
             uf = _step(_step(Ew, dz_a / 2), dz_a / 2)
             Ew_trial = (4 * uf - uc) / 3
             del_curr = _rle(uf, uc)
-            if del_curr > 2 * del_G:
-                # ... CASE 1: RELATIVE LOCAL ERROR TOO LARGE
-                # ... DISCARD SOLUTION AND RETRY WITH HALVED STEP SIZE
-                dz_a *= 0.5
-            elif (del_curr > del_G) and (del_curr < 2 * del_G):
-                # ... CASE 2: RELATIVE LOCAL ERROR TOO LARGE
-                # ... KEEP SOLUTION AND DECREASE STEP SIZE FOR NEXT SUBSTEP
-                _len, Ew = _field_update(_len, dz_a, Ew, Ew_trial)
-                dz_a /= scale_fac
-            elif del_curr < 0.5 * del_G:
-                # ... CASE 3: RELATIVE LOCAL ERROR TOO SMALL
-                # ... KEEP SOLUTION AND INCREASE STEP SIZE FOR NEXT SUBSTEP
-                _len, Ew = _field_update(_len, dz_a, Ew, Ew_trial)
-                dz_a *= scale_fac
-            else:
+            # ... ACCEPT OR REJECT SOLUTION AND ADAPT STEP SIZE
+            accepted, dz_a_next = controller(dz_a, del_curr)
+            if accepted:
                 _len, Ew = _field_update(_len, dz_a, Ew, Ew_trial)
+            dz_a = dz_a_next
             # -- END: SUBSTEP
         # -- END: PERFORM FULL STEP COVERING A SINGLE Z-SLICE
         self._del_rle.append(del_curr)
@@ -261,6 +289,13 @@ class LEM_IFM(SolverBaseClass):
         stepper (:obj:`function`):
             z-stepping algorithm. Default is a 2nd-order Runge-Kutta formula.
         del_G (:obj:`float`): Goal local error (default is `del_G = 1e-5`).
+        dense_output (:obj:`bool`):
+            Obtain the field at the :math:`z`-slices by interpolation, so that
+            the step size is not constrained by the positions of the
+            :math:`z`-slices (default is dense_output = False).
+        controller (:obj:`StepSizeController`):
+            Step size controller (default is controller = None, i.e. use a
+            :class:`BangBang` controller with fac_lower = 0.5).
 
     Attributes:
         del_G (:obj:`float`):
@@ -269,6 +304,11 @@ class LEM_IFM(SolverBaseClass):
             Step size scaling factor (initialized as `scale_fac = numpy.inf`).
         dz_a (:obj:`float`):
             Local step size.
+        controller (:obj:`StepSizeController`):
+            Step size controller.
+        err_exp (:obj:`int`):
+            Order of the local error estimate, i.e. the exponent in
+            :math:`\delta \propto h^{\rm{err\_exp}}`.
         _dz_a (:obj:`list` of :obj:`float`):
             Array accumulating local step size at the end of each
             :math:`z`-slice.
@@ -277,8 +317,17 @@ class LEM_IFM(SolverBaseClass):
             :math:`z`-slice.
     """
 
-    def __init__(self, L, N, del_G=1e-5, user_action=None):
+    _checkpoint_attrs = ("_dz_a", "_del_rle", "dz_a", "_dense_z", "_dense_u")
+
+    # -- ORDER OF THE LOCAL ERROR ESTIMATE
+    err_exp = 5
+
+    def __init__(
+        self, L, N, del_G=1e-5, user_action=None, dense_output=False, controller=None
+    ):
         super().__init__(L, N, stepper=None, user_action=user_action)
+        self.dense_output = dense_output
+        self.controller = BangBang(fac_lower=0.5) if controller is None else controller
         self.del_G = del_G
         self.scale_fac = 1.148698354997035
         self.dz_a = np.inf
@@ -310,8 +359,8 @@ class LEM_IFM(SolverBaseClass):
 
         """
         # -- STRIP OFF INSTANCE KEYWORD
-        dz, w, L, N, P = self.dz_, self.w, self.L, self.N, self.stepper
-        dz_a, del_G, scale_fac = self.dz_a, self.del_G, self.scale_fac
+        dz, w, L, N, P = self.dz_, self.w, self.L, self.N, self._stepper
+        controller = self.controller
 
         # -- FUNCTION DEFINITIONS AND INITIALIZATION
         # ... INITIALIZE ADAPTIVE STEPSIZE
@@ -319,10 +368,11 @@ class LEM_IFM(SolverBaseClass):
             self._dz_a = [dz]
             self._del_rle = [0.0]
         # ... DEFINE RELATIVE LOCAL ERROR (RLE)
-        _norm = lambda u: np.sqrt(np.sum(np.abs(u) ** 2))
-        _rle = lambda uf, uc: _norm(uf - uc) / _norm(uf)
+        # ... FOR A BATCH OF FIELDS, THE LARGEST RLE OF ALL MEMBERS IS USED
+        _norm = lambda u: np.sqrt(np.sum(np.abs(u) ** 2, axis=-1, dtype=float))
+        _rle = lambda uf, uc: np.max(_norm(uf - uc) / _norm(uf))
         # ... DEFINE INTEGRATING FACTOR METHOD WITH REF. DIST. Z0=Z_CURR
-        _P_lin = lambda z: np.exp(L * z)
+        _P_lin = self._P_lin
 
         def _dEIwdz(h, EIw):
             x = _P_lin(h)
@@ -373,6 +423,14 @@ class LEM_IFM(SolverBaseClass):
                 _len -= dz_a
             return _len, Ew
 
+        # ... TRIAL STEP FOR DENSE OUTPUT
+        def _trial_step(Ew, h, NEw=None):
+            uc, uf = _step_doubling(Ew, h)
+            return (16 * uf - uc) / 15, _rle(uf, uc), None
+
+        if self.dense_output:
+            return self._dense_step(z_curr, Ew, _trial_step)
+
         # -- BEGIN: PERFORM FULL STEP COVERING A SINGLE Z-SLICE
         dz_a = self._dz_a[-1]  # CURRENT STEP SIZE
         _len = dz  # FULL Z-SLICE LENGTH
@@ -381,22 +439,11 @@ class LEM_IFM(SolverBaseClass):
             uc, uf = _step_doubling(Ew, dz_a)
             Ew_trial = (16 * uf - uc) / 15
             del_curr = _rle(uf, uc)
-            if del_curr > 2 * del_G:
-                # ... CASE 1: RELATIVE LOCAL ERROR TOO LARGE
-                # ... DISCARD SOLUTION AND RETRY WITH HALVED STEP SIZE
-                dz_a *= 0.5
-            elif (del_curr > del_G) and (del_curr < 2 * del_G):
-                # ... CASE 2: RELATIVE LOCAL ERROR TOO LARGE
-                # ... KEEP SOLUTION AND DECREASE STEP SIZE FOR NEXT SUBSTEP
-                _len, Ew = _field_update(_len, dz_a, Ew, Ew_trial)
-                dz_a /= scale_fac
-            elif del_curr < 0.5 * del_G:
-                # ... CASE 3: RELATIVE LOCAL ERROR TOO SMALL
-                # ... KEEP SOLUTION AND INCREASE STEP SIZE FOR NEXT SUBSTEP
-                _len, Ew = _field_update(_len, dz_a, Ew, Ew_trial)
-                dz_a *= scale_fac
-            else:
+            # ... ACCEPT OR REJECT SOLUTION AND ADAPT STEP SIZE
+            accepted, dz_a_next = controller(dz_a, del_curr)
+            if accepted:
                 _len, Ew = _field_update(_len, dz_a, Ew, Ew_trial)
+            dz_a = dz_a_next
             # -- END: SUBSTEP
         # -- END: PERFORM FULL STEP COVERING A SINGLE Z-SLICE
         self._del_rle.append(del_curr)
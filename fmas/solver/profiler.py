@@ -0,0 +1,180 @@
+"""
+Implements instrumentation for recording where time is spent during a
+:math:`z`-propagation run.
+
+.. autosummary::
+   :nosignatures:
+
+   SolverProfiler
+   CountingFFT
+
+.. codeauthor:: Oliver Melchert <melchert@iqo.uni-hannover.de>
+"""
+import time
+import h5py
+import numpy as np
+from ..config import set_fft_backend, get_fft_backend
+
+
+PROFILE_DTYPE = np.dtype(
+    [
+        ("i", "i8"),
+        ("z", "f8"),
+        ("wall_time", "f8"),
+        ("n_N", "i8"),
+        ("n_fft", "i8"),
+        ("n_accepted", "i8"),
+        ("n_rejected", "i8"),
+        ("t_user_action", "f8"),
+    ]
+)
+r""":obj:`numpy.dtype`: Data type of the records of :class:`SolverProfiler`."""
+
+
+class CountingFFT:
+    r"""FFT backend counting the transforms delegated to another backend.
+
+    Args:
+        backend (:obj:`object`): FFT backend performing the transforms.
+
+    Attributes:
+        backend (:obj:`object`): FFT backend performing the transforms.
+        n_calls (:obj:`int`): Number of transforms performed.
+    """
+
+    def __init__(self, backend):
+        self.backend = backend
+        self.name = getattr(backend, "name", "custom")
+        self.n_calls = 0
+
+    def fft(self, a, n=None, axis=-1, norm=None):
+        self.n_calls += 1
+        return self.backend.fft(a, n=n, axis=axis, norm=norm)
+
+    def ifft(self, a, n=None, axis=-1, norm=None):
+        self.n_calls += 1
+        return self.backend.ifft(a, n=n, axis=axis, norm=norm)
+
+    def rfft(self, a, n=None, axis=-1, norm=None):
+        self.n_calls += 1
+        return self.backend.rfft(a, n=n, axis=axis, norm=norm)
+
+    def irfft(self, a, n=None, axis=-1, norm=None):
+        self.n_calls += 1
+        return self.backend.irfft(a, n=n, axis=axis, norm=norm)
+
+    def hfft(self, a, n=None, axis=-1, norm=None):
+        self.n_calls += 1
+        return self.backend.hfft(a, n=n, axis=axis, norm=norm)
+
+    def ihfft(self, a, n=None, axis=-1, norm=None):
+        self.n_calls += 1
+        return self.backend.ihfft(a, n=n, axis=axis, norm=norm)
+
+
+class SolverProfiler:
+    r"""Per-slice profiler for propagation runs.
+
+    Records, for each stored :math:`z`-slice, the wall time elapsed since the
+    preceding stored slice, the number of evaluations of the nonlinear
+    operator :math:`\mathsf{N}`, the number of fast Fourier-transforms, the
+    number of accepted and rejected substeps of the adaptive stepsize
+    algorithms, and the time spent in the user-supplied function. Can be
+    passed to the `propagate` method of a solver via its keyword argument
+    `profiler`.
+
+    While attached to a running solver, the nonlinear operator of the solver
+    is wrapped by a counting function, and the selected FFT backend is
+    wrapped by a :class:`CountingFFT` instance. Both are restored when the
+    run ends.
+
+    Note:
+        Transforms performed outside of the solver, e.g. by other threads,
+        while a profiled run is in progress are counted as well.
+
+    Attributes:
+        n_N (:obj:`int`):
+            Number of evaluations of the nonlinear operator.
+        t_user_action (:obj:`float`):
+            Time spent in the user-supplied function.
+    """
+
+    def __init__(self):
+        self._records = []
+        self.n_N = 0
+        self.t_user_action = 0.0
+        self._fft = None
+
+    def start(self, solver):
+        r"""Attach profiler to solver.
+
+        Args:
+            solver (:obj:`SolverBaseClass`): Solver about to advance the field.
+        """
+        N = solver.N
+
+        def _N_counted(uw):
+            self.n_N += 1
+            return N(uw)
+
+        self._N, solver.N = N, _N_counted
+        self._fft = CountingFFT(get_fft_backend())
+        self._fft_prev = set_fft_backend(self._fft)
+        self._last = self._snapshot(solver)
+
+    def stop(self, solver):
+        r"""Detach profiler from solver.
+
+        Args:
+            solver (:obj:`SolverBaseClass`): Solver that advanced the field.
+        """
+        solver.N = self._N
+        set_fft_backend(self._fft_prev)
+
+    def _snapshot(self, solver):
+        return (
+            time.perf_counter(),
+            self.n_N,
+            self._fft.n_calls,
+            solver.n_accepted,
+            solver.n_rejected,
+            self.t_user_action,
+        )
+
+    def record(self, solver, i, z):
+        r"""Record counters for stored :math:`z`-slice.
+
+        Args:
+            solver (:obj:`SolverBaseClass`): Solver advancing the field.
+            i (:obj:`int`): Index of the stored :math:`z`-slice.
+            z (:obj:`float`): :math:`z`-value of the stored slice.
+        """
+        curr = self._snapshot(solver)
+        self._records.append(
+            (i, z) + tuple(c - p for c, p in zip(curr, self._last))
+        )
+        self._last = curr
+
+    @property
+    def records(self):
+        r""":obj:`numpy.ndarray`: Structured array with one record per stored
+        :math:`z`-slice and fields `i`, `z`, `wall_time`, `n_N`, `n_fft`,
+        `n_accepted`, `n_rejected`, and `t_user_action`."""
+        return np.array(self._records, dtype=PROFILE_DTYPE)
+
+    def save(self, file_path, name="profile"):
+        r"""Save records in HDF5 format.
+
+        Adds the records as a dataset to the HDF5 file at `file_path`,
+        creating the file if it does not exist, so that the records can be
+        stored alongside the simulation results.
+
+        Args:
+            file_path (:obj:`str`): Location of HDF5 file.
+            name (:obj:`str`): Name of the dataset (default is name =
+                "profile").
+        """
+        with h5py.File(file_path, "a") as f:
+            if name in f:
+                del f[name]
+            f.create_dataset(name, data=self.records)
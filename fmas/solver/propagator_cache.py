@@ -0,0 +1,158 @@
+"""
+Implements a cache for the exact linear propagator used by the
+:math:`z`-propagation algorithms.
+
+.. codeauthor:: Oliver Melchert <melchert@iqo.uni-hannover.de>
+"""
+import numpy as np
+from collections import OrderedDict
+
+
+class PropagatorCache:
+    r"""Cache for the exact linear propagator.
+
+    Provides the exact linear propagator
+
+    .. math::
+        \mathsf{P}_{\rm{lin}}(h) = \exp(\mathsf{L}\,h),
+
+    for step size :math:`h`, computing each distinct propagator only once.
+    Since the linear operator :math:`\mathsf{L}` and the step size of the
+    fixed stepsize algorithms do not change during propagation, the few
+    propagators needed by these algorithms, e.g. for a half-step and a full
+    step, are computed once per propagation run and reused for all subsequent
+    :math:`z`-steps.
+
+    The step size controllers of the adaptive stepsize algorithms only
+    multiply or divide the current step size by a fixed factor, so that the
+    same step sizes are requested repeatedly. To bound the memory used for
+    these algorithms, at most `maxsize` propagators are kept, discarding the
+    least recently used propagator if necessary. Step sizes are quantized to
+    `n_digits` significant digits before lookup, so that step sizes differing
+    only due to roundoff share a single propagator.
+
+    The propagators are computed at the floating point precision of
+    :math:`\mathsf{L}` and converted to data type `dtype`. For a simulation
+    run in single precision, a linear operator given in double precision thus
+    avoids the large phase errors of :math:`\mathsf{L}\,h` in single
+    precision.
+
+    Note:
+        The cached arrays are shared by all callers and must not be modified
+        in-place.
+
+    Args:
+        L (:obj:`numpy.ndarray`):
+            Linear operator of the partial differential equation.
+        maxsize (:obj:`int`):
+            Maximal number of cached propagators (default is maxsize = 32).
+        n_digits (:obj:`int`):
+            Number of significant digits used to quantize the step size
+            (default is n_digits = 12).
+        dtype (:obj:`numpy.dtype`):
+            Data type of the propagators (default is dtype = None, i.e. the
+            data type of :math:`\exp(\mathsf{L}\,h)`).
+
+    Attributes:
+        L (:obj:`numpy.ndarray`):
+            Linear operator of the partial differential equation.
+        maxsize (:obj:`int`):
+            Maximal number of cached propagators.
+        n_digits (:obj:`int`):
+            Number of significant digits used to quantize the step size.
+        dtype (:obj:`numpy.dtype`):
+            Data type of the propagators, or None.
+        hits (:obj:`int`):
+            Number of requests served from the cache.
+        misses (:obj:`int`):
+            Number of requests that required the computation of a new
+            propagator.
+    """
+
+    def __init__(self, L, maxsize=32, n_digits=12, dtype=None):
+        self.L = L
+        self.maxsize = maxsize
+        self.n_digits = n_digits
+        self.dtype = dtype
+        self.hits = 0
+        self.misses = 0
+        self._P = OrderedDict()
+        self._h = dict()
+
+    def __call__(self, h):
+        r"""Exact linear propagator for step size `h`.
+
+        Args:
+            h (:obj:`float`): Step size.
+
+        Returns:
+            :obj:`numpy.ndarray`: Linear propagator :math:`\exp(\mathsf{L}\,h)`.
+        """
+        key = self._key(h)
+        try:
+            P = self._P[key]
+        except KeyError:
+            self.misses += 1
+            P = np.exp(self.L * float(h))
+            if self.dtype is not None:
+                P = P.astype(self.dtype, copy=False)
+            self._P[key] = P
+            self._h[key] = h
+            if len(self._P) > self.maxsize:
+                key_lru, _ = self._P.popitem(last=False)
+                del self._h[key_lru]
+            return P
+        self.hits += 1
+        self._P.move_to_end(key)
+        return P
+
+    def _key(self, h):
+        r"""Quantize step size to `n_digits` significant digits.
+
+        Args:
+            h (:obj:`float`): Step size.
+
+        Returns:
+            :obj:`float`: Quantized step size.
+        """
+        return float("%.*e" % (self.n_digits - 1, h))
+
+    def __len__(self):
+        return len(self._P)
+
+    @property
+    def hit_rate(self):
+        r""":obj:`float`: Fraction of requests served from the cache."""
+        n_req = self.hits + self.misses
+        return self.hits / n_req if n_req > 0 else 0.0
+
+    @property
+    def step_sizes(self):
+        r""":obj:`list` of :obj:`float`: Step sizes for which the cached
+        propagators were computed, from least to most recently used."""
+        return [self._h[key] for key in self._P]
+
+    def restore(self, step_sizes, hits=0, misses=0):
+        r"""Restore cache state.
+
+        Recomputes the propagators for the given step sizes, so that the
+        cache holds the same propagators, in the same order, as the cache from
+        which the step sizes were obtained.
+
+        Args:
+            step_sizes (:obj:`list` of :obj:`float`):
+                Step sizes from least to most recently used.
+            hits (:obj:`int`): Number of cache hits (default is hits = 0).
+            misses (:obj:`int`): Number of cache misses (default is misses = 0).
+        """
+        self.clear()
+        for h in step_sizes:
+            self(h)
+        self.hits, self.misses = hits, misses
+
+    def clear(self):
+        r"""Remove all cached propagators and reset counters"""
+        self._P.clear()
+        self._h.clear()
+        self.hits = 0
+        self.misses = 0
@@ -4,10 +4,18 @@ Implements solver base class that serves as a driver for the implemented
 
 .. codeauthor:: Oliver Melchert <melchert@iqo.uni-hannover.de>
 """
+import time
 import numpy as np
 from ..config import FTFREQ, FT, IFT, W_MAX_FAC
-from ..tools import ProgressBar
-from ..stepper import RungeKutta4
+from ..tools import ProgressBar, TimeDomainView
+from ..data_io import (
+    save_checkpoint_h5,
+    load_checkpoint_h5,
+    AsyncSliceWriter,
+    MemmapSliceWriter,
+)
+from ..stepper import RungeKutta4, WORKSPACE_STEPPERS
+from .propagator_cache import PropagatorCache
 
 
 class SolverBaseClass:
@@ -16,6 +24,14 @@ class SolverBaseClass:
     Implements solver base class that serves as driver for the implemented
     :math:`z`-propagation algorithms.
 
+    Several initial conditions can be propagated simultaneously by passing
+    a 2-dim array of shape `(batch, t_num)` as initial field, where each row
+    holds the frequency-domain representation of a single field. All
+    members are advanced together, with the fast Fourier-transforms acting
+    along the last axis. The adaptive stepsize algorithms then select the
+    step size based on the largest local error of all members. Stored
+    fields are of shape `(z_num, batch, t_num)`.
+
     Attributes:
         L (:obj:`numpy.ndarray`):
             Linear operator of the partial differential equation.
@@ -24,6 +40,11 @@ class SolverBaseClass:
         stepper (:obj:`function`):
             :math:`z`-stepping algorithm. Default is a fourth-order Runge-Kutta
             formula.
+        _stepper (:obj:`function`):
+            :math:`z`-stepping algorithm used during propagation. For the
+            Runge-Kutta formulas of module :mod:`stepper`, this is a variant
+            operating on preallocated stage buffers, set up at the begin of
+            each propagation run. Otherwise identical to `stepper`.
         _z (:obj:`list`):
             :math:`z`-values for which field is stored and available after
             propagation.
@@ -32,10 +53,34 @@ class SolverBaseClass:
             listed in `_z`.
         w (:obj:`list`):
             Angular frequency mesh.
+        dtype (:obj:`numpy.dtype`):
+            Complex data type of the field, set by the floating point
+            precision of the angular frequency mesh, see :class:`Grid`.
+        t_num (:obj:`int`):
+            Number of time mesh-points. Differs from the size of `w` if the
+            field is given in the compact representation of the analytic
+            signal.
         ua_fun (:obj:`function`):
             User supplied function.
         ua_vals (:obj:`list` of :obj:`object`):
             List holding return-values of `ua_fun` for each stored `z`-slice.
+        sink (:obj:`object`):
+            Output sink used by the most recent propagation run, or None if
+            fields are accumulated in `_uwz`.
+        _P_lin (:obj:`PropagatorCache`):
+            Cache providing the exact linear propagator for a given step size.
+            Cleared at the begin of each propagation run, keeping its settings
+            `maxsize` and `n_digits`. Bounded in size and shared by all
+            substeps of the adaptive stepsize algorithms.
+        profiler (:obj:`SolverProfiler`):
+            Profiler attached to the most recent propagation run, or None.
+        dense_output (:obj:`bool`):
+            Whether the adaptive stepsize algorithms obtain the field at the
+            :math:`z`-slices by interpolation (default is dense_output =
+            False), see :meth:`_dense_step`.
+        controller (:obj:`StepSizeController`):
+            Step size controller of the adaptive stepsize algorithms, or None
+            for fixed stepsize algorithms.
 
     Args:
         L (:obj:`numpy.ndarray`):
@@ -57,32 +102,67 @@ class SolverBaseClass:
 
     """
 
+    # -- NAMES OF INSTANCE ATTRIBUTES HOLDING SOLVER STATE THAT NEEDS TO BE
+    # ... INCLUDED IN CHECKPOINTS
+    _checkpoint_attrs = ()
+
     def __init__(self, L, N, stepper=RungeKutta4, user_action=None):
         self.L = L
         self.N = N
         self.w = None
+        self.dtype = None
+        self.t_num = None
         self._z = []
         self._uwz = []
         self.stepper = stepper
+        self._stepper = stepper
         self.ua_fun = user_action
         self.ua_vals = []
+        self.sink = None
+        self._ut = None
+        self.profiler = None
+        self.dense_output = False
+        self.controller = None
+        self._dense_z = np.zeros(0)
+        self._dense_u = []
+        self._dense_N = []
+        self._P_lin = PropagatorCache(L)
 
-    def set_initial_condition(self, w, uw, z0=0.0):
+    def set_initial_condition(self, w, uw, z0=0.0, t_num=None):
         r"""Set initial condition
 
         Args:
             w (:obj:`numpy.ndarray`):
                 Angular frequency mesh.
             uw (:obj:`numpy.ndarray`):
-                Initial field.
+                Initial field, or 2-dim array of shape `(batch, t_num)` with
+                a batch of initial fields. Converted to the floating point
+                precision of the angular frequency mesh, see :class:`Grid`.
             z0 (:obj:`float`):
                 :math:`z`-position of initial field (default is z0 = 0.0).
+            t_num (:obj:`int`):
+                Number of time mesh-points. Needs to be specified only if
+                `uw` is the compact representation of the analytic signal
+                (default is t_num = None, i.e. the size of `w`).
         """
         self.w = w
+        self.dtype = np.result_type(np.asarray(w).dtype, np.complex64)
+        self.t_num = np.size(w) if t_num is None else t_num
+        uw = np.asarray(uw, dtype=self.dtype)
         self._uwz.append(uw)
         self._z.append(z0)
 
-    def propagate(self, z_range, n_steps, n_skip=0):
+    def propagate(
+        self,
+        z_range,
+        n_steps,
+        n_skip=0,
+        sink=None,
+        checkpoint_path=None,
+        n_checkpoint=None,
+        profiler=None,
+        n_queue=0,
+    ):
         r"""Propagate field
 
         Args:
@@ -93,36 +173,453 @@ class SolverBaseClass:
             n_skip (:obj:`int`):
                 Number of intermediate fiels to skip in output file (default is
                 n_skip = 0).
+            sink (:obj:`object`):
+                Output sink, e.g. an instance of
+                :class:`fmas.data_io.H5SliceWriter`, receiving the field at
+                each stored :math:`z`-slice via its method
+                `append(z, uw, ua_val)`. If a sink is specified, fields are not
+                accumulated in memory (default is sink = None).
+            checkpoint_path (:obj:`str`):
+                Location of checkpoint file (default is checkpoint_path =
+                None).
+            n_checkpoint (:obj:`int`):
+                Number of integration steps between subsequent checkpoints. No
+                checkpoints are written if None (default is n_checkpoint =
+                None).
+            profiler (:obj:`object`):
+                Profiler, e.g. an instance of
+                :class:`fmas.solver.profiler.SolverProfiler`, recording
+                runtime statistics for each stored :math:`z`-slice (default
+                is profiler = None).
+            n_queue (:obj:`int`):
+                Maximal number of :math:`z`-slices queued for output. If
+                positive, slices are passed to `sink` by a background writer
+                thread, see :class:`fmas.data_io.AsyncSliceWriter`, so that
+                writing overlaps with propagation (default is n_queue = 0,
+                i.e. slices are passed to `sink` directly).
         """
         w, ua_fun = self.w, self.ua_fun
+        self._ut = None
+        if sink is not None and n_queue > 0:
+            sink = AsyncSliceWriter(sink, maxsize=n_queue)
+        self.sink = sink
+        self.profiler = profiler
+        self._z_range, self._n_skip = z_range, n_skip
         # -- INITIALIZE Z-SLICES
         self.z_, self.dz_ = np.linspace(0, z_range, n_steps + 1, retstep=True)
-        pb = ProgressBar(num_iter=self.z_.size - 1, bar_len=60)
+        # ... STEP SIZE AS PYTHON FLOAT PRESERVES THE PRECISION OF THE FIELD
+        self.dz_ = float(self.dz_)
+        # -- INITIALIZE LINEAR PROPAGATORS
+        self._P_lin.L, self._P_lin.dtype = self.L, self.dtype
+        self._P_lin.clear()
         uw = self._uwz[0]
+        # -- INITIALIZE Z-STEPPER
+        self._stepper = self._init_stepper(uw)
+        # -- RESET INTEGRATOR STATE FOR DENSE OUTPUT
+        self._dense_z, self._dense_u, self._dense_N = np.zeros(0), [], []
+        # -- PREPARE STEP SIZE CONTROLLER
+        if self.controller is not None:
+            self.controller.setup(self.del_G, self.err_exp, self.scale_fac)
+        ua_val = None
         if ua_fun is not None:
-            self.ua_vals.append(ua_fun(0, self.z_[0], w, uw))
+            ua_val = ua_fun(0, self.z_[0], w, uw)
+            self.ua_vals.append(ua_val)
+        if sink is not None:
+            sink.append(self._z[0], uw, ua_val)
         # -- SOLVE FOR SUBSEQUENT Z-SLICES
-        for i in range(1, self.z_.size):
-            uw = self.single_step(self.z_[i], uw)
-            if i % n_skip == 0:
-                self._uwz.append(uw)
-                self._z.append(self.z_[i])
-                if ua_fun is not None:
-                    self.ua_vals.append(ua_fun(i, self.z_[i], w, uw))
-            pb.update(i)
+        self._advance(1, uw, checkpoint_path, n_checkpoint)
+
+    def resume(
+        self, checkpoint_path, sink=None, n_checkpoint=None, profiler=None, n_queue=0
+    ):
+        r"""Resume propagation from checkpoint
+
+        Restores the state of a propagation run from a checkpoint written by
+        :meth:`propagate` and continues the run. The resumed run yields
+        results identical to those of an uninterrupted run.
+
+        Note:
+            The solver needs to be initialized with the same linear operator,
+            nonlinear operator, and user-supplied function as the solver that
+            wrote the checkpoint.
+
+        Args:
+            checkpoint_path (:obj:`str`):
+                Location of checkpoint file.
+            sink (:obj:`object`):
+                Output sink, required if the interrupted run used a sink. For
+                :class:`fmas.data_io.H5SliceWriter`, open the output file of
+                the interrupted run with mode "a". Slices written after the
+                checkpoint was taken are discarded (default is sink = None).
+            n_checkpoint (:obj:`int`):
+                Number of integration steps between subsequent checkpoints
+                (default is n_checkpoint = None).
+            profiler (:obj:`object`):
+                Profiler recording runtime statistics for each stored
+                :math:`z`-slice of the resumed run (default is profiler =
+                None).
+            n_queue (:obj:`int`):
+                Maximal number of :math:`z`-slices queued for output by a
+                background writer thread (default is n_queue = 0), see
+                :meth:`propagate`.
+        """
+        attrs, data = load_checkpoint_h5(checkpoint_path)
+        if ("n_sink" in attrs) != (sink is not None):
+            raise ValueError("sink must be given iff checkpointed run used a sink")
+        self.w, self.t_num = data["w"], int(attrs["t_num"])
+        self.dtype = np.result_type(self.w.dtype, np.complex64)
+        self._z_range, self._n_skip = attrs["z_range"], int(attrs["n_skip"])
+        self.z_, self.dz_ = np.linspace(
+            0, self._z_range, int(attrs["n_steps"]) + 1, retstep=True
+        )
+        self.dz_ = float(self.dz_)
+        self._P_lin.L, self._P_lin.dtype = self.L, self.dtype
+        self._P_lin.restore(
+            data["P_lin_h"], int(attrs["P_lin_hits"]), int(attrs["P_lin_misses"])
+        )
+        self._stepper = self._init_stepper(data["uw"])
+        self._ut = None
+        self.profiler = profiler
+        if sink is None:
+            self._uwz = list(data["uwz"])
+        else:
+            sink.truncate(int(attrs["n_sink"]))
+            self._uwz = [sink.uwz[0]]
+            if n_queue > 0:
+                sink = AsyncSliceWriter(sink, maxsize=n_queue)
+        self.sink = sink
+        self._z = list(data["z"])
+        if "ua_vals" in data:
+            self.ua_vals = list(data["ua_vals"])
+        else:
+            self.ua_vals = [None] * int(attrs["n_ua"])
+        for name in self._checkpoint_attrs:
+            val = data["state_" + name]
+            setattr(self, name, list(val) if attrs["list_" + name] else val[()])
+        self._dense_N = []
+        if self.controller is not None:
+            self.controller.setup(self.del_G, self.err_exp, self.scale_fac)
+            self.controller.set_state(data["controller_state"])
+        self._advance(int(attrs["i"]) + 1, data["uw"], checkpoint_path, n_checkpoint)
+
+    def _init_stepper(self, uw):
+        r"""Set up :math:`z`-stepper for propagation run
+
+        Args:
+            uw (:obj:`numpy.ndarray`):
+                Frequency-domain representation of the initial field.
+
+        Returns:
+            :obj:`function`: Variant of `stepper` operating on preallocated
+            stage buffers if available, otherwise `stepper`.
+        """
+        try:
+            Workspace = WORKSPACE_STEPPERS[self.stepper]
+        except (KeyError, TypeError):
+            return self.stepper
+        return Workspace(np.shape(uw), np.result_type(uw, 1j))
+
+    def _dense_step(self, z_target, uw, trial_step):
+        r"""Advance field to :math:`z`-slice using dense output
+
+        Advances the field using the natural step sizes selected by the
+        adaptive step size controll, independent of the positions of the
+        :math:`z`-slices, and obtains the field at the requested
+        :math:`z`-slice by interpolation. The integrator state, i.e. the
+        field at the begin and end of the most recent substep, persists across
+        subsequent :math:`z`-slices. Only the final substep of the
+        propagation range is shortened to land at its upper boundary.
+
+        Interpolation is performed in the interaction picture. For a
+        substep of size :math:`h`, starting at :math:`z_n`, with
+        :math:`v(z_n+\theta h)=\exp(-\mathsf{L}\theta h)u(z_n+\theta h)`
+        and :math:`\partial_z v=\exp(-\mathsf{L}\theta h)\mathsf{N}(u)`,
+        a cubic Hermite interpolant of :math:`v` is constructed from the
+        fields and their derivatives at both ends of the substep. The
+        evaluations of the nonlinear function :math:`\mathsf{N}` needed to
+        obtain the derivatives are performed only for substeps that contain
+        a :math:`z`-slice, and are reused for adjacent substeps.
+
+        Note:
+            The interpolant has local error :math:`\mathcal{O}(h^4)`.
+
+        Args:
+            z_target (:obj:`float`):
+                Position of the requested :math:`z`-slice.
+            uw (:obj:`numpy.ndarray`):
+                Frequency-domain representation of the field at the preceding
+                :math:`z`-slice. Used only to initialize the integrator state
+                at the begin of a propagation run.
+            trial_step (:obj:`function`):
+                Function with call signature `trial_step(uw, h, Nuw)`,
+                performing a trial substep of size `h`, where `Nuw` is the
+                nonlinear function at `uw` if available, and None otherwise.
+                Returns the updated field, the local error estimate, and the
+                nonlinear function at the updated field if available, and None
+                otherwise.
+
+        Returns:
+            :obj:`numpy.ndarray`: Frequency-domain representation of the
+            field at `z_target`.
+        """
+        controller = self.controller
+        # ... POSITIONS AND STEP SIZES AS PYTHON FLOATS PRESERVE THE PRECISION
+        # ... OF THE FIELD
+        z_target = float(z_target)
+
+        # -- INITIALIZE INTEGRATOR STATE AT BEGIN OF PROPAGATION RUN
+        if self._dense_z.size == 0:
+            self._dense_z = np.array([z_target - self.dz_, 0.0])
+            self._dense_u = [uw, uw]
+
+        # -- BEGIN: PERFORM NATURAL SUBSTEPS UNTIL Z_TARGET IS REACHED
+        z_n, h = self._dense_z.tolist()
+        u_n, u_np1 = self._dense_u
+        z_end = float(self.z_[-1])
+        dz_a = self._dz_a[-1]  # CURRENT STEP SIZE
+        del_curr = self._del_rle[-1]
+        while z_n + h < z_target:
+            # -- BEGIN: SUBSTEP
+            z_a = z_n + h
+            # ... LIMIT FINAL SUBSTEP TO LAND AT END OF PROPAGATION RANGE
+            h_a = min(dz_a, z_end - z_a)
+            u_trial, del_trial, Nu_trial = trial_step(
+                u_np1, h_a, self._dense_N_at(u_np1, evaluate=False)
+            )
+            accepted, dz_a = controller(h_a, del_trial, dz_a)
+            if not accepted:
+                continue
+            del_curr = del_trial
+            z_n, h, u_n, u_np1 = z_a, h_a, u_np1, u_trial
+            if Nu_trial is not None:
+                self._dense_N = self._dense_N[-1:] + [(u_trial, Nu_trial)]
+            # -- END: SUBSTEP
+        # -- END: PERFORM NATURAL SUBSTEPS UNTIL Z_TARGET IS REACHED
+        self._dense_z = np.array([z_n, h])
+        self._dense_u = [u_n, u_np1]
+        self._del_rle.append(del_curr)
+        self._dz_a.append(dz_a)
+
+        # -- INTERPOLATE FIELD AT Z_TARGET
+        if z_target == z_n + h:
+            return u_np1
+        theta = (z_target - z_n) / h
+        # ... PROPAGATORS ARE COMPUTED DIRECTLY SINCE THE STEP SIZES DIFFER
+        # ... FOR EACH Z-SLICE AND WOULD EVICT THE CACHED SUBSTEP PROPAGATORS.
+        # ... THEY ARE OBTAINED AT THE PRECISION OF THE LINEAR OPERATOR AND
+        # ... CONVERTED TO THE PRECISION OF THE FIELD
+        dtype = self.dtype
+        P_back = np.exp(-self.L * h).astype(dtype, copy=False)
+        v0, d0 = u_n, self._dense_N_at(u_n)
+        v1, d1 = P_back * u_np1, P_back * self._dense_N_at(u_np1)
+        h00 = (1 + 2 * theta) * (1 - theta) ** 2
+        h10 = theta * (1 - theta) ** 2
+        h01 = theta ** 2 * (3 - 2 * theta)
+        h11 = theta ** 2 * (theta - 1)
+        v = h00 * v0 + h10 * h * d0 + h01 * v1 + h11 * h * d1
+        return np.exp(self.L * theta * h).astype(dtype, copy=False) * v
+
+    def _dense_N_at(self, uw, evaluate=True):
+        r"""Nonlinear function at integrator state
+
+        Args:
+            uw (:obj:`numpy.ndarray`):
+                Field at the begin or end of the most recent substep.
+            evaluate (:obj:`bool`):
+                Evaluate the nonlinear function if it is not available
+                (default is evaluate = True).
+
+        Returns:
+            :obj:`numpy.ndarray`: Nonlinear function at `uw`, or None if it is
+            not available and `evaluate` is False.
+        """
+        for u, Nu in self._dense_N:
+            if u is uw:
+                return Nu
+        if not evaluate:
+            return None
+        Nu = self.N(uw)
+        self._dense_N = self._dense_N[-1:] + [(uw, Nu)]
+        return Nu
+
+    def _advance(self, i_start, uw, checkpoint_path=None, n_checkpoint=None):
+        r"""Advance field through :math:`z`-slices
+
+        Args:
+            i_start (:obj:`int`):
+                Index of first :math:`z`-slice to compute.
+            uw (:obj:`numpy.ndarray`):
+                Frequency-domain representation of the field at the preceding
+                :math:`z`-slice.
+            checkpoint_path (:obj:`str`):
+                Location of checkpoint file (default is checkpoint_path =
+                None).
+            n_checkpoint (:obj:`int`):
+                Number of integration steps between subsequent checkpoints
+                (default is n_checkpoint = None).
+        """
+        n_skip, prof = self._n_skip, self.profiler
+        pb = ProgressBar(num_iter=self.z_.size - 1, bar_len=60)
+        if prof is not None:
+            prof.start(self)
+        try:
+            for i in range(i_start, self.z_.size):
+                uw = self.single_step(self.z_[i], uw)
+                if i % n_skip == 0:
+                    self._store_slice(i, uw)
+                    if prof is not None:
+                        prof.record(self, i, self.z_[i])
+                if n_checkpoint and i % n_checkpoint == 0:
+                    self.save_checkpoint(checkpoint_path, i, uw)
+                pb.update(i)
+        finally:
+            if prof is not None:
+                prof.stop(self)
+            # -- WRITE PENDING SLICES ALSO IF PROPAGATION FAILED
+            self._finish_sink()
         pb.finish()
 
+    def _finish_sink(self):
+        r"""Write pending :math:`z`-slices to output sink
+
+        Stops the background writer thread, if one was set up by
+        :meth:`propagate`, after all queued slices have been written, and
+        flushes the output sink.
+        """
+        sink = self.sink
+        if sink is None:
+            return
+        if isinstance(sink, AsyncSliceWriter):
+            self.sink = sink.sink
+            sink.stop()
+        self.sink.flush()
+
+    def save_checkpoint(self, checkpoint_path, i, uw):
+        r"""Save state of propagation run
+
+        Args:
+            checkpoint_path (:obj:`str`):
+                Location of checkpoint file.
+            i (:obj:`int`):
+                Index of the current :math:`z`-slice.
+            uw (:obj:`numpy.ndarray`):
+                Frequency-domain representation of the field at the current
+                :math:`z`-slice.
+        """
+        attrs = {
+            "solver": type(self).__name__,
+            "i": i,
+            "z_range": self._z_range,
+            "n_steps": self.z_.size - 1,
+            "n_skip": self._n_skip,
+            "t_num": self.t_num,
+            "n_ua": len(self.ua_vals),
+            "P_lin_hits": self._P_lin.hits,
+            "P_lin_misses": self._P_lin.misses,
+        }
+        data = {
+            "uw": uw,
+            "w": self.w,
+            "z": np.asarray(self._z),
+            "P_lin_h": np.asarray(self._P_lin.step_sizes, dtype=float),
+        }
+        if self.sink is None:
+            data["uwz"] = np.asarray(self._uwz)
+        else:
+            self.sink.flush()
+            attrs["n_sink"] = self.sink.num_slices
+        if self.controller is not None:
+            data["controller_state"] = self.controller.get_state()
+        if self.ua_vals and not any(val is None for val in self.ua_vals):
+            data["ua_vals"] = np.asarray(self.ua_vals)
+        for name in self._checkpoint_attrs:
+            val = getattr(self, name)
+            attrs["list_" + name] = isinstance(val, list)
+            data["state_" + name] = np.asarray(val)
+        save_checkpoint_h5(checkpoint_path, attrs, **data)
+
+    def _store_slice(self, i, uw):
+        r"""Store field at :math:`z`-slice
+
+        Args:
+            i (:obj:`int`):
+                Index specifying the current :math:`z`-step.
+            uw (:obj:`numpy.ndarray`):
+                Frequency-domain representation of the current field.
+        """
+        zi, ua_val = self.z_[i], None
+        if self.ua_fun is not None:
+            t_ua = time.perf_counter()
+            ua_val = self.ua_fun(i, zi, self.w, uw)
+            if self.profiler is not None:
+                self.profiler.t_user_action += time.perf_counter() - t_ua
+            self.ua_vals.append(ua_val)
+        if self.sink is None:
+            self._uwz.append(uw)
+        else:
+            self.sink.append(zi, uw, ua_val)
+        self._z.append(zi)
+
     @property
     def utz(self):
-        r""":obj:`numpy.ndarray`, 2-dim: Time-domain representation of field"""
-        return IFT(np.asarray(self._uwz), axis=-1)
+        r""":obj:`numpy.ndarray`, 2-dim: Time-domain representation of field.
+        For an output sink of type :class:`fmas.data_io.MemmapSliceWriter`,
+        computed in chunks and returned as memory-mapped array."""
+        if isinstance(self.sink, MemmapSliceWriter):
+            return self.sink.utz(self.t_num)
+        return IFT(self.uwz, n=self.t_num, axis=-1)
+
+    @property
+    def ut(self):
+        r""":obj:`TimeDomainView`: Lazy time-domain representation of field,
+        transforming only requested :math:`z`-slices and caching the result,
+        see :class:`fmas.tools.TimeDomainView`. The same view, including its
+        cache, is returned on subsequent access until the next propagation
+        run."""
+        if self._ut is None:
+            uwz = self._uwz if self.sink is None else self.sink.uwz
+            self._ut = TimeDomainView(uwz, t_num=self.t_num)
+        return self._ut
 
     @property
     def uwz(self):
         r""":obj:`numpy.ndarray`, 2-dim: Frequency-domain representation of
-        field"""
+        field. Read from the output sink if one was used for propagation."""
+        if self.sink is not None:
+            return np.asarray(self.sink.uwz)
         return np.asarray(self._uwz)
 
+    @property
+    def n_accepted(self):
+        r""":obj:`int`: Number of accepted substeps of the adaptive stepsize
+        algorithms in the current propagation run, as counted by the step
+        size controller. Zero for fixed stepsize algorithms."""
+        if self.controller is None:
+            return 0
+        return self.controller.n_accepted
+
+    @property
+    def n_rejected(self):
+        r""":obj:`int`: Number of rejected substeps of the adaptive stepsize
+        algorithms in the current propagation run, as counted by the step
+        size controller. Zero for fixed stepsize algorithms."""
+        if self.controller is None:
+            return 0
+        return self.controller.n_rejected
+
+    @property
+    def propagator_cache(self):
+        r""":obj:`PropagatorCache`: Cache of linear propagators, providing the
+        hit and miss counters `hits` and `misses` of the current run. Its
+        settings `maxsize` and `n_digits` can be changed, or the cache can be
+        replaced by a differently configured instance of
+        :class:`PropagatorCache`, before a propagation run."""
+        return self._P_lin
+
+    @propagator_cache.setter
+    def propagator_cache(self, cache):
+        self._P_lin = cache
+
     @property
     def z(self):
         r""":obj:`numpy.ndarray`, 1-dim: :math:`z`-slices at which field is
@@ -135,6 +632,8 @@ class SolverBaseClass:
         self._z = []
         del self._uwz
         self._uwz = []
+        self.sink = None
+        self._ut = None
 
     def single_step(self):
         r"""Advance field by a single :math:`z`-slice"""
@@ -59,9 +59,9 @@ class SySSM(SolverBaseClass):
             :obj:`numpy.ndarray`: Frequency domain representation of the field
             at `z_curr` + `dz`.
         """
-        dz, w, L, N, P = self.dz_, self.w, self.L, self.N, self.stepper
+        dz, w, L, N, P = self.dz_, self.w, self.L, self.N, self._stepper
         _cleanup = lambda Ew: np.where(np.abs(w) < W_MAX_FAC * w.max(), Ew, 0j)
-        _P_lin = lambda z: np.exp(L * z)
+        _P_lin = self._P_lin
         _dEwdz = lambda z, Ew: self.N(Ew)
         return _P_lin(dz / 2) * P(_dEwdz, 0.0, _P_lin(dz / 2) * Ew, dz)
 
@@ -109,8 +109,8 @@ class SiSSM(SolverBaseClass):
             :obj:`numpy.ndarray`: Frequency domain representation of the field
             at `z_curr` + `dz`.
         """
-        dz, w, L, N, P = self.dz_, self.w, self.L, self.N, self.stepper
+        dz, w, L, N, P = self.dz_, self.w, self.L, self.N, self._stepper
         _cleanup = lambda Ew: np.where(np.abs(w) < W_MAX_FAC * w.max(), Ew, 0j)
-        _P_lin = lambda z: np.exp(L * z)
+        _P_lin = self._P_lin
         _dEwdz = lambda z, Ew: self.N(Ew)
         return _P_lin(dz) * P(_dEwdz, 0.0, Ew, dz)
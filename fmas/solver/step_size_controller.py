@@ -0,0 +1,319 @@
+r"""
+Implements step size controllers for the adaptive stepsize algorithms.
+
+.. autosummary::
+   :nosignatures:
+
+   BangBang
+   PI
+   Predictive
+
+A step size controller decides whether a trial substep of given size and
+local error estimate is accepted, and proposes the step size for the next
+substep. It is passed to an adaptive stepsize algorithm via its keyword
+argument `controller`. When a propagation run is started, the solver calls the
+method `setup` of the controller, providing the goal local error `del_G`, the
+order `err_exp` of the local error estimate, i.e. the exponent in
+:math:`\delta \propto h^{\rm{err\_exp}}`, and the default step size scaling
+factor `scale_fac` of the solver.
+
+.. codeauthor:: Oliver Melchert <melchert@iqo.uni-hannover.de>
+"""
+import numpy as np
+
+
+class StepSizeController:
+    r"""Base class for step size controllers.
+
+    Attributes:
+        n_accepted (:obj:`int`):
+            Number of accepted substeps since the last call to `setup`.
+        n_rejected (:obj:`int`):
+            Number of rejected substeps since the last call to `setup`.
+    """
+
+    def __init__(self):
+        self.del_G = None
+        self.err_exp = None
+        self.scale_fac = None
+        self.n_accepted = 0
+        self.n_rejected = 0
+
+    def setup(self, del_G, err_exp, scale_fac):
+        r"""Prepare controller for a propagation run.
+
+        Args:
+            del_G (:obj:`float`): Goal local error.
+            err_exp (:obj:`int`): Order of the local error estimate.
+            scale_fac (:obj:`float`): Default step size scaling factor.
+        """
+        self.del_G = del_G
+        self.err_exp = err_exp
+        self.scale_fac = scale_fac
+        self.n_accepted = 0
+        self.n_rejected = 0
+
+    def __call__(self, h, del_curr, h_nat=None):
+        r"""Assess trial substep.
+
+        Args:
+            h (:obj:`float`): Size of the trial substep.
+            del_curr (:obj:`float`): Local error estimate of the trial substep.
+            h_nat (:obj:`float`): Natural step size, i.e. the size of the
+                trial substep before it was shortened to land at the upper
+                boundary of a :math:`z`-slice (default is h_nat = None, i.e.
+                the trial substep was not shortened). If the substep is
+                accepted, the step size for the next substep is obtained from
+                the natural step size.
+
+        Returns:
+            :obj:`tuple`: Flag indicating whether the substep is accepted, and
+            step size for the next substep.
+        """
+        h_nat = h if h_nat is None else h_nat
+        accepted, h_next = self._control(h, del_curr, h_nat)
+        if accepted:
+            self.n_accepted += 1
+        else:
+            self.n_rejected += 1
+        return accepted, h_next
+
+    def _control(self, h, del_curr, h_nat):
+        raise NotImplementedError
+
+    @property
+    def rejection_rate(self):
+        r""":obj:`float`: Fraction of rejected substeps."""
+        n_tot = self.n_accepted + self.n_rejected
+        return self.n_rejected / n_tot if n_tot > 0 else 0.0
+
+    def get_state(self):
+        r"""Controller state needed to resume a propagation run.
+
+        Returns:
+            :obj:`numpy.ndarray`: Controller state.
+        """
+        return np.array([self.n_accepted, self.n_rejected], dtype=float)
+
+    def set_state(self, state):
+        r"""Restore controller state.
+
+        Args:
+            state (:obj:`numpy.ndarray`): Controller state obtained by
+                `get_state`.
+        """
+        self.n_accepted, self.n_rejected = int(state[0]), int(state[1])
+
+
+class BangBang(StepSizeController):
+    r"""Bang-bang step size controller.
+
+    Default controller of the adaptive stepsize algorithms. With goal local
+    error :math:`\delta_G`, a substep with local error :math:`\delta` is
+
+    - rejected, and retried with halved step size, if :math:`\delta >
+      2\delta_G`,
+    - accepted, and the step size decreased by the scaling factor, if
+      :math:`\delta_G < \delta < 2\delta_G`,
+    - accepted, and the step size increased by the scaling factor, if
+      :math:`\delta < f_{\rm{lower}}\,\delta_G`,
+    - accepted, with unchanged step size, otherwise.
+
+    Args:
+        fac_lower (:obj:`float`):
+            Lower bound of the local error, in units of the goal local error,
+            below which the step size is increased (default is fac_lower =
+            0.5).
+        scale_fac (:obj:`float`):
+            Step size scaling factor (default is scale_fac = None, i.e. use
+            the default scaling factor of the solver).
+    """
+
+    def __init__(self, fac_lower=0.5, scale_fac=None):
+        super().__init__()
+        self.fac_lower = fac_lower
+        self._scale_fac = scale_fac
+
+    def setup(self, del_G, err_exp, scale_fac):
+        if self._scale_fac is not None:
+            scale_fac = self._scale_fac
+        super().setup(del_G, err_exp, scale_fac)
+
+    def _control(self, h, del_curr, h_nat):
+        del_G, scale_fac = self.del_G, self.scale_fac
+        if del_curr > 2 * del_G:
+            # ... CASE 1: LOCAL ERROR TOO LARGE
+            # ... DISCARD SOLUTION AND RETRY WITH HALVED STEP SIZE
+            return False, h * 0.5
+        elif (del_curr > del_G) and (del_curr < 2 * del_G):
+            # ... CASE 2: LOCAL ERROR TOO LARGE
+            # ... KEEP SOLUTION AND DECREASE STEP SIZE FOR NEXT SUBSTEP
+            return True, h_nat / scale_fac
+        elif del_curr < self.fac_lower * del_G:
+            # ... CASE 3: LOCAL ERROR TOO SMALL
+            # ... KEEP SOLUTION AND INCREASE STEP SIZE FOR NEXT SUBSTEP
+            return True, h_nat * scale_fac
+        return True, h_nat
+
+
+class PI(StepSizeController):
+    r"""Proportional-integral (PI) step size controller.
+
+    Implements the PI step size controller of Gustafsson [1,2], selecting the
+    step size for the next substep according to
+
+    .. math::
+        h_{n+1} = h_n\,\gamma\,r_n^{-k_I/k}\,(r_{n-1}/r_n)^{k_P/k},
+
+    where :math:`r_n=\delta_n/\delta_G` is the local error of the current
+    substep in units of the goal local error, :math:`k` is the order of the
+    local error estimate, and :math:`\gamma` is a safety factor. A substep is
+    rejected if :math:`r_n > r_{\rm{acc}}`, in which case the step size is
+    reduced according to :math:`h_n\,\gamma\,r_n^{-1/k}`. Following a
+    rejected substep, the step size is not increased.
+
+    Note:
+        Smoothly varying step sizes reduce the number of rejected substeps
+        in comparison to the bang-bang controller, which, for the local error
+        methods, saves the cost of the discarded coarse and fine solutions.
+
+    References:
+        [1] K. Gustafsson,
+        Control theoretic techniques for stepsize selection in explicit
+        Runge-Kutta methods,
+        ACM Trans. Math. Softw. 17 (1991) 533,
+        https://doi.org/10.1145/210232.210242.
+
+        [2] E. Hairer, G. Wanner,
+        Solving Ordinary Differential Equations II (Chapter IV.8),
+        Springer (1996).
+
+    Args:
+        k_I (:obj:`float`):
+            Integral gain (default is k_I = 0.3).
+        k_P (:obj:`float`):
+            Proportional gain (default is k_P = 0.4).
+        safety (:obj:`float`):
+            Safety factor (default is safety = 0.9).
+        fac_min (:obj:`float`):
+            Minimal step size ratio of subsequent substeps (default is fac_min
+            = 0.2).
+        fac_max (:obj:`float`):
+            Maximal step size ratio of subsequent substeps (default is fac_max
+            = 2.0).
+        r_acc (:obj:`float`):
+            Largest accepted local error, in units of the goal local error
+            (default is r_acc = 2.0, in accord with the bang-bang controller).
+    """
+
+    def __init__(
+        self, k_I=0.3, k_P=0.4, safety=0.9, fac_min=0.2, fac_max=2.0, r_acc=2.0
+    ):
+        super().__init__()
+        self.k_I = k_I
+        self.k_P = k_P
+        self.safety = safety
+        self.fac_min = fac_min
+        self.fac_max = fac_max
+        self.r_acc = r_acc
+        self._r_prev = 1.0
+        self._h_prev = None
+        self._rejected_last = False
+
+    def setup(self, del_G, err_exp, scale_fac):
+        super().setup(del_G, err_exp, scale_fac)
+        self._r_prev = 1.0
+        self._h_prev = None
+        self._rejected_last = False
+
+    def _clip(self, fac):
+        fac_max = 1.0 if self._rejected_last else self.fac_max
+        return min(fac_max, max(self.fac_min, fac))
+
+    def _control(self, h, del_curr, h_nat):
+        k = self.err_exp
+        # -- AVOID DIVISION BY ZERO FOR VANISHING LOCAL ERROR
+        r = max(del_curr / self.del_G, 1e-10)
+        if r > self.r_acc:
+            self._rejected_last = True
+            return False, h * self._clip(self.safety * r ** (-1.0 / k))
+        fac = self._accepted_fac(h, r)
+        h_next = h_nat * self._clip(fac)
+        self._r_prev, self._h_prev = r, h
+        self._rejected_last = False
+        return True, h_next
+
+    def _accepted_fac(self, h, r):
+        k = self.err_exp
+        return self.safety * r ** (-self.k_I / k) * (self._r_prev / r) ** (self.k_P / k)
+
+    def get_state(self):
+        h_prev = np.nan if self._h_prev is None else self._h_prev
+        return np.concatenate(
+            (
+                super().get_state(),
+                [self._r_prev, h_prev, float(self._rejected_last)],
+            )
+        )
+
+    def set_state(self, state):
+        super().set_state(state)
+        self._r_prev = state[2]
+        self._h_prev = None if np.isnan(state[3]) else state[3]
+        self._rejected_last = bool(state[4])
+
+
+class Predictive(PI):
+    r"""Predictive step size controller.
+
+    Implements the predictive step size controller of Gustafsson [1], as used
+    in the RADAU5 code [2]. After an accepted substep, the step size
+    proposed by the standard controller, :math:`h_n\,\gamma\,r_n^{-1/k}`, is
+    compared to the predictive step size
+
+    .. math::
+        h_{n+1} = h_n\,\gamma\,\frac{h_n}{h_{n-1}}\,
+        \left(\frac{r_{n-1}}{r_n^2}\right)^{1/k},
+
+    which extrapolates the trend of the local error of the preceding
+    accepted substeps, and the smaller of both is used.
+
+    References:
+        [1] K. Gustafsson,
+        Control-theoretic techniques for stepsize selection in implicit
+        Runge-Kutta methods,
+        ACM Trans. Math. Softw. 20 (1994) 496,
+        https://doi.org/10.1145/198429.198437.
+
+        [2] E. Hairer, G. Wanner,
+        Solving Ordinary Differential Equations II (Chapter IV.8),
+        Springer (1996).
+
+    Args:
+        safety (:obj:`float`):
+            Safety factor (default is safety = 0.9).
+        fac_min (:obj:`float`):
+            Minimal step size ratio of subsequent substeps (default is fac_min
+            = 0.2).
+        fac_max (:obj:`float`):
+            Maximal step size ratio of subsequent substeps (default is fac_max
+            = 2.0).
+        r_acc (:obj:`float`):
+            Largest accepted local error, in units of the goal local error
+            (default is r_acc = 2.0).
+    """
+
+    def __init__(self, safety=0.9, fac_min=0.2, fac_max=2.0, r_acc=2.0):
+        super().__init__(
+            safety=safety, fac_min=fac_min, fac_max=fac_max, r_acc=r_acc
+        )
+
+    def _accepted_fac(self, h, r):
+        k = self.err_exp
+        fac = self.safety * r ** (-1.0 / k)
+        if self._h_prev is not None:
+            fac_gus = (
+                self.safety * (h / self._h_prev) * (self._r_prev / r / r) ** (1.0 / k)
+            )
+            fac = min(fac, fac_gus)
+        return fac
@@ -9,6 +9,8 @@ Implements are the subsequent :math:`z`-stepping formulas.
 
    RungeKutta2
    RungeKutta4
+   RungeKutta2Workspace
+   RungeKutta4Workspace
 
 .. [NR1992] W. H. Press, S. A. Teukolsky, W. T. Vetterling, B. P. Flannery,
     Numerical Recipes in C: The art of scientific computing (Chapter 16.1),
@@ -18,6 +20,7 @@ Implements are the subsequent :math:`z`-stepping formulas.
 
 .. codeauthor:: Oliver Melchert <melchert@iqo.uni-hannover.de>
 """
+import numpy as np
 
 
 def RungeKutta2(fun, z, uw, dz):
@@ -66,4 +69,156 @@ def RungeKutta4(fun, z, uw, dz):
     return uw + dz * (k1 + 2.0 * k2 + 2.0 * k3 + k4) / 6.0
 
 
+class _StepperWorkspace:
+    r"""Base class for steppers with preallocated stage buffers
+
+    Provides a callable with the same call signature as the plain
+    :math:`z`-stepping formulas, i.e. `stepper(fun, z, uw, dz)`, that holds
+    the buffers for intermediate stages and accumulated increments over
+    subsequent calls. Intermediate results are computed in-place, avoiding the
+    allocation of temporary arrays on each call. The field returned by a call
+    is a newly allocated array, so that it can be stored safely by the caller.
+
+    Note:
+        The stage buffers are passed to `fun` and are overwritten on the next
+        stage. Hence, `fun` must not keep a reference to its input.
+
+    Args:
+        shape (:obj:`tuple`):
+            Shape of the field (default is shape = None, i.e. buffers are
+            allocated on the first call).
+        dtype (:obj:`numpy.dtype`):
+            Data type of the field (default is dtype = complex).
+    """
+
+    n_buffers = 1
+
+    def __init__(self, shape=None, dtype=complex):
+        self._buf = []
+        if shape is not None:
+            self._alloc(shape, np.dtype(dtype))
+
+    def _alloc(self, shape, dtype):
+        self._buf = [np.empty(shape, dtype=dtype) for _ in range(self.n_buffers)]
+
+    def _buffers(self, uw, k):
+        r"""Stage buffers matching shape and data type of field and slope
+
+        Args:
+            uw (:obj:`numpy.ndarray`): Current field.
+            k (:obj:`numpy.ndarray`): Evolution rate at current field.
+
+        Returns:
+            :obj:`list` of :obj:`numpy.ndarray`: Stage buffers.
+        """
+        shape, dtype = np.shape(uw), np.result_type(uw, k)
+        if not self._buf or self._buf[0].shape != shape or self._buf[0].dtype != dtype:
+            self._alloc(shape, dtype)
+        return self._buf
+
+
+class RungeKutta2Workspace(_StepperWorkspace):
+    r"""Second-order Runge-Kutta formula with preallocated stage buffers
+
+    Implements the second-order Runge-Kutta formula of function
+    :func:`RungeKutta2`, yielding identical results, using in-place operations
+    on preallocated stage buffers.
+
+    Args:
+        shape (:obj:`tuple`):
+            Shape of the field (default is shape = None, i.e. buffers are
+            allocated on the first call).
+        dtype (:obj:`numpy.dtype`):
+            Data type of the field (default is dtype = complex).
+    """
+
+    n_buffers = 1
+
+    def __call__(self, fun, z, uw, dz):
+        r"""Perform single step
+
+        Args:
+            fun (:obj:`function`):
+                Function evaluating the evolution rate of the ODE.
+            z (:obj:`float`):
+                Current :math:`z`-value.
+            uw (:obj:`numpy.ndarray`, 1-dim):
+                Frequency-domain representation of the current field.
+            dz (:obj:`float`):
+                Step size.
+        """
+        k1 = fun(z, uw)
+        (s,) = self._buffers(uw, k1)
+        # -- STAGE 2: uw + 0.5*dz*k1
+        np.multiply(k1, 0.5 * dz, out=s)
+        np.add(uw, s, out=s)
+        k2 = fun(z + 0.5 * dz, s)
+        # -- FIELD UPDATE: uw + dz*k2
+        np.multiply(k2, dz, out=s)
+        return uw + s
+
+
+class RungeKutta4Workspace(_StepperWorkspace):
+    r"""Fourth-order Runge-Kutta formula with preallocated stage buffers
+
+    Implements the fourth-order Runge-Kutta formula of function
+    :func:`RungeKutta4`, yielding bitwise identical results, using in-place
+    operations on preallocated stage buffers. The arithmetic operations are
+    performed in the same order as for :func:`RungeKutta4`.
+
+    Args:
+        shape (:obj:`tuple`):
+            Shape of the field (default is shape = None, i.e. buffers are
+            allocated on the first call).
+        dtype (:obj:`numpy.dtype`):
+            Data type of the field (default is dtype = complex).
+    """
+
+    n_buffers = 2
+
+    def __call__(self, fun, z, uw, dz):
+        r"""Perform single step
+
+        Args:
+            fun (:obj:`function`):
+                Function evaluating the evolution rate of the ODE.
+            z (:obj:`float`):
+                Current :math:`z`-value.
+            uw (:obj:`numpy.ndarray`, 1-dim):
+                Frequency-domain representation of the current field.
+            dz (:obj:`float`):
+                Step size.
+        """
+        k1 = fun(z, uw)
+        s, acc = self._buffers(uw, k1)
+        # -- STAGE 2: uw + 0.5*dz*k1
+        np.multiply(k1, 0.5 * dz, out=s)
+        np.add(uw, s, out=s)
+        k2 = fun(z + 0.5 * dz, s)
+        # -- STAGE 3: uw + 0.5*dz*k2
+        np.multiply(k2, 0.5 * dz, out=s)
+        np.add(uw, s, out=s)
+        k3 = fun(z + 0.5 * dz, s)
+        # -- STAGE 4: uw + dz*k3
+        np.multiply(k3, dz, out=s)
+        np.add(uw, s, out=s)
+        k4 = fun(z + dz, s)
+        # -- FIELD UPDATE: uw + dz*(k1 + 2.0*k2 + 2.0*k3 + k4)/6.0
+        np.multiply(k2, 2.0, out=acc)
+        np.add(k1, acc, out=acc)
+        np.multiply(k3, 2.0, out=s)
+        np.add(acc, s, out=acc)
+        np.add(acc, k4, out=acc)
+        np.multiply(acc, dz, out=acc)
+        np.divide(acc, 6.0, out=acc)
+        return uw + acc
+
+
+# -- WORKSPACE VARIANTS OF THE PLAIN Z-STEPPING FORMULAS
+WORKSPACE_STEPPERS = {
+    RungeKutta2: RungeKutta2Workspace,
+    RungeKutta4: RungeKutta4Workspace,
+}
+
+
 # EOF: z_stepper.py
@@ -0,0 +1,246 @@
+"""
+Implements a runner for parameter sweeps, distributing the individual
+simulation runs over a pool of worker processes.
+
+.. autosummary::
+   :nosignatures:
+
+   parameter_grid
+   run_sweep
+
+Each point of the sweep is specified by a base simulation parameter dataclass
+:class:`data_io.SimPars`, of which selected attributes are replaced by the
+values of the point. Besides the attributes of :class:`data_io.SimPars`, the
+pseudo-parameter `P_fac` can be swept, scaling the power of the initial field
+`E_0t` by the given factor.
+
+The results of all points are collected by the parent process in a single
+HDF5 file, with group `run_<index>` holding the results of the point with
+linear index `<index>` of the sweep grid. Points for which the output file
+already holds complete results are skipped when a sweep is run again.
+
+.. module:: sweep
+
+.. codeauthor:: Oliver Melchert <melchert@iqo.uni-hannover.de>
+"""
+import os
+import itertools
+import dataclasses
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor, as_completed
+import h5py
+import numpy as np
+from .app import run_sim_pars
+from .config import set_fft_backend
+
+
+# -- ENVIRONMENT VARIABLES CONTROLLING THE THREAD POOLS OF THE BLAS/FFT
+# ... LIBRARIES, READ WHEN THE LIBRARIES ARE LOADED BY A WORKER PROCESS
+_THREAD_ENV_VARS = (
+    "OMP_NUM_THREADS",
+    "MKL_NUM_THREADS",
+    "OPENBLAS_NUM_THREADS",
+    "NUMEXPR_NUM_THREADS",
+    "VECLIB_MAXIMUM_THREADS",
+)
+
+
+def parameter_grid(**par_grid):
+    r"""Sweep grid from parameter values.
+
+    Args:
+        **par_grid: Parameter names and sequences of parameter values.
+
+    Returns:
+        :obj:`list` of :obj:`dict`: Points of the cartesian product of all
+        parameter values. The last parameter varies fastest.
+    """
+    names = list(par_grid.keys())
+    return [
+        dict(zip(names, vals))
+        for vals in itertools.product(*(par_grid[name] for name in names))
+    ]
+
+
+def _set_point(sim_par, point):
+    r"""Simulation parameters of single sweep point.
+
+    Args:
+        sim_par (:obj:`dataclass`): Base simulation parameter dataclass.
+        point (:obj:`dict`): Parameter values of sweep point.
+
+    Returns:
+        (:obj:`dataclass`): Simulation parameter dataclass of sweep point.
+    """
+    point = dict(point)
+    P_fac = point.pop("P_fac", None)
+    sim_par = dataclasses.replace(sim_par, **point)
+    if P_fac is not None:
+        sim_par.E_0t = np.sqrt(P_fac) * sim_par.E_0t
+    return sim_par
+
+
+def _init_worker(fft_backend, n_threads):
+    r"""Initialize worker process.
+
+    Args:
+        fft_backend (:obj:`str`): Name of FFT backend.
+        n_threads (:obj:`int`): Number of threads used by the FFT backend.
+    """
+    backend_kwargs = {
+        "numpy": {},
+        "scipy": {"workers": n_threads},
+        "pyfftw": {"threads": n_threads},
+    }.get(fft_backend, {})
+    set_fft_backend(fft_backend, **backend_kwargs)
+
+
+def _run_point(idx, sim_par):
+    r"""Run simulation for single sweep point.
+
+    Args:
+        idx (:obj:`int`): Linear index of sweep point.
+        sim_par (:obj:`dataclass`): Simulation parameter dataclass.
+
+    Returns:
+        :obj:`tuple`: Linear index and results of sweep point.
+    """
+    res = run_sim_pars(sim_par)
+    # -- ONLY PLAIN ARRAYS ARE PASSED BACK TO THE PARENT PROCESS
+    res = {key: np.asarray(val) for key, val in res.items()}
+    return idx, res
+
+
+def _group_name(idx):
+    return "run_%05d" % idx
+
+
+def _is_complete(f, idx, point):
+    r"""Check whether file holds complete results of sweep point.
+
+    Args:
+        f (:obj:`h5py.File`): Output file.
+        idx (:obj:`int`): Linear index of sweep point.
+        point (:obj:`dict`): Parameter values of sweep point.
+
+    Returns:
+        :obj:`bool`: True if complete results are available.
+
+    Raises:
+        ValueError: If the stored parameter values differ from the given
+            parameter values.
+    """
+    name = _group_name(idx)
+    if name not in f:
+        return False
+    grp = f[name]
+    if not grp.attrs.get("complete", False):
+        return False
+    for key, val in point.items():
+        if not np.allclose(grp.attrs[key], val, rtol=1e-12, atol=0.0):
+            raise ValueError(
+                "%s: stored value %s=%s differs from sweep value %s"
+                % (name, key, grp.attrs[key], val)
+            )
+    return True
+
+
+def _write_point(f, idx, point, res):
+    r"""Write results of sweep point to file.
+
+    Args:
+        f (:obj:`h5py.File`): Output file.
+        idx (:obj:`int`): Linear index of sweep point.
+        point (:obj:`dict`): Parameter values of sweep point.
+        res (:obj:`dict`): Results of sweep point.
+    """
+    name = _group_name(idx)
+    if name in f:
+        del f[name]
+    grp = f.create_group(name)
+    for key, val in point.items():
+        grp.attrs[key] = val
+    for key, val in res.items():
+        grp.create_dataset(key, data=val)
+    # -- MARK COMPLETE ONLY AFTER ALL DATA IS WRITTEN
+    grp.attrs["complete"] = True
+    f.flush()
+
+
+def run_sweep(
+    sim_par, par_grid, out_path, n_workers=None, n_threads=1, fft_backend="numpy"
+):
+    r"""Run parameter sweep.
+
+    Distributes the points of the sweep grid over a pool of worker processes
+    and collects their results in a single HDF5 file. Each worker process is
+    started via `spawn`, with the thread pools of the BLAS and FFT libraries
+    limited to `n_threads` threads, so that `n_workers` concurrent runs do not
+    oversubscribe the available cores.
+
+    Points for which the output file already holds complete results are
+    skipped, so that an interrupted sweep can be completed by calling this
+    function again with the same arguments.
+
+    Args:
+        sim_par (:obj:`dataclass`): Base simulation parameter dataclass
+            :class:`data_io.SimPars`.
+        par_grid (:obj:`dict`): Parameter names and sequences of parameter
+            values, e.g. `{"n2": [1e-20, 2e-20], "P_fac": [1.0, 2.0]}`.
+        out_path (:obj:`str`): Path of HDF5 output file.
+        n_workers (:obj:`int`): Number of worker processes (default is
+            n_workers = None, i.e. use the number of available cores).
+        n_threads (:obj:`int`): Number of threads per worker process (default
+            is n_threads = 1).
+        fft_backend (:obj:`str`): Name of FFT backend used by the workers
+            (default is fft_backend = "numpy").
+
+    Returns:
+        :obj:`list` of :obj:`int`: Linear indices of the points run by this
+        call.
+    """
+    points = parameter_grid(**par_grid)
+    for name in par_grid.keys():
+        if name != "P_fac" and not hasattr(sim_par, name):
+            raise KeyError("SimPars has no parameter %s" % name)
+
+    out_dir = os.path.dirname(out_path)
+    if out_dir:
+        os.makedirs(out_dir, exist_ok=True)
+
+    with h5py.File(out_path, "a") as f:
+        f.attrs["par_names"] = list(par_grid.keys())
+        f.attrs["num_points"] = len(points)
+        todo = [
+            idx
+            for idx, point in enumerate(points)
+            if not _is_complete(f, idx, point)
+        ]
+        if not todo:
+            return []
+
+        # -- SPAWNED WORKERS INHERIT THE ENVIRONMENT OF THE PARENT
+        env_prev = {key: os.environ.get(key) for key in _THREAD_ENV_VARS}
+        os.environ.update({key: str(n_threads) for key in _THREAD_ENV_VARS})
+        try:
+            with ProcessPoolExecutor(
+                max_workers=n_workers,
+                mp_context=multiprocessing.get_context("spawn"),
+                initializer=_init_worker,
+                initargs=(fft_backend, n_threads),
+            ) as pool:
+                futures = [
+                    pool.submit(_run_point, idx, _set_point(sim_par, points[idx]))
+                    for idx in todo
+                ]
+                # -- THE PARENT IS THE ONLY PROCESS WRITING TO THE OUTPUT FILE
+                for future in as_completed(futures):
+                    idx, res = future.result()
+                    _write_point(f, idx, points[idx], res)
+        finally:
+            for key, val in env_prev.items():
+                if val is None:
+                    os.environ.pop(key, None)
+                else:
+                    os.environ[key] = val
+    return todo
@@ -4,8 +4,13 @@ This module implements functions for postprocessing of simulation data.
 .. autosummary::
    :nosignatures:
 
+    TimeDomainView
     change_reference_frame
     spectrogram
+    cropped_spectrogram
+    spectrogram_slices
+    spectrogram_cube
+    stft_spectrogram
     plot_spectrogram
     plot_evolution
     plot_details_prop_const
@@ -16,8 +21,12 @@ This module implements functions for postprocessing of simulation data.
 """
 import sys
 import time
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 import numpy as np
 import numpy.fft as nfft
+from numpy.lib.stride_tricks import as_strided
 import matplotlib as mpl
 import matplotlib.pyplot as plt
 import matplotlib.colors as col
@@ -61,19 +70,199 @@ class ProgressBar:
         sys.stderr.write("\n")
 
 
-def change_reference_frame(w, z, uwz, v0):
+class TimeDomainView:
+    r"""Lazy time-domain representation of the field at stored slices.
+
+    Indexes like an array of shape `(z_num, ..., t_num)`, e.g. `ut[i]`,
+    `ut[a:b:step]`, or `ut[i, t_idx]`, but computes the inverse
+    Fourier-transform only for the requested :math:`z`-slices. Transformed
+    slices are kept in a cache of bounded size, from which the least recently
+    used slices are discarded first, so that repeated access, e.g. for
+    plotting, does not repeat the transforms. Conversion to a NumPy array,
+    e.g. by `numpy.asarray`, transforms all stored slices.
+
+    Note:
+        Access to the cache is guarded by a lock, so that a view can be
+        indexed concurrently by several threads, e.g. by
+        :func:`spectrogram_slices`. The transforms themselves are performed
+        outside the lock. A pickled view does not include the cache.
+
+    Args:
+        uwz (:obj:`object`):
+            Frequency-domain representation of the field at the stored slices.
+            Any object supporting `len` and indexing by an integer, e.g. a
+            list of arrays, an array, a memory-mapped array, or a HDF5
+            dataset.
+        t_num (:obj:`int`):
+            Number of time mesh-points (default is t_num = None, i.e. the
+            number of frequency mesh-points).
+        max_cached (:obj:`int`):
+            Maximal number of cached slices (default is max_cached = 128).
+
+    Attributes:
+        uwz (:obj:`object`):
+            Frequency-domain representation of the field.
+        hits (:obj:`int`):
+            Number of slices taken from the cache.
+        misses (:obj:`int`):
+            Number of transformed slices.
+    """
+
+    def __init__(self, uwz, t_num=None, max_cached=128):
+        self.uwz = uwz
+        uw0 = np.asarray(uwz[0])
+        self.t_num = uw0.shape[-1] if t_num is None else t_num
+        self.dtype = np.result_type(uw0, 1j)
+        self._item_shape = uw0.shape[:-1] + (self.t_num,)
+        self.max_cached = max_cached
+        self._cache = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        # -- LOCKS CANNOT BE PICKLED, CACHED SLICES ARE NOT WORTH TRANSFERRING
+        del state["_lock"], state["_cache"]
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._cache = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self.uwz)
+
+    @property
+    def shape(self):
+        r""":obj:`tuple`: Shape of the time-domain representation."""
+        return (len(self),) + self._item_shape
+
+    @property
+    def ndim(self):
+        r""":obj:`int`: Number of dimensions."""
+        return len(self.shape)
+
+    def _slices(self, idx):
+        r"""Time-domain representation of field at slices with indices idx.
+
+        Args:
+            idx (:obj:`list` of :obj:`int`): Nonnegative slice indices.
+
+        Returns:
+            :obj:`numpy.ndarray`: Field at requested slices.
+        """
+        cache = self._cache
+        # -- FETCH CACHED SLICES, MARKING THEM AS RECENTLY USED
+        with self._lock:
+            found = dict()
+            for i in idx:
+                if i in cache:
+                    found[i] = cache[i]
+                    cache.move_to_end(i)
+            missing = sorted(set(idx) - set(found))
+            self.misses += len(missing)
+            self.hits += len(idx) - len(missing)
+        if missing:
+            # -- TRANSFORM ALL MISSING SLICES AT ONCE
+            uw = np.stack([np.asarray(self.uwz[i]) for i in missing])
+            ut = IFT(uw, n=self.t_num, axis=-1)
+            found.update(zip(missing, ut))
+            # -- ADD TRANSFORMED SLICES TO CACHE, DISCARDING LEAST RECENTLY
+            # ... USED
+            with self._lock:
+                for i in missing:
+                    cache[i] = found[i]
+                    if len(cache) > self.max_cached:
+                        cache.popitem(last=False)
+        out = np.empty((len(idx),) + self._item_shape, dtype=self.dtype)
+        for n, i in enumerate(idx):
+            out[n] = found[i]
+        return out
+
+    def __getitem__(self, key):
+        key, rest = (key[0], key[1:]) if isinstance(key, tuple) else (key, ())
+        n_z = len(self)
+        if isinstance(key, (int, np.integer)):
+            i = int(key) + n_z if key < 0 else int(key)
+            if not 0 <= i < n_z:
+                raise IndexError("index %d out of range" % key)
+            return self._slices([i])[0][rest]
+        if isinstance(key, slice):
+            idx = range(*key.indices(n_z))
+        elif key is Ellipsis:
+            idx, rest = range(n_z), (Ellipsis,) + rest
+        else:
+            idx = np.arange(n_z)[key]
+        return self._slices([int(i) for i in idx])[(slice(None),) + rest]
+
+    def __array__(self, dtype=None, copy=None):
+        ut = self[:]
+        return ut if dtype is None else ut.astype(dtype, copy=False)
+
+    def clear_cache(self):
+        r"""Discard all cached slices"""
+        with self._lock:
+            self._cache.clear()
+
+
+def change_reference_frame(w, z, uwz, v0, out=None, max_bytes=2 ** 26):
     r"""Change reference frame.
 
     Shift to moving frame of reference in which the dynamics is slow.
 
+    If `out` is given, the transformed slices are written to `out` instead,
+    processing chunks of slices holding at most `max_bytes` bytes of field
+    data. Thus, `uwz` and `out` can be disk-based, e.g. HDF5 datasets or
+    memory-mapped arrays, exceeding the available memory. The phase factor
+    :math:`\exp(-i\omega z/v_0)` is then evaluated exactly only at the
+    first slice of each chunk, and updated from slice to slice by
+    multiplication with :math:`\exp(-i\omega \Delta z/v_0)`, as long as
+    the :math:`z`-spacing does not change.
+
     Args:
         w (:obj:`numpy.ndarray`): Angular-frequency grid.
         z (:obj:`numpy.ndarray`): :math:`z`-grid.
         uwz (:obj:`numpy.ndarray`, 2-dim): Frequency domain representation of
             analytic signal.
         v0 (:obj:`float`): Reference velocity.
+        out (:obj:`object`): Destination for the time-domain representation
+            of the analytic signal in the moving frame of reference, e.g. an
+            array, a memory-mapped array, or a HDF5 dataset, of the same
+            shape as `uwz` (default is out = None).
+        max_bytes (:obj:`int`): Memory budget for a chunk of slices, used if
+            `out` is given (default is max_bytes = 2**26).
+
+    Returns:
+        :obj:`numpy.ndarray`: Time-domain representation of the analytic
+        signal in the moving frame of reference, or `out` if given.
     """
-    return IFT(uwz * np.exp(-1j * w * z[:, np.newaxis] / v0), axis=-1)
+    if out is None:
+        return IFT(uwz * np.exp(-1j * w * z[:, np.newaxis] / v0), axis=-1)
+    z = np.asarray(z, dtype=float)
+    fac = -1j * np.asarray(w, dtype=float) / v0
+    n_chunk = max(1, max_bytes // (16 * int(np.prod(uwz.shape[1:]))))
+    dz, step = None, None
+    for i in range(0, z.size, n_chunk):
+        uw = np.asarray(uwz[i : i + n_chunk])
+        n_z = uw.shape[0]
+        # -- EXACT PHASE FACTOR AT FIRST SLICE OF CHUNK BOUNDS ROUNDOFF
+        ph = np.exp(fac * z[i])
+        res = np.empty(uw.shape, dtype=np.result_type(uw, ph))
+        res[0] = uw[0] * ph
+        for k in range(1, n_z):
+            # ... PHASE RECURRENCE; IF Z-SPACING CHANGES, THE PHASE FACTOR IS
+            # ... EVALUATED EXACTLY AND THE STEP FACTOR IS UPDATED
+            dz_k = z[i + k] - z[i + k - 1]
+            if dz is None or abs(dz_k - dz) > 1e-12 * abs(dz):
+                dz, step = dz_k, np.exp(fac * dz_k)
+                ph = np.exp(fac * z[i + k])
+            else:
+                ph = ph * step
+            res[k] = uw[k] * ph
+        out[i : i + n_z] = IFT(res, axis=-1)
+    return out
 
 
 def spectrogram(t, w, ut, t_lim=None, Nt=1000, Nw=2 ** 8, s0=20.0):
@@ -114,11 +303,378 @@ def spectrogram(t, w, ut, t_lim=None, Nt=1000, Nw=2 ** 8, s0=20.0):
         t_min, t_max = t_lim
     # -- DELAY TIMES
     t_seq = np.linspace(t_min, t_max, Nt)
+    # -- COMPUTE TIME-FREQUENCY RESOLVED CONTENT OF INPUT FIELD
+    k_sel = FTSHIFT(np.arange(t.size))
+    return t_seq, FTSHIFT(w), _stft_power(t, ut, t_seq, s0, 1, k_sel)
+
+
+def _stft_power(t, ut, t_seq, s0, m, k_sel, max_bytes=2 ** 26):
+    r"""Short time Fourier transform for blocks of delay times.
+
+    Computes the windowed signals for blocks of delay times, holding at most
+    `max_bytes` bytes of complex data, and keeps only the requested
+    frequency bins. To obtain every `m`-th frequency bin, the windowed signal
+    is folded onto `t.size/m` samples before the transform, which yields
+    the same bins as the full transform.
+
+    Args:
+        t (:obj:`numpy.ndarray`, 1-dim): Temporal grid.
+        ut (:obj:`numpy.ndarray`, 1-dim): Time-domain representation of
+            analytic signal.
+        t_seq (:obj:`numpy.ndarray`, 1-dim): Delay times.
+        s0 (:obj:`float`): Root-mean-square width of Gaussian window.
+        m (:obj:`int`): Stride of frequency bins; needs to divide `t.size`.
+        k_sel (:obj:`numpy.ndarray`, 1-dim): Indices of the kept bins of the
+            folded transform.
+        max_bytes (:obj:`int`): Memory budget for a block of windowed
+            signals (default is max_bytes = 2**26).
+
+    Returns:
+        :obj:`numpy.ndarray`, 2-dim: Spectrogram of shape (k_sel.size,
+        t_seq.size).
+    """
     # -- WINDOW FUNCTION
     h = lambda t: np.exp(-(t ** 2) / 2 / s0 / s0) / np.sqrt(2.0 * np.pi * s0 * s0)
-    # -- COMPUTE TIME-FREQUENCY RESOLVED CONTENT OF INPUT FIELD
-    P = np.abs(FT(h(t - t_seq[:, np.newaxis]) * ut[np.newaxis, :], axis=-1)) ** 2
-    return t_seq, FTSHIFT(w), np.swapaxes(FTSHIFT(P, axes=-1), 0, 1)
+    P = np.empty((k_sel.size, t_seq.size))
+    # -- NUMBER OF DELAY TIMES PER BLOCK
+    n_blk = max(1, max_bytes // (16 * t.size))
+    for i in range(0, t_seq.size, n_blk):
+        t_blk = t_seq[i : i + n_blk]
+        u_blk = h(t - t_blk[:, np.newaxis]) * ut[np.newaxis, :]
+        P[:, i : i + n_blk] = _folded_power(u_blk, m, k_sel).T
+    return P
+
+
+def _folded_power(u, m, k_sel):
+    r"""Power spectrum at selected frequency bins.
+
+    Args:
+        u (:obj:`numpy.ndarray`): Windowed signals along the last axis.
+        m (:obj:`int`): Stride of frequency bins; needs to divide the number
+            of samples.
+        k_sel (:obj:`numpy.ndarray`, 1-dim): Indices of the kept bins of the
+            folded transform.
+
+    Returns:
+        :obj:`numpy.ndarray`: Power spectrum, with the kept bins along the
+        last axis.
+    """
+    if m > 1:
+        # -- FT OF FOLDED SIGNAL YIELDS EVERY M-TH BIN OF THE FULL FT
+        u = np.sum(u.reshape(u.shape[:-1] + (m, -1)), axis=-2) / m
+    return np.abs(FT(u, axis=-1)[..., k_sel]) ** 2
+
+
+def _frequency_bins(t, w, w_lim, Nw):
+    r"""Frequency bins of a spectrogram within given bounds.
+
+    Args:
+        t (:obj:`numpy.array`, 1-dim): Temporal grid.
+        w (:obj:`numpy.array`, 1-dim): Angular-frequency grid.
+        w_lim (:obj:`list`): Angular frequency bounds (wMin, wMax), or None.
+        Nw (:obj:`int`): Maximal number of bins, or None.
+
+    Returns:
+        :obj:`tuple`: Stride `m` of the bins, angular frequencies of the kept
+        bins in increasing order, and their indices in the folded transform.
+    """
+    if w_lim is None:
+        w_lim = (np.min(w), np.max(w))
+    in_range = lambda w: np.logical_and(w >= w_lim[0], w <= w_lim[1])
+    # -- SMALLEST STRIDE DIVIDING T.SIZE THAT YIELDS AT MOST NW BINS
+    m, n_sel = 1, np.count_nonzero(in_range(w))
+    if Nw is not None:
+        m = max(1, -(-n_sel // Nw))
+        while t.size % m:
+            m += 1
+    w_fold = np.asarray(w)[::m]
+    k_sel = np.argsort(w_fold)
+    k_sel = k_sel[in_range(w_fold[k_sel])]
+    return m, w_fold[k_sel], k_sel
+
+
+def cropped_spectrogram(
+    t, w, ut, t_lim=None, Nt=1000, w_lim=None, Nw=None, s0=20.0, max_bytes=2 ** 26
+):
+    r"""Compute spectrogram for a range of angular frequencies.
+
+    Memory-bounded variant of :func:`spectrogram`, returning only the
+    angular frequencies within `w_lim`. Delay times are processed in blocks,
+    so that the windowed signals held in memory do not exceed `max_bytes`
+    bytes. If `Nw` is given, and the range `w_lim` contains more than `Nw`
+    frequency bins, only every `m`-th bin is computed, with the smallest
+    stride `m` that divides the number of time mesh-points and yields at
+    most `Nw` bins. The windowed signals are then folded onto a mesh reduced
+    by a factor `m`, so that the transforms are shorter by the same factor.
+
+    Args:
+        t (:obj:`numpy.array`, 1-dim):
+              Temporal grid.
+        w (:obj:`numpy.array`, 1-dim):
+              Angular-frequency grid.
+        ut (:obj:`numpy-array`, 1-dim):
+              Time-domain representation of analytic signal.
+        t_lim (:obj:`list`):
+              Delay time bounds for temporal axis considered for constructing
+              the spectrogram (tMin, tMax), default is (min(t),max(t)).
+        Nt (:obj:`int`):
+              Number of delay times samples in [tMin, tMax], used for signal
+              localization (default: Nt=1000).
+        w_lim (:obj:`list`):
+              Angular frequency bounds (wMin, wMax) of the spectrogram,
+              default is (min(w), max(w)).
+        Nw (:obj:`int`):
+              Maximal number of samples in angular-frequency domain kept as
+              output (default: Nw=None, i.e. all bins in [wMin, wMax]).
+        s0 (:obj:`float`):
+              Root-mean-square width of Gaussian function used for signal
+              localization (default: s0=20.0).
+        max_bytes (:obj:`int`):
+              Memory budget for a block of windowed signals (default:
+              max_bytes=2**26).
+
+    Returns:
+        :obj:`list`: (t_seq, w_spec, P_tw), where `t_seq`
+        (:obj:`numpy.ndarray`, 1-dim) are delay times, `w_spec`
+        (:obj:`numpy.ndarray`, 1-dim) are angular frequencies in increasing
+        order, and `P_tw` (:obj:`numpy.ndarray`, 2-dim) is the spectrogram.
+    """
+    if t_lim is None:
+        t_lim = (np.min(t), np.max(t))
+    t_seq = np.linspace(t_lim[0], t_lim[1], Nt)
+    m, w_spec, k_sel = _frequency_bins(t, w, w_lim, Nw)
+    return t_seq, w_spec, _stft_power(t, ut, t_seq, s0, m, k_sel, max_bytes)
+
+
+def spectrogram_slices(t, w, utz, n_workers=None, **kwargs):
+    r"""Compute spectrograms for a sequence of :math:`z`-slices.
+
+    Computes the spectrogram of each slice using :func:`cropped_spectrogram`
+    in a pool of threads. Since the fast Fourier-transforms release the
+    global interpreter lock, slices are processed concurrently.
+
+    Note:
+        All threads share the FFT backend selected via
+        :func:`fmas.config.set_fft_backend`, which thus needs to be
+        thread-safe. This holds for the backends of module
+        :mod:`fmas.fft_backends`; the backend "pyfftw" keeps a separate
+        cache of plans for each thread. For a custom backend that is not
+        thread-safe, use `n_workers=1`. The input `utz` is indexed
+        concurrently; arrays, HDF5 datasets, and :class:`TimeDomainView`
+        support this.
+
+    Args:
+        t (:obj:`numpy.array`, 1-dim):
+              Temporal grid.
+        w (:obj:`numpy.array`, 1-dim):
+              Angular-frequency grid.
+        utz (:obj:`object`):
+              Time-domain representation of the analytic signal at the
+              :math:`z`-slices, e.g. a 2-dim array, a
+              :class:`TimeDomainView`, or a HDF5 dataset.
+        n_workers (:obj:`int`):
+              Number of threads (default: n_workers=None, i.e. the default
+              of :class:`concurrent.futures.ThreadPoolExecutor`).
+        **kwargs:
+              Keyword arguments passed to :func:`cropped_spectrogram`.
+
+    Returns:
+        :obj:`list`: (t_seq, w_spec, P_ztw), where `P_ztw`
+        (:obj:`numpy.ndarray`, 3-dim) holds the spectrogram of each slice
+        along its first axis.
+    """
+    _spec = lambda i: cropped_spectrogram(t, w, np.asarray(utz[i]), **kwargs)
+    with ThreadPoolExecutor(max_workers=n_workers) as pool:
+        res = list(pool.map(_spec, range(len(utz))))
+    t_seq, w_spec = res[0][:2]
+    return t_seq, w_spec, np.stack([P for _, _, P in res])
+
+
+def spectrogram_cube(
+    t,
+    w,
+    utz,
+    t_lim=None,
+    Nt=1000,
+    w_lim=None,
+    Nw=None,
+    s0=20.0,
+    out=None,
+    name="P_ztw",
+    max_bytes=2 ** 26,
+):
+    r"""Compute spectrograms for all :math:`z`-slices at once.
+
+    Batched variant of :func:`cropped_spectrogram`. The matrix of Gaussian
+    windows for all delay times is computed only once and shared by all
+    slices. Slices are read in chunks, and the windowed signals for a chunk
+    of slices and a block of delay times, holding at most `max_bytes` bytes
+    of complex data, are transformed by a single batched fast
+    Fourier-transform. The spectrograms can be written to a HDF5 dataset
+    chunk by chunk, so that the full cube is never held in memory.
+
+    Args:
+        t (:obj:`numpy.array`, 1-dim):
+              Temporal grid.
+        w (:obj:`numpy.array`, 1-dim):
+              Angular-frequency grid.
+        utz (:obj:`object`):
+              Time-domain representation of the analytic signal at the
+              :math:`z`-slices, e.g. a 2-dim array, a
+              :class:`TimeDomainView`, or a HDF5 dataset.
+        t_lim (:obj:`list`):
+              Delay time bounds (tMin, tMax), default is (min(t),max(t)).
+        Nt (:obj:`int`):
+              Number of delay times samples in [tMin, tMax] (default:
+              Nt=1000).
+        w_lim (:obj:`list`):
+              Angular frequency bounds (wMin, wMax), default is (min(w),
+              max(w)).
+        Nw (:obj:`int`):
+              Maximal number of samples in angular-frequency domain kept as
+              output (default: Nw=None, i.e. all bins in [wMin, wMax]), see
+              :func:`cropped_spectrogram`.
+        s0 (:obj:`float`):
+              Root-mean-square width of Gaussian function used for signal
+              localization (default: s0=20.0).
+        out (:obj:`h5py.Group`):
+              HDF5 file or group in which the spectrograms are stored as
+              dataset of shape (z, w, t_delay) (default: out=None, i.e. the
+              spectrograms are returned as array).
+        name (:obj:`str`):
+              Name of the dataset created in `out` (default: name="P_ztw").
+        max_bytes (:obj:`int`):
+              Memory budget for a block of windowed signals (default:
+              max_bytes=2**26).
+
+    Returns:
+        :obj:`list`: (t_seq, w_spec, P_ztw), where `t_seq`
+        (:obj:`numpy.ndarray`, 1-dim) are delay times, `w_spec`
+        (:obj:`numpy.ndarray`, 1-dim) are angular frequencies in increasing
+        order, and `P_ztw` (:obj:`numpy.ndarray` or :obj:`h5py.Dataset`,
+        3-dim) holds the spectrogram of each slice along its first axis.
+    """
+    if t_lim is None:
+        t_lim = (np.min(t), np.max(t))
+    t_seq = np.linspace(t_lim[0], t_lim[1], Nt)
+    m, w_spec, k_sel = _frequency_bins(t, w, w_lim, Nw)
+    # -- WINDOW MATRIX, SHARED BY ALL SLICES
+    h = lambda t: np.exp(-(t ** 2) / 2 / s0 / s0) / np.sqrt(2.0 * np.pi * s0 * s0)
+    H = h(t - t_seq[:, np.newaxis])
+    # -- BLOCK OF DELAY TIMES AND CHUNK OF SLICES WITHIN MEMORY BUDGET
+    n_blk = min(Nt, max(1, max_bytes // (16 * t.size)))
+    n_chunk = max(1, max_bytes // (16 * t.size * n_blk))
+    shape = (len(utz), k_sel.size, Nt)
+    if out is None:
+        P = np.empty(shape)
+    else:
+        P = out.create_dataset(
+            name, shape=shape, dtype=np.float64, chunks=(1,) + shape[1:]
+        )
+    P_chunk = np.empty((n_chunk,) + shape[1:])
+    for i in range(0, shape[0], n_chunk):
+        ut = np.asarray(utz[i : i + n_chunk])
+        n_z = ut.shape[0]
+        for j in range(0, Nt, n_blk):
+            u_blk = H[np.newaxis, j : j + n_blk] * ut[:, np.newaxis]
+            P_chunk[:n_z, :, j : j + n_blk] = np.swapaxes(
+                _folded_power(u_blk, m, k_sel), 1, 2
+            )
+        P[i : i + n_z] = P_chunk[:n_z]
+    return t_seq, w_spec, P
+
+
+def stft_spectrogram(
+    t, ut, t_lim=None, w_lim=None, s0=20.0, n_win=None, hop=1, max_bytes=2 ** 26
+):
+    r"""Compute spectrogram using windows of compact support.
+
+    In contrast to :func:`spectrogram`, which multiplies the full signal by
+    the Gaussian window at each delay time, the Gaussian window is truncated
+    to `n_win` samples centered at the delay time. The signal segments are
+    obtained as strided views of the signal, without copying, and
+    transformed by fast Fourier-transforms of length `n_win`. The delay
+    times are the temporal mesh-points in `t_lim`, taken at every `hop`-th
+    mesh-point. The frequency bins have spacing :math:`2\pi/(n_{\rm{win}}
+    \Delta t)`. For `n_win` dividing the number of time mesh-points, they
+    coincide with every (`t.size/n_win`)-th bin of :func:`spectrogram`,
+    and the spectrogram agrees with the result of :func:`spectrogram` up to
+    the truncation error of the window.
+
+    Args:
+        t (:obj:`numpy.array`, 1-dim):
+              Temporal grid.
+        ut (:obj:`numpy-array`, 1-dim):
+              Time-domain representation of analytic signal.
+        t_lim (:obj:`list`):
+              Delay time bounds (tMin, tMax), default is (min(t),max(t)).
+        w_lim (:obj:`list`):
+              Angular frequency bounds (wMin, wMax), default is all
+              frequency bins.
+        s0 (:obj:`float`):
+              Root-mean-square width of Gaussian function used for signal
+              localization (default: s0=20.0).
+        n_win (:obj:`int`):
+              Number of samples of the truncated window (default: n_win=None,
+              i.e. the smallest power of two covering 12 rms-widths).
+        hop (:obj:`int`):
+              Number of time mesh-points between subsequent delay times
+              (default: hop=1).
+        max_bytes (:obj:`int`):
+              Memory budget for a block of windowed segments (default:
+              max_bytes=2**26).
+
+    Returns:
+        :obj:`list`: (t_delay, w_spec, P_tw), where `t_delay`
+        (:obj:`numpy.ndarray`, 1-dim) are delay times, `w_spec`
+        (:obj:`numpy.ndarray`, 1-dim) are angular frequencies in increasing
+        order, and `P_tw` (:obj:`numpy.ndarray`, 2-dim) is the spectrogram.
+
+    Raises:
+        ValueError: if `t_lim` contains no time mesh-point.
+    """
+    ut = np.asarray(ut)
+    dt = float(t[1] - t[0])
+    if t_lim is None:
+        t_lim = (np.min(t), np.max(t))
+    if n_win is None:
+        # -- WINDOW SUPPORT OF +/- 6 RMS-WIDTHS
+        n_win = int(2 ** np.ceil(np.log2(12.0 * s0 / dt)))
+    half = n_win // 2
+    # -- SEGMENT J OF THE ZERO-PADDED SIGNAL IS CENTERED AT T[J]
+    u_pad = np.concatenate(
+        (np.zeros(half, ut.dtype), ut, np.zeros(n_win - half, ut.dtype))
+    )
+    stride = u_pad.strides[0]
+    segs = as_strided(
+        u_pad, shape=(t.size, n_win), strides=(stride, stride), writeable=False
+    )
+    # -- DELAY TIMES
+    in_t = np.flatnonzero(np.logical_and(t >= t_lim[0], t <= t_lim[1]))
+    if in_t.size == 0:
+        raise ValueError(
+            "t_lim=(%g, %g) contains no time mesh-point" % tuple(t_lim)
+        )
+    j_seq = np.arange(in_t[0], in_t[-1] + 1, hop)
+    # -- TRUNCATED WINDOW FUNCTION, NORMALIZED AS FOR spectrogram
+    x = (np.arange(n_win) - half) * dt
+    h = np.exp(-(x ** 2) / 2 / s0 / s0) / np.sqrt(2.0 * np.pi * s0 * s0)
+    h *= n_win / t.size
+    # -- KEPT FREQUENCY BINS IN INCREASING ORDER
+    w_win = FTFREQ(n_win, d=dt) * 2 * np.pi
+    k_sel = np.argsort(w_win)
+    if w_lim is not None:
+        w_s = w_win[k_sel]
+        k_sel = k_sel[np.logical_and(w_s >= w_lim[0], w_s <= w_lim[1])]
+    P = np.empty((k_sel.size, j_seq.size))
+    # -- NUMBER OF DELAY TIMES PER BLOCK
+    n_blk = max(1, max_bytes // (16 * n_win))
+    for i in range(0, j_seq.size, n_blk):
+        j_blk = j_seq[i : i + n_blk]
+        u_blk = segs[j_blk[0] : j_blk[-1] + 1 : hop] * h
+        uw_blk = FT(u_blk, axis=-1)
+        P[:, i : i + j_blk.size] = (np.abs(uw_blk[:, k_sel]) ** 2).T
+    return t[j_seq], w_win[k_sel], P
 
 
 def plot_spectrogram(t_delay, w_opt, P_tw):
@@ -201,7 +757,14 @@ def plot_evolution(z, t, u, t_lim=None, w_lim=None, DO_T_LOG=False, ratio_Iw=1e-
         DO_T_LOG (:obj:`bool`):
             Flag indicating whether time-domain propagation characteristics
             will be shown on log-scale (default=True).
+
+    Note:
+        The field `u` can be given as :class:`TimeDomainView`. To plot only
+        a subset of the :math:`z`-slices, pass e.g. `z[::10]` and
+        `u[::10]`, so that only the requested slices are transformed.
     """
+    # -- TRANSFORM LAZY VIEW ONLY ONCE
+    u = np.asarray(u)
 
     def _setColorbar(im, refPos):
         """colorbar helper"""
@@ -22,5 +22,9 @@ setup(
         "matplotlib>=3.3.3",
         "h5py>=3.1.0"
     ],
+    extras_require={
+        "pyfftw": ["pyFFTW>=0.12.0"],
+        "numba": ["numba>=0.53"],
+    },
     python_requires='>=3.9',
 )
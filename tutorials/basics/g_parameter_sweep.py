@@ -0,0 +1,55 @@
+r"""
+Running a parameter sweep
+=========================
+
+This example shows how to distribute the simulation runs of a parameter sweep
+over a pool of worker processes, using the function `run_sweep` implemented
+in module `sweep`.
+
+.. codeauthor:: Oliver Melchert <melchert@iqo.uni-hannover.de>
+"""
+import dataclasses
+import h5py
+import fmas
+from fmas.sweep import run_sweep
+
+###############################################################################
+# The worker processes are started via `spawn`, i.e. they import the script
+# anew. Hence, the sweep needs to be started from within the main guard.
+
+if __name__ == "__main__":
+
+    ###########################################################################
+    # The base simulation parameters are read from the input file
+    # `input_file.h5`, see
+    # :ref:`sphx_glr_auto_tutorials_basics_ng_generate_infile.py`.
+    # To keep the example short, the propagation range is reduced, and the
+    # model and propagation algorithm are set explicitly
+
+    glob = fmas.data_io.read_h5("input_file.h5")
+    glob = dataclasses.replace(
+        glob,
+        z_max=10000.0,
+        z_num=400,
+        z_skip=20,
+        model_type="FMAS_S_R",
+        solver_type="IFM_RK4IP",
+    )
+
+    ###########################################################################
+    # A sweep over two values of the pseudo-parameter `P_fac`, scaling the
+    # power of the initial field, is performed by two worker processes. The
+    # results of both runs are collected in the file `out_sweep.h5`. Calling
+    # `run_sweep` again skips the points for which complete results are
+    # available
+
+    idx_run = run_sweep(glob, {"P_fac": [1.0, 1.5]}, "out_sweep.h5", n_workers=2)
+    print("points run:", idx_run)
+
+    ###########################################################################
+    # The results of each point are stored in the group `run_<index>` of the
+    # output file, with the parameter values of the point as attributes
+
+    with h5py.File("out_sweep.h5", "r") as f:
+        for name, grp in f.items():
+            print(name, dict(grp.attrs), grp["u"].shape, grp["u"].dtype)